@@ -3,9 +3,12 @@ API REST para controle de buchas virtuais e geração de dados.
 """
 
 import sys
+import json
+import asyncio
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Dict, Optional, List
+import numpy as np
 import pandas as pd
 
 # Adicionar diretório raiz ao path
@@ -14,21 +17,41 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
 from src.data.synthetic_generator import VirtualBushingGenerator, BushinConfig
 from src.database import SQLServerConnector, DatabaseManager
-from src.utils import setup_logging
-from src.optimization import MaintenanceOptimizer
+from src.utils import setup_logging, get_config_loader
+from src.optimization import MaintenanceOptimizer, DatabaseCheckpoint
 from src.models import MarkovChainModel
-from src.anomaly import AnomalyManager
+from src.anomaly import AnomalyManager, ModelRegistry, TrainingJobManager, TrainingFarm, configure_torch_threads
+from src.anomaly.jobs import TERMINAL_EVENTS
 
 # Configurar logging
 logger = setup_logging(log_level="INFO")
 
-# Pool global de modelos treinados (persiste entre requisições)
-trained_models = {}
+
+def _load_persisted_model(model_name: str):
+    """Carrega um modelo persistido em anomaly_models (usado pelo registro)."""
+    if not db_connector:
+        return None
+
+    manager = AnomalyManager(db_connector)
+    return manager.autoencoder if manager.load_model(model_name) else None
+
+
+# Registro global de modelos treinados (memória limitada, despejo LRU)
+_anomaly_config = get_config_loader().get_default_config().get("anomaly", {})
+configure_torch_threads(inter_op=_anomaly_config.get("interop_threads"))
+model_registry = ModelRegistry(
+    memory_budget_mb=_anomaly_config.get("registry_memory_budget_mb", 512),
+    loader=_load_persisted_model
+)
+
+# Treinamentos em segundo plano (progresso publicado em memória)
+training_jobs = TrainingJobManager(max_workers=_anomaly_config.get("training_workers", 1))
+
 
 # Criar aplicação FastAPI
 app = FastAPI(
@@ -100,17 +123,59 @@ class OptimizationRequest(BaseModel):
     max_evaluations: int = 4000
     population_size: int = 200
     save_to_database: bool = True
+    resume: bool = False  # Retomar do checkpoint, pulando OSs já otimizadas
+    checkpoint_id: Optional[str] = None  # Identificador do checkpoint (None = sem checkpoint, não retomável)
+    checkpoint_interval: int = 50  # OSs concluídas entre gravações do checkpoint
 
 
 class AnomalyTrainingRequest(BaseModel):
     """Modelo de requisição de treinamento do autoencoder."""
     equipment_ids: Optional[List[str]] = None
     model_name: str = "default_model"
-    model_arch: str = "mlp"  # "mlp" ou "cnn"
+    model_arch: str = "mlp"  # "mlp", "cnn", "cnn_mc" (Conv1d multicanal) ou "pca"
     latent_dim: int = 5
     window_size: int = 168  # 1 semana
     num_epochs: int = 50
     learning_rate: float = 1e-3
+    batch_size: int = 32  # Janelas por lote de treino
+    num_workers: int = 0  # Processos de preparação de lotes (0 = no processo principal)
+    early_stopping_patience: Optional[int] = 10  # Épocas sem melhora na validação (None = desativado)
+    lr_patience: Optional[int] = 5  # Épocas sem melhora antes de reduzir a taxa (None = desativado)
+    restore_best_weights: bool = True  # Restaurar pesos da melhor época
+    features: Optional[List[str]] = None  # Esquema de features (None = anomaly.features da configuração)
+    multiresolution: Optional[Dict[str, int]] = None  # {"block_size", "recent_size"} (None = configuração)
+    background: bool = True  # Executar em segundo plano (acompanhar via job_id)
+
+
+class AnomalyFarmRequest(BaseModel):
+    """Modelo de requisição da fazenda de treinamento (um modelo por unidade)."""
+    model_name: str = "default_model"  # Prefixo: modelos gravados como "<model_name>:<unidade>"
+    partition_by: str = "equipment_id"  # "equipment_id" ou "localizacao"
+    units: Optional[List[str]] = None  # Unidades a treinar (None = todas)
+    model_arch: str = "mlp"
+    latent_dim: int = 5
+    window_size: int = 168
+    num_epochs: int = 50
+    learning_rate: float = 1e-3
+    batch_size: int = 32
+    early_stopping_patience: Optional[int] = 10
+    lr_patience: Optional[int] = 5
+    features: Optional[List[str]] = None  # Esquema de features (None = anomaly.features da configuração)
+    max_workers: Optional[int] = None  # Processos (None = configuração / núcleos disponíveis)
+    threads_per_worker: Optional[int] = None  # Threads por processo (None = configuração)
+    background: bool = True
+
+
+class AnomalyFineTuneRequest(BaseModel):
+    """Modelo de requisição de fine-tuning (apenas leituras novas) de um modelo existente."""
+    model_name: str = "default_model"
+    num_epochs: int = 5
+    learning_rate: float = 1e-4
+    replay_days: Optional[int] = 30  # Dias de histórico antes do watermark para replay (None = sem replay)
+    replay_fraction: float = 0.25  # Janelas de replay por janela nova
+    batch_size: int = 32
+    early_stopping_patience: Optional[int] = 3
+    background: bool = True  # Executar em segundo plano (acompanhar via job_id)
 
 
 class AnomalyDetectionRequest(BaseModel):
@@ -122,6 +187,16 @@ class AnomalyDetectionRequest(BaseModel):
     randomize_anomalies: bool = False
     anomaly_type: str = "auto"  # auto, temperature, humidity, vibration, pressure, mixed
     window_size: Optional[int] = None  # Tamanho da janela (deve ser igual ao treinamento)
+    batch_size: int = 1024  # Janelas por forward pass na detecção
+    n_workers: int = 4  # Equipamentos avaliados em paralelo
+
+
+class AnomalyStreamRequest(BaseModel):
+    """Modelo de requisição de detecção online (apenas leituras novas)."""
+    model_name: Optional[str] = None
+    save_to_database: bool = True
+    rolling_window: int = 12
+    batch_size: int = 1024
 
 
 # Estado global do gerador
@@ -511,6 +586,11 @@ async def list_equipment():
 async def run_optimization(request: OptimizationRequest):
     """
     Executa otimização de manutenção usando Markov + NSGA-II.
+
+    Com checkpoint_id, as OSs concluídas são registradas no checkpoint; uma
+    execução interrompida é retomada repetindo a requisição com resume=True
+    e o mesmo checkpoint_id. O checkpoint é removido ao final da execução.
+    Sem checkpoint_id, nada é registrado e a execução não pode ser retomada.
     """
     if not db_connector:
         raise HTTPException(
@@ -518,6 +598,12 @@ async def run_optimization(request: OptimizationRequest):
             detail="Banco de dados não configurado. Configure primeiro em /api/database/configure"
         )
 
+    if request.resume and not request.checkpoint_id:
+        raise HTTPException(
+            status_code=400,
+            detail="checkpoint_id é obrigatório para retomar uma otimização"
+        )
+
     try:
         logger.info("Iniciando otimização de manutenção...")
 
@@ -550,13 +636,36 @@ async def run_optimization(request: OptimizationRequest):
             population_size=request.population_size
         )
 
+        # Checkpoint das OSs concluídas (permite retomar lotes interrompidos)
+        checkpoint = None
+        if request.checkpoint_id:
+            checkpoint = DatabaseCheckpoint(
+                db_connector, request.checkpoint_id, flush_every=request.checkpoint_interval
+            )
+
         # Executar otimização para cada OS
         results = []
         pareto_data = []
 
+        if checkpoint is not None:
+            if request.resume:
+                for entry in checkpoint.load().values():
+                    entry['result']['data_otima'] = pd.Timestamp(entry['result']['data_otima'])
+                    results.append(entry['result'])
+                    pareto_data.extend(entry['pareto'])
+                logger.info(f"Retomando otimização '{request.checkpoint_id}': {len(results)} OSs já concluídas")
+            else:
+                checkpoint.reset()
+
+        completed_ids = checkpoint.completed_ids if checkpoint is not None else set()
+
         for idx, row in orders_df.iterrows():
             try:
                 os_id = row['os_id']
+
+                if str(os_id) in completed_ids:
+                    continue
+
                 logger.info(f"Otimizando OS {os_id} ({idx+1}/{len(orders_df)})")
 
                 # Extrair parâmetros da OS
@@ -613,19 +722,28 @@ async def run_optimization(request: OptimizationRequest):
                 results.append(result)
 
                 # Salvar pontos do Pareto para visualização
-                for point in pareto_front:
-                    pareto_data.append({
+                os_pareto = [
+                    {
                         "os_id": os_id,
                         "equipment_id": row['equipment_id'],
                         "t_days": point['t_days'],
                         "custo": point['cost'],
                         "indisponibilidade": point['unavailability']
-                    })
+                    }
+                    for point in pareto_front
+                ]
+                pareto_data.extend(os_pareto)
+
+                if checkpoint is not None:
+                    checkpoint.add(os_id, {"result": result, "pareto": os_pareto})
 
             except Exception as e:
                 logger.error(f"Erro ao otimizar OS {row['os_id']}: {e}", exc_info=True)
                 continue
 
+        if checkpoint is not None:
+            checkpoint.flush()
+
         # Salvar resultados no banco se solicitado
         if request.save_to_database and results:
             results_df = pd.DataFrame(results)
@@ -732,6 +850,10 @@ async def run_optimization(request: OptimizationRequest):
                 if pareto_inserted > 0:
                     logger.info(f"{pareto_inserted} pontos Pareto salvos no banco")
 
+        # Execução concluída: o checkpoint não é mais necessário
+        if checkpoint is not None:
+            checkpoint.reset()
+
         # Ordenar por prioridade
         results.sort(key=lambda x: x['prioridade'], reverse=True)
 
@@ -908,6 +1030,71 @@ async def get_pareto_front(equipment_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/reliability/fleet")
+async def get_fleet_reliability(
+    equipment_id: Optional[str] = Query(None, description="ID do equipamento"),
+    horizon: int = Query(365, ge=1, le=36500, description="Horizonte das curvas (dias)"),
+    step: int = Query(7, ge=1, description="Intervalo de amostragem das curvas (dias)")
+):
+    """
+    Retorna MTTF, probabilidade de falha e curvas de sobrevivência/risco da frota.
+
+    Os indicadores de todas as ordens de serviço são calculados em uma única
+    chamada vetorizada a partir das taxas DGA e do estado atual (mf_dga).
+    """
+    if not db_connector:
+        raise HTTPException(
+            status_code=400,
+            detail="Banco de dados não configurado"
+        )
+
+    try:
+        manager = DatabaseManager(db_connector)
+        orders_df = manager.get_maintenance_orders(equipment_id=equipment_id)
+
+        if orders_df.empty:
+            return {
+                "status": "success",
+                "message": "Nenhuma ordem de serviço encontrada",
+                "equipment": []
+            }
+
+        rate_columns = ['dga_taxa_n', 'dga_taxa_d1', 'dga_taxa_d2', 'dga_taxa_d3']
+        rates = orders_df[rate_columns].astype(float).values
+        initial_states = orders_df['mf_dga'].fillna(0).astype(int).clip(0, 4).values
+
+        markov = MarkovChainModel(n_states=5)
+        reliability = markov.batch_reliability(rates, horizon=horizon, initial_states=initial_states)
+
+        days = list(range(0, horizon + 1, step))
+        equipment = []
+
+        for i, row in enumerate(orders_df.itertuples(index=False)):
+            state = initial_states[i]
+            mttf = reliability['mttf'][i, state] if state < 4 else 0.0
+            equipment.append({
+                "os_id": row.os_id,
+                "equipment_id": row.equipment_id,
+                "estado_atual": int(state),
+                "mttf_dias": float(mttf) if np.isfinite(mttf) else None,
+                "prob_falha_horizonte": float(1.0 - reliability['survival'][i, -1]),
+                "survival": reliability['survival'][i, days].round(6).tolist(),
+                "hazard": np.nan_to_num(reliability['hazard'][i, [d - 1 for d in days[1:]]]).round(6).tolist()
+            })
+
+        return {
+            "status": "success",
+            "horizon": horizon,
+            "days": days,
+            "total": len(equipment),
+            "equipment": equipment
+        }
+
+    except Exception as e:
+        logger.error(f"Erro ao calcular confiabilidade da frota: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ============================================================================
 # ENDPOINTS DE DETECÇÃO DE ANOMALIAS
 # ============================================================================
@@ -917,6 +1104,10 @@ async def get_pareto_front(equipment_id: str):
 async def train_anomaly_model(request: AnomalyTrainingRequest):
     """
     Treina um novo modelo de autoencoder para detecção de anomalias.
+
+    Por padrão o treinamento é executado em segundo plano e a resposta traz
+    o job_id; o progresso por época pode ser acompanhado em
+    /api/anomaly/training-jobs/{job_id}/events (SSE) ou /api/anomaly/training-status.
     """
     if not db_connector:
         raise HTTPException(
@@ -924,98 +1115,335 @@ async def train_anomaly_model(request: AnomalyTrainingRequest):
             detail="Banco de dados não configurado"
         )
 
+    config = {
+        'model_arch': request.model_arch,
+        'latent_dim': request.latent_dim,
+        'window_size': request.window_size
+    }
+
+    # Conexão própria do treinamento (pyodbc não compartilha conexões entre threads)
+    connector = db_connector.clone()
+
+    def run_training(progress_callback=None):
+        try:
+            connector.connect()
+            manager = AnomalyManager(connector)
+
+            result = manager.train_autoencoder(
+                equipment_ids=request.equipment_ids,
+                model_name=request.model_name,
+                model_arch=request.model_arch,
+                latent_dim=request.latent_dim,
+                window_size=request.window_size,
+                num_epochs=request.num_epochs,
+                learning_rate=request.learning_rate,
+                progress_callback=progress_callback,
+                batch_size=request.batch_size,
+                num_workers=request.num_workers,
+                early_stopping_patience=request.early_stopping_patience,
+                lr_patience=request.lr_patience,
+                restore_best_weights=request.restore_best_weights,
+                features=request.features,
+                multiresolution=request.multiresolution
+            )
+        finally:
+            connector.disconnect()
+
+        # Registrar modelo para uso posterior (apenas se persistido: o registro
+        # pode despejá-lo e recarregá-lo do banco)
+        if result['status'] == 'success' and result.get('model_saved'):
+            model_registry.put(request.model_name, manager.autoencoder, config=config)
+
+        logger.info(f"Treinamento concluído: {result['status']}")
+        return result
+
     try:
         logger.info(f"Iniciando treinamento: {request.model_arch}, {request.num_epochs} épocas, {request.window_size}h janela")
 
-        manager = AnomalyManager(db_connector)
+        if not request.background:
+            return run_training()
 
-        result = manager.train_autoencoder(
-            equipment_ids=request.equipment_ids,
+        job = training_jobs.submit(
+            run_training,
             model_name=request.model_name,
-            model_arch=request.model_arch,
-            latent_dim=request.latent_dim,
-            window_size=request.window_size,
-            num_epochs=request.num_epochs,
-            learning_rate=request.learning_rate
-        )
-
-        # Guardar modelo no pool global para uso posterior
-        if result['status'] == 'success' and manager.autoencoder is not None:
-            trained_models[request.model_name] = {
-                'manager': manager,
-                'autoencoder': manager.autoencoder,
-                'trained_at': datetime.now(),
-                'config': {
-                    'model_arch': request.model_arch,
-                    'latent_dim': request.latent_dim,
-                    'window_size': request.window_size
-                }
+            params={
+                **config,
+                'num_epochs': request.num_epochs,
+                'learning_rate': request.learning_rate,
+                'batch_size': request.batch_size
             }
-            logger.info(f"Modelo '{request.model_name}' armazenado no pool global")
+        )
 
-        logger.info(f"Treinamento concluído: {result['status']}")
-        return result
+        return {
+            "status": "success",
+            "message": f"Treinamento do modelo '{request.model_name}' iniciado em segundo plano",
+            "job_id": job.job_id,
+            "model_name": request.model_name,
+            "events_url": f"/api/anomaly/training-jobs/{job.job_id}/events"
+        }
 
     except Exception as e:
         logger.error(f"Erro ao treinar modelo: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/anomaly/training-status")
-async def get_training_status():
+@app.post("/api/anomaly/train-farm")
+async def train_anomaly_farm(request: AnomalyFarmRequest):
     """
-    Retorna o status atual do treinamento para polling no frontend.
+    Treina um modelo por equipamento ou por localização em um pool de processos.
+
+    Executado como job de treinamento; cada unidade concluída publica um
+    evento "unit" em /api/anomaly/training-jobs/{job_id}/events. Os modelos
+    ficam em anomaly_models como "<model_name>:<unidade>" e são carregados
+    sob demanda pelo registro na detecção.
     """
+    if not db_connector:
+        raise HTTPException(
+            status_code=400,
+            detail="Banco de dados não configurado"
+        )
+
+    # Conexão própria da fazenda (pyodbc não compartilha conexões entre threads)
+    connector = db_connector.clone()
+
+    farm = TrainingFarm(
+        connector,
+        max_workers=request.max_workers or _anomaly_config.get("farm_max_workers"),
+        threads_per_worker=request.threads_per_worker or _anomaly_config.get("farm_threads_per_worker", 1)
+    )
+
+    def run_farm(progress_callback=None):
+        try:
+            connector.connect()
+
+            result = farm.train(
+                model_name=request.model_name,
+                partition_by=request.partition_by,
+                units=request.units,
+                model_arch=request.model_arch,
+                latent_dim=request.latent_dim,
+                window_size=request.window_size,
+                num_epochs=request.num_epochs,
+                learning_rate=request.learning_rate,
+                batch_size=request.batch_size,
+                early_stopping_patience=request.early_stopping_patience,
+                lr_patience=request.lr_patience,
+                features=request.features,
+                progress_callback=progress_callback
+            )
+        finally:
+            connector.disconnect()
+
+        # Modelos retreinados: descartar versões residentes desatualizadas
+        for unit in result.get('units', []):
+            model_registry.evict(unit['model_name'])
+
+        logger.info(f"Fazenda de treinamento concluída: {result['message']}")
+        return result
+
+    if request.partition_by not in ("equipment_id", "localizacao"):
+        raise HTTPException(
+            status_code=400,
+            detail="partition_by deve ser 'equipment_id' ou 'localizacao'"
+        )
+
     try:
-        # Simples polling - pode ser melhorado com WebSocket
-        import subprocess
-        import os
+        if not request.background:
+            return run_farm()
 
-        log_file = Path(__file__).parent.parent / "logs" / "maintenance_system.log"
+        job = training_jobs.submit(
+            run_farm,
+            model_name=request.model_name,
+            params={
+                'mode': 'farm',
+                'partition_by': request.partition_by,
+                'model_arch': request.model_arch,
+                'window_size': request.window_size,
+                'num_epochs': request.num_epochs,
+                'max_workers': farm.max_workers,
+                'threads_per_worker': farm.threads_per_worker
+            }
+        )
 
-        status = {
-            "status": "idle",
-            "message": "Nenhum treinamento em andamento",
-            "latest_logs": []
+        return {
+            "status": "success",
+            "message": f"Fazenda de treinamento '{request.model_name}' iniciada em segundo plano",
+            "job_id": job.job_id,
+            "model_name": request.model_name,
+            "events_url": f"/api/anomaly/training-jobs/{job.job_id}/events"
         }
 
-        # Se arquivo de log existe, ler últimas linhas
-        if log_file.exists():
-            try:
-                with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    # Pegar últimas 20 linhas
-                    recent_lines = lines[-20:] if len(lines) > 20 else lines
-
-                    # Filtrar logs relevantes de treinamento
-                    training_logs = [l.strip() for l in recent_lines if 'Época' in l or 'Treinamento' in l or 'autoencoder' in l.lower()]
-                    status["latest_logs"] = training_logs[-5:]  # Últimos 5 logs
-
-                    # Detectar status baseado em logs recentes
-                    recent_text = ''.join(recent_lines[-10:])
-                    if 'Época' in recent_text and 'Treinamento concluído' not in recent_text:
-                        status["status"] = "training"
-                        status["message"] = "Modelo em treinamento..."
-                    elif 'Treinamento concluído' in recent_text:
-                        status["status"] = "completed"
-                        status["message"] = "Treinamento concluído com sucesso!"
-                    elif 'Erro' in recent_text:
-                        status["status"] = "error"
-                        status["message"] = "Erro durante o treinamento"
+    except Exception as e:
+        logger.error(f"Erro na fazenda de treinamento: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
 
-            except Exception as e:
-                logger.warning(f"Erro ao ler logs: {e}")
 
-        return status
+@app.post("/api/anomaly/fine-tune")
+async def fine_tune_anomaly_model(request: AnomalyFineTuneRequest):
+    """
+    Ajusta um modelo existente com as leituras posteriores ao seu último treinamento.
+
+    Executado como job de treinamento (mesmos eventos e endpoints de /api/anomaly/train).
+    """
+    if not db_connector:
+        raise HTTPException(
+            status_code=400,
+            detail="Banco de dados não configurado"
+        )
+
+    # Conexão própria do fine-tuning (pyodbc não compartilha conexões entre threads)
+    connector = db_connector.clone()
+
+    def run_fine_tuning(progress_callback=None):
+        try:
+            connector.connect()
+            manager = AnomalyManager(connector)
+
+            result = manager.fine_tune_autoencoder(
+                model_name=request.model_name,
+                num_epochs=request.num_epochs,
+                learning_rate=request.learning_rate,
+                replay_days=request.replay_days,
+                replay_fraction=request.replay_fraction,
+                batch_size=request.batch_size,
+                progress_callback=progress_callback,
+                early_stopping_patience=request.early_stopping_patience
+            )
+        finally:
+            connector.disconnect()
+
+        # Substituir o modelo residente pelo ajustado (apenas se persistido)
+        if result['status'] == 'success' and result.get('model_saved'):
+            model_registry.put(
+                request.model_name,
+                manager.autoencoder,
+                config=ModelRegistry.config_of(manager.autoencoder)
+            )
+
+        logger.info(f"Fine-tuning concluído: {result['status']}")
+        return result
+
+    try:
+        if not request.background:
+            return run_fine_tuning()
+
+        job = training_jobs.submit(
+            run_fine_tuning,
+            model_name=request.model_name,
+            params={
+                'mode': 'fine_tune',
+                'num_epochs': request.num_epochs,
+                'learning_rate': request.learning_rate,
+                'replay_days': request.replay_days,
+                'replay_fraction': request.replay_fraction
+            }
+        )
+
+        return {
+            "status": "success",
+            "message": f"Fine-tuning do modelo '{request.model_name}' iniciado em segundo plano",
+            "job_id": job.job_id,
+            "model_name": request.model_name,
+            "events_url": f"/api/anomaly/training-jobs/{job.job_id}/events"
+        }
 
     except Exception as e:
-        logger.error(f"Erro ao obter status: {e}")
+        logger.error(f"Erro no fine-tuning: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/anomaly/training-status")
+async def get_training_status(job_id: Optional[str] = Query(None)):
+    """
+    Retorna o status de um treinamento (padrão: o mais recente) para polling no frontend.
+    """
+    job = training_jobs.get(job_id) if job_id else training_jobs.latest()
+
+    if job is None:
         return {
-            "status": "unknown",
-            "message": "Erro ao obter status",
+            "status": "idle",
+            "message": "Nenhum treinamento em andamento",
             "latest_logs": []
         }
 
+    epochs = [event for event in job.events if event["type"] == "epoch"][-5:]
+    latest_logs = [
+        f"Época {event['epoch']}/{event['num_epochs']} - Train Loss: {event['train_loss']:.6f}"
+        for event in epochs
+    ]
+
+    if job.status == "completed":
+        status, message = "completed", "Treinamento concluído com sucesso!"
+    elif job.status == "failed":
+        status, message = "error", f"Erro durante o treinamento: {job.error}"
+    else:
+        status, message = "training", "Modelo em treinamento..."
+
+    return {
+        "status": status,
+        "message": message,
+        "latest_logs": latest_logs,
+        "job": job.to_dict()
+    }
+
+
+@app.get("/api/anomaly/training-jobs")
+async def list_training_jobs():
+    """
+    Lista os treinamentos em segundo plano (mais recentes primeiro).
+    """
+    return {"jobs": training_jobs.list_jobs()}
+
+
+@app.get("/api/anomaly/training-jobs/{job_id}")
+async def get_training_job(job_id: str):
+    """
+    Retorna o estado e o progresso de um treinamento.
+    """
+    job = training_jobs.get(job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' não encontrado")
+
+    return job.to_dict()
+
+
+@app.get("/api/anomaly/training-jobs/{job_id}/events")
+async def stream_training_events(job_id: str):
+    """
+    Transmite os eventos de um treinamento via Server-Sent Events.
+
+    Cada evento (queued, started, epoch, completed, failed) é enviado como
+    JSON; o fluxo é encerrado quando o treinamento termina.
+    """
+    queue = training_jobs.subscribe(job_id)
+
+    if queue is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' não encontrado")
+
+    async def event_stream():
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    # Mantém a conexão aberta entre épocas longas
+                    yield ": keep-alive\n\n"
+                    continue
+
+                yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+                if event["type"] in TERMINAL_EVENTS:
+                    break
+        finally:
+            training_jobs.unsubscribe(job_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 
 @app.post("/api/anomaly/detect")
 async def detect_anomalies(request: AnomalyDetectionRequest):
@@ -1029,33 +1457,36 @@ async def detect_anomalies(request: AnomalyDetectionRequest):
         )
 
     try:
-        # Buscar modelo no pool global
         model_name = request.model_name or 'autoencoder_model'
 
-        if model_name not in trained_models:
-            return {
-                "status": "error",
-                "message": f"Modelo '{model_name}' não foi treinado. Treine o modelo primeiro."
-            }
+        # Fixar o modelo durante a detecção (carregado do banco se não residente)
+        with model_registry.pin(model_name) as autoencoder:
+            if autoencoder is None:
+                return {
+                    "status": "error",
+                    "message": f"Modelo '{model_name}' não foi treinado. Treine o modelo primeiro."
+                }
 
-        # Recuperar manager com autoencoder já treinado
-        model_info = trained_models[model_name]
-        manager = model_info['manager']
+            manager = AnomalyManager(db_connector)
+            manager.autoencoder = autoencoder
 
-        logger.info(f"Usando modelo '{model_name}' treinado em {model_info['trained_at']}")
+            logger.info(f"Usando modelo '{model_name}'")
 
-        # Log dos parâmetros de aleatorização
-        if request.randomize_anomalies:
-            logger.info(f"Detecção com tipos de anomalias aleatorizados - Tipo: {request.anomaly_type}")
+            # Log dos parâmetros de aleatorização
+            if request.randomize_anomalies:
+                logger.info(f"Detecção com tipos de anomalias aleatorizados - Tipo: {request.anomaly_type}")
 
-        result = manager.detect_anomalies(
-            equipment_ids=request.equipment_ids,
-            threshold_percentile=request.threshold_percentile,
-            save_to_database=request.save_to_database,
-            randomize_anomalies=request.randomize_anomalies,
-            anomaly_type=request.anomaly_type,
-            window_size=request.window_size
-        )
+            result = manager.detect_anomalies(
+                equipment_ids=request.equipment_ids,
+                threshold_percentile=request.threshold_percentile,
+                save_to_database=request.save_to_database,
+                randomize_anomalies=request.randomize_anomalies,
+                anomaly_type=request.anomaly_type,
+                window_size=request.window_size,
+                batch_size=request.batch_size,
+                n_workers=request.n_workers,
+                model_name=model_name
+            )
 
         return result
 
@@ -1064,6 +1495,71 @@ async def detect_anomalies(request: AnomalyDetectionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/anomaly/stream")
+async def stream_anomaly_detection(request: AnomalyStreamRequest):
+    """
+    Avalia apenas as leituras novas desde a última chamada (detecção online).
+
+    Na primeira chamada para um modelo, os buffers de cada equipamento são
+    inicializados com as leituras mais recentes; as chamadas seguintes avaliam
+    somente as janelas completadas por novas linhas de sensor_data, contra os
+    thresholds calibrados no treinamento.
+    """
+    if not db_connector:
+        raise HTTPException(
+            status_code=400,
+            detail="Banco de dados não configurado"
+        )
+
+    try:
+        model_name = request.model_name or 'autoencoder_model'
+
+        with model_registry.pin(model_name) as autoencoder:
+            if autoencoder is None:
+                return {
+                    "status": "error",
+                    "message": f"Modelo '{model_name}' não foi treinado. Treine o modelo primeiro."
+                }
+
+            manager = AnomalyManager(db_connector)
+            manager.autoencoder = autoencoder
+
+            # Avaliador guardado no registro (despejado junto com o modelo);
+            # recriado se o modelo foi retreinado ou recarregado
+            scorer = model_registry.get_streaming_scorer(model_name)
+            if scorer is None or scorer.autoencoder is not autoencoder:
+                scorer = manager.create_streaming_scorer(rolling_window=request.rolling_window)
+
+            result = manager.score_new_readings(
+                scorer,
+                save_to_database=request.save_to_database,
+                batch_size=request.batch_size
+            )
+
+            model_registry.set_streaming_scorer(model_name, scorer)
+
+            return result
+
+    except Exception as e:
+        logger.error(f"Erro na detecção online: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/anomaly/models")
+async def list_resident_models():
+    """
+    Lista os modelos de anomalia residentes em memória e seus tamanhos.
+    """
+    models = model_registry.list_models()
+
+    return {
+        "memory_budget_mb": round(model_registry.memory_budget_bytes / (1024 * 1024), 3),
+        "total_mb": round(model_registry.total_bytes / (1024 * 1024), 3),
+        "count": len(models),
+        "models": models
+    }
+
+
 @app.get("/api/anomaly/list")
 async def list_anomalies(
     equipment_id: Optional[str] = Query(None),
@@ -65,7 +65,7 @@ export default function AnomaliesPage() {
       })
 
       if (response.data.status === 'success') {
-        setMessage(`✅ Modelo treinado: ${response.data.message}`)
+        setMessage(`⏳ ${response.data.message}`)
         // Polling para status de treinamento
         let isCompleted = false
         let pollCount = 0
@@ -76,7 +76,7 @@ export default function AnomaliesPage() {
           pollCount++
 
           try {
-            const statusRes = await fetch('http://localhost:8000/api/anomaly/training-status')
+            const statusRes = await fetch(`http://localhost:8000/api/anomaly/training-status?job_id=${response.data.job_id ?? ''}`)
             const statusData = await statusRes.json()
 
             if (statusData.latest_logs && statusData.latest_logs.length > 0) {
@@ -86,7 +86,7 @@ export default function AnomaliesPage() {
 
             if (statusData.status === 'completed') {
               isCompleted = true
-              setMessage(`✅ Treinamento concluído! ${response.data.message}`)
+              setMessage(`✅ Treinamento concluído! ${statusData.job?.result?.message ?? ''}`)
               // Carregar anomalias após treinamento
               setTimeout(loadAnomalies, 1000)
             } else if (statusData.status === 'error') {
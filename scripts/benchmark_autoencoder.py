@@ -0,0 +1,184 @@
+"""
+Benchmark do autoencoder de anomalias: execução eager vs compilada e threads.
+
+Mede, em dados sintéticos, o tempo por época de treino e a vazão de
+detecção (janelas/s) para cada combinação de modo de execução
+(eager, trace, compile) e número de threads intra-op, e compara os scores
+de cada modo com os do modo eager.
+
+Uso:
+    python scripts/benchmark_autoencoder.py --arch mlp --threads 1 4 8
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+import torch
+
+from src.anomaly import MovingWindowAutoEncoder, configure_torch_threads
+from src.utils import setup_logging
+
+
+def parse_arguments():
+    """Parse argumentos da linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark do autoencoder de anomalias (eager vs compilado)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos:
+  # MLP com 1, 4 e 8 threads
+  python scripts/benchmark_autoencoder.py --arch mlp --threads 1 4 8
+
+  # CNN, apenas eager e TorchScript
+  python scripts/benchmark_autoencoder.py --arch cnn --modes eager trace
+
+  # Janela de 720h com agregação multirresolução (blocos de 24h, 24h recentes)
+  python scripts/benchmark_autoencoder.py --window-size 720 --block-size 24 --recent-size 24
+        """
+    )
+
+    parser.add_argument("--arch", choices=["mlp", "cnn", "cnn_mc", "pca"], default="mlp", help="Arquitetura (padrão: mlp)")
+    parser.add_argument("--rows", type=int, default=20000, help="Linhas de dados sintéticos (padrão: 20000)")
+    parser.add_argument("--features", type=int, default=8, help="Número de features (padrão: 8)")
+    parser.add_argument("--window-size", type=int, default=24, help="Tamanho da janela (padrão: 24)")
+    parser.add_argument(
+        "--block-size", type=int, default=None,
+        help="Agregação multirresolução: horas por bloco antigo (padrão: janelas brutas)"
+    )
+    parser.add_argument("--recent-size", type=int, default=24, help="Horas recentes sem agregação (padrão: 24)")
+    parser.add_argument("--epochs", type=int, default=3, help="Épocas de treino medidas (padrão: 3)")
+    parser.add_argument("--train-batch-size", type=int, default=256, help="Lote de treino (padrão: 256)")
+    parser.add_argument("--batch-size", type=int, default=1024, help="Lote de detecção (padrão: 1024)")
+    parser.add_argument("--repeats", type=int, default=3, help="Repetições da detecção (padrão: 3)")
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=[torch.get_num_threads()],
+        help="Números de threads intra-op avaliados (padrão: padrão do PyTorch)"
+    )
+    parser.add_argument("--interop-threads", type=int, default=None, help="Threads inter-op do processo")
+    parser.add_argument(
+        "--modes", nargs="+", choices=["eager", "trace", "compile"], default=["eager", "trace", "compile"],
+        help="Modos de execução avaliados (padrão: todos)"
+    )
+    parser.add_argument(
+        "--log-level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Nível de log (padrão: WARNING)"
+    )
+
+    return parser.parse_args()
+
+
+def make_data(n_rows: int, n_features: int, seed: int = 42) -> pd.DataFrame:
+    """Séries sintéticas com ciclo diário e ruído."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_rows)[:, np.newaxis]
+    phases = rng.uniform(0, 2 * np.pi, n_features)
+    values = np.sin(2 * np.pi * t / 24 + phases) + 0.1 * rng.standard_normal((n_rows, n_features))
+    return pd.DataFrame(values, columns=[f"feature_{i}" for i in range(n_features)])
+
+
+def run_case(args, data: pd.DataFrame, mode: str, num_threads: int, state_dict=None):
+    """Treina e detecta com um modo e número de threads; retorna métricas e scores."""
+    torch.manual_seed(0)
+    autoencoder = MovingWindowAutoEncoder(
+        model_arch=args.arch,
+        latent_dim=5,
+        device="cpu",
+        compile_mode=None if mode == "eager" else mode,
+        multiresolution=(
+            {"block_size": args.block_size, "recent_size": args.recent_size} if args.block_size else None
+        )
+    )
+
+    start = time.perf_counter()
+    autoencoder.fit(
+        data,
+        window_size=args.window_size,
+        num_epochs=args.epochs,
+        batch_size=args.train_batch_size,
+        early_stopping_patience=None,
+        lr_patience=None,
+        num_threads=num_threads
+    )
+    epoch_seconds = (time.perf_counter() - start) / args.epochs
+
+    # Mesmos pesos em todos os modos para comparar os scores
+    if state_dict is not None:
+        autoencoder.model.load_state_dict(state_dict)
+        autoencoder._compiled_model = None
+
+    # Aquecimento (compilação) fora da medição
+    autoencoder.detect(data, window_size=args.window_size, batch_size=args.batch_size, num_threads=num_threads)
+
+    timings = []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        detections = autoencoder.detect(
+            data, window_size=args.window_size, batch_size=args.batch_size, num_threads=num_threads
+        )
+        timings.append(time.perf_counter() - start)
+
+    n_windows = len(data) - args.window_size + 1
+
+    return {
+        "mode": mode if autoencoder.compile_mode is not None or mode == "eager" else f"{mode} (eager)",
+        "threads": num_threads,
+        "epoch_s": epoch_seconds,
+        "detect_s": min(timings),
+        "windows_per_s": n_windows / min(timings),
+    }, detections["reconstruction_error"].to_numpy(), autoencoder.model.state_dict()
+
+
+def main():
+    """Função principal."""
+    args = parse_arguments()
+    setup_logging(log_level=args.log_level)
+
+    if args.interop_threads:
+        configure_torch_threads(inter_op=args.interop_threads)
+
+    data = make_data(args.rows, args.features)
+
+    aggregation = f"blocos de {args.block_size}h + {args.recent_size}h recentes" if args.block_size else "bruta"
+    print(f"PyTorch {torch.__version__} | arch={args.arch} | {args.rows} linhas x {args.features} features | "
+          f"janela={args.window_size} ({aggregation}) | inter-op={torch.get_num_interop_threads()}")
+
+    rows = []
+    for num_threads in args.threads:
+        reference_scores, reference_state = None, None
+
+        for mode in args.modes:
+            result, scores, state_dict = run_case(args, data, mode, num_threads, reference_state)
+
+            if reference_scores is None:
+                reference_scores, reference_state = scores, state_dict
+                result["max_diff"] = 0.0
+            else:
+                result["max_diff"] = float(np.max(np.abs(scores - reference_scores)))
+
+            rows.append(result)
+
+    results = pd.DataFrame(rows)
+    baseline = results.groupby("threads")["windows_per_s"].transform("first")
+    results["speedup"] = results["windows_per_s"] / baseline
+
+    print(results.to_string(
+        index=False,
+        formatters={
+            "epoch_s": "{:.3f}".format,
+            "detect_s": "{:.3f}".format,
+            "windows_per_s": "{:,.0f}".format,
+            "max_diff": "{:.2e}".format,
+            "speedup": "{:.2f}x".format,
+        }
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,16 +6,18 @@ Uso:
 """
 
 import argparse
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
 # Adicionar diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.data import DataLoader, DataValidator, DataPreprocessor
+from src.data import DataLoader, DataValidator, DataPreprocessor, ChunkedResultWriter
 from src.models import MarkovChainModel
-from src.optimization import MaintenanceProblem, NSGA2Solver, ParetoAnalyzer
+from src.optimization import MaintenanceProblem, NSGA2Solver, ParetoAnalyzer, FileCheckpoint
 from src.utils import setup_logging, get_config_loader
 from tqdm import tqdm
 import pandas as pd
@@ -37,6 +39,12 @@ Exemplos:
 
   # Com top N soluções
   python scripts/run_optimization.py -i dados.csv -o resultados.xlsx --top 5
+
+  # Modo streaming para arquivos grandes (blocos de 500 OSs, 8 processos)
+  python scripts/run_optimization.py -i dados.csv -o resultados.csv --stream --chunk-size 500 --workers 8
+
+  # Retomar uma execução em streaming interrompida
+  python scripts/run_optimization.py -i dados.csv -o resultados.csv --stream --resume
         """
     )
 
@@ -83,7 +91,54 @@ Exemplos:
         help="Pular validação de dados (não recomendado)"
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Processar a entrada em blocos, gravando as fronteiras de Pareto incrementalmente"
+    )
+
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="Número de OSs por bloco no modo streaming (padrão: 1000)"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Número de processos paralelos no modo streaming (padrão: núcleos da CPU)"
+    )
+
+    parser.add_argument(
+        "--pareto-output",
+        type=str,
+        default=None,
+        help="Arquivo CSV ou Parquet para as fronteiras de Pareto no modo streaming "
+             "(padrão: fronteiras_de_pareto.csv ao lado da saída; Parquet não pode ser retomado)"
+    )
+
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=None,
+        help="Arquivo de checkpoint das OSs concluídas no modo streaming "
+             "(padrão: <saída>.checkpoint.jsonl)"
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Retomar a partir do checkpoint, pulando as OSs já otimizadas (requer --stream)"
+    )
+
+    args = parser.parse_args()
+
+    if args.resume and not args.stream:
+        parser.error("--resume requer --stream")
+
+    return args
 
 
 def print_banner():
@@ -102,7 +157,7 @@ def print_banner():
 def extract_os_parameters(os_row, field_mappings):
     """Extrai parâmetros de uma OS."""
     tipo = os_row['MotivoManutencao']
-    mapping = field_mappings[tipo.upper() + "_mapping"] if tipo.upper() in ["DGA", "FQ"] else field_mappings["dga_mapping"]
+    mapping = field_mappings[tipo.lower() + "_mapping"] if tipo.upper() in ["DGA", "FQ"] else field_mappings["dga_mapping"]
 
     estado = int(os_row[mapping['estado_atual']])
 
@@ -128,6 +183,67 @@ def extract_os_parameters(os_row, field_mappings):
     return rates, costs, unavailability, offset
 
 
+def optimize_single_order(os_row, field_mappings, selection_criterion, solver, analyzer, markov):
+    """
+    Otimiza uma única ordem de serviço.
+
+    Returns:
+        Tupla (fronteira_pareto, data_otima) com a fronteira de Pareto da OS
+        e o dicionário com a melhor solução segundo o critério de seleção.
+    """
+    # Extrair parâmetros
+    rates, costs, unavailability, offset = extract_os_parameters(os_row, field_mappings)
+
+    # Criar modelo de Markov
+    transition_matrix = markov.build_transition_matrix(rates)
+
+    # Criar e resolver problema
+    problem = MaintenanceProblem(
+        transition_matrix=transition_matrix,
+        operational_costs=costs,
+        unavailability_costs=unavailability,
+        time_offset=offset
+    )
+
+    pareto_front = solver.solve(problem)
+
+    # Adicionar OS_id
+    pareto_front['OS_Id'] = os_row['OS_Id']
+
+    # Selecionar melhor solução
+    best_idx, best_solution = analyzer.select_best_solution(
+        pareto_front,
+        criterion=selection_criterion
+    )
+
+    # Calcular data ótima
+    data_otima = datetime.today() + timedelta(days=int(best_solution['t']))
+
+    optimal_date = {
+        'OS_Id': os_row['OS_Id'],
+        'DataOtima': data_otima,
+        'Dias': int(best_solution['t']),
+        'Custo': best_solution['Custo'],
+        'Indisponibilidade': best_solution['Indisponibilidade'],
+        'Prioridade': 0  # Será atualizado
+    }
+
+    return pareto_front, optimal_date
+
+
+def rank_optimal_dates(optimal_dates):
+    """Ordena o calendário por custo e atribui as prioridades."""
+    optimal_dates_df = pd.DataFrame(
+        optimal_dates,
+        columns=['OS_Id', 'DataOtima', 'Dias', 'Custo', 'Indisponibilidade', 'Prioridade']
+    )
+    optimal_dates_df['DataOtima'] = pd.to_datetime(optimal_dates_df['DataOtima'])
+    optimal_dates_df = optimal_dates_df.sort_values('Custo').reset_index(drop=True)
+    optimal_dates_df['Prioridade'] = range(len(optimal_dates_df), 0, -1)
+
+    return optimal_dates_df
+
+
 def optimize_maintenance_orders(data, field_mappings, selection_criterion, logger):
     """Otimiza todas as ordens de serviço."""
     logger.info(f"Iniciando otimização de {len(data)} ordens de serviço...")
@@ -141,57 +257,182 @@ def optimize_maintenance_orders(data, field_mappings, selection_criterion, logge
 
     for idx, os in tqdm(data.iterrows(), total=len(data), desc="Otimizando OSs"):
         try:
-            # Extrair parâmetros
-            rates, costs, unavailability, offset = extract_os_parameters(os, field_mappings)
-
-            # Criar modelo de Markov
-            transition_matrix = markov.build_transition_matrix(rates)
-
-            # Criar e resolver problema
-            problem = MaintenanceProblem(
-                transition_matrix=transition_matrix,
-                operational_costs=costs,
-                unavailability_costs=unavailability,
-                time_offset=offset
+            pareto_front, optimal_date = optimize_single_order(
+                os, field_mappings, selection_criterion, solver, analyzer, markov
             )
-
-            pareto_front = solver.solve(problem)
-
-            # Adicionar OS_id
-            pareto_front['OS_Id'] = os['OS_Id']
             all_results.append(pareto_front)
-
-            # Selecionar melhor solução
-            best_idx, best_solution = analyzer.select_best_solution(
-                pareto_front,
-                criterion=selection_criterion
-            )
-
-            # Calcular data ótima
-            data_otima = datetime.today() + timedelta(days=int(best_solution['t']))
-
-            optimal_dates.append({
-                'OS_Id': os['OS_Id'],
-                'DataOtima': data_otima,
-                'Dias': int(best_solution['t']),
-                'Custo': best_solution['Custo'],
-                'Indisponibilidade': best_solution['Indisponibilidade'],
-                'Prioridade': 0  # Será atualizado
-            })
+            optimal_dates.append(optimal_date)
 
         except Exception as e:
             logger.error(f"Erro ao otimizar OS {os['OS_Id']}: {e}")
             continue
 
     # Ordenar por custo e atualizar prioridades
-    optimal_dates_df = pd.DataFrame(optimal_dates).sort_values('Custo').reset_index(drop=True)
-    optimal_dates_df['Prioridade'] = range(len(optimal_dates_df), 0, -1)
+    optimal_dates_df = rank_optimal_dates(optimal_dates)
 
     logger.info(f"Otimização concluída. {len(optimal_dates_df)} OSs processadas.")
 
     return all_results, optimal_dates_df
 
 
+# Estado de cada processo do pool no modo streaming (criado uma vez por processo)
+_worker_state = {}
+
+
+def _init_stream_worker(field_mappings, selection_criterion):
+    """Inicializa solver, analisador e modelo de Markov em um processo do pool."""
+    _worker_state['field_mappings'] = field_mappings
+    _worker_state['selection_criterion'] = selection_criterion
+    _worker_state['solver'] = NSGA2Solver()
+    _worker_state['analyzer'] = ParetoAnalyzer()
+    _worker_state['markov'] = MarkovChainModel(n_states=5)
+
+
+def _optimize_order_in_worker(record):
+    """
+    Otimiza uma OS dentro de um processo do pool.
+
+    Returns:
+        Tupla (fronteira_pareto, data_otima, erro). Em caso de falha, os dois
+        primeiros são None e erro contém a mensagem.
+    """
+    os_row = pd.Series(record)
+
+    try:
+        pareto_front, optimal_date = optimize_single_order(
+            os_row,
+            _worker_state['field_mappings'],
+            _worker_state['selection_criterion'],
+            _worker_state['solver'],
+            _worker_state['analyzer'],
+            _worker_state['markov'],
+        )
+        return pareto_front, optimal_date, None
+
+    except Exception as e:
+        return None, None, f"Erro ao otimizar OS {record.get('OS_Id')}: {e}"
+
+
+def get_numeric_mapping_columns(field_mappings):
+    """Lista as colunas numéricas (taxas, custos, indisponibilidade) dos mapeamentos."""
+    columns = []
+    for mapping_name in ("dga_mapping", "fq_mapping"):
+        mapping = field_mappings.get(mapping_name, {})
+        for group in ("taxas", "custos", "indisponibilidade"):
+            columns.extend(mapping.get(group, {}).values())
+
+    return columns
+
+
+def stream_maintenance_orders(
+    input_path,
+    pareto_path,
+    field_mappings,
+    selection_criterion,
+    chunk_size,
+    workers,
+    validate,
+    logger,
+    checkpoint=None,
+    resume=False
+):
+    """
+    Otimiza as ordens de serviço em blocos, com processamento paralelo.
+
+    A entrada é lida um bloco por vez e as fronteiras de Pareto são gravadas
+    em disco assim que cada bloco termina. Apenas o calendário (uma linha
+    por OS) permanece em memória até o fim, para a atribuição de prioridades.
+
+    Com checkpoint, o calendário de cada bloco é registrado logo após suas
+    fronteiras serem gravadas. Com resume, as OSs do checkpoint são puladas
+    e as fronteiras novas são acrescentadas ao arquivo existente.
+
+    Returns:
+        DataFrame com o calendário otimizado.
+    """
+    loader = DataLoader()
+    validator = DataValidator()
+    preprocessor = DataPreprocessor()
+    numeric_columns = get_numeric_mapping_columns(field_mappings)
+
+    optimal_dates = []
+    n_errors = 0
+    completed_ids = set()
+
+    if checkpoint is not None:
+        if resume:
+            optimal_dates.extend(checkpoint.load().values())
+            completed_ids = checkpoint.completed_ids
+            logger.info(f"Retomando execução: {len(completed_ids)} OSs já concluídas serão puladas")
+        else:
+            checkpoint.reset()
+
+    logger.info(
+        f"Modo streaming: blocos de {chunk_size} OSs, {workers} processos. "
+        f"Fronteiras de Pareto em: {pareto_path}"
+    )
+
+    with ChunkedResultWriter(pareto_path, append=resume) as pareto_writer, \
+            ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_stream_worker,
+                initargs=(field_mappings, selection_criterion)
+            ) as executor, \
+            tqdm(desc="Otimizando OSs", unit="OS") as progress:
+
+        for chunk in loader.iter_maintenance_orders(input_path, chunk_size=chunk_size):
+            if validate:
+                validator.validate_maintenance_order_data(chunk)
+
+            if completed_ids:
+                n_read = len(chunk)
+                chunk = chunk[~chunk['OS_Id'].astype(str).isin(completed_ids)]
+                progress.update(n_read - len(chunk))
+                if chunk.empty:
+                    continue
+
+            # Normalizar apenas as colunas numéricas usadas na otimização
+            chunk = preprocessor.normalize_numeric_columns(chunk, columns=numeric_columns)
+            chunk = preprocessor.add_default_unavailability_fields(chunk)
+
+            records = chunk.to_dict(orient="records")
+            map_chunksize = max(1, len(records) // (workers * 4))
+
+            chunk_fronts = []
+            chunk_dates = []
+            for pareto_front, optimal_date, error in executor.map(
+                _optimize_order_in_worker, records, chunksize=map_chunksize
+            ):
+                if error is not None:
+                    logger.error(error)
+                    n_errors += 1
+                    continue
+
+                chunk_fronts.append(pareto_front)
+                chunk_dates.append(optimal_date)
+
+            if chunk_fronts:
+                pareto_writer.append(pd.concat(chunk_fronts, ignore_index=True))
+
+            optimal_dates.extend(chunk_dates)
+
+            # Registrar o bloco apenas depois que suas fronteiras estão em disco
+            if checkpoint is not None:
+                for optimal_date in chunk_dates:
+                    checkpoint.add(optimal_date['OS_Id'], optimal_date)
+                checkpoint.flush()
+
+            progress.update(len(records))
+
+    optimal_dates_df = rank_optimal_dates(optimal_dates)
+
+    logger.info(
+        f"Otimização concluída. {len(optimal_dates_df)} OSs processadas, {n_errors} com erro."
+    )
+
+    return optimal_dates_df
+
+
 def print_results(optimal_dates, top_n, logger):
     """Exibe resultados no console."""
     print("\n" + "="*80)
@@ -226,6 +467,56 @@ def main():
     config_loader = get_config_loader()
     field_mappings = config_loader.load("field_mappings")
 
+    if args.stream:
+        output_path = Path(args.output)
+        pareto_path = (
+            Path(args.pareto_output) if args.pareto_output
+            else output_path.parent / "fronteiras_de_pareto.csv"
+        )
+        checkpoint_path = (
+            Path(args.checkpoint) if args.checkpoint
+            else output_path.with_suffix(".checkpoint.jsonl")
+        )
+
+        if args.resume and pareto_path.suffix.lower() == ".parquet" and pareto_path.exists():
+            logger.error(
+                f"Não é possível retomar gravando em Parquet existente ({pareto_path}). "
+                "Use --pareto-output com um arquivo CSV para execuções retomáveis."
+            )
+            sys.exit(1)
+
+        checkpoint = FileCheckpoint(checkpoint_path, flush_every=args.chunk_size)
+
+        try:
+            optimal_dates = stream_maintenance_orders(
+                args.input,
+                pareto_path,
+                field_mappings,
+                args.selection_criterion,
+                args.chunk_size,
+                max(1, args.workers),
+                not args.no_validation,
+                logger,
+                checkpoint=checkpoint,
+                resume=args.resume
+            )
+        except ValueError as e:
+            logger.error(f"Erro de validação: {e}")
+            sys.exit(1)
+
+        print_results(optimal_dates, args.top, logger)
+
+        logger.info(f"Salvando calendário em: {args.output}")
+        DataLoader().save_dataframe(optimal_dates, output_path)
+        logger.info(f"Fronteiras de Pareto salvas em: {pareto_path}")
+
+        # Execução concluída: o checkpoint não é mais necessário
+        checkpoint.reset()
+
+        logger.info("Processo concluído com sucesso!")
+        print("\n✓ Otimização finalizada!")
+        return
+
     # Carregar dados
     logger.info(f"Carregando dados de: {args.input}")
     loader = DataLoader()
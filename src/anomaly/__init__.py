@@ -1,6 +1,28 @@
 """Módulo de detecção de anomalias usando autoencoder."""
 
-from .autoencoder import MovingWindowAutoEncoder
-from .manager import AnomalyManager
+from importlib import import_module
 
-__all__ = ["MovingWindowAutoEncoder", "AnomalyManager"]
+from .jobs import TrainingJobManager
+from .onnx_engine import OnnxAnomalyDetector
+
+# Módulos que dependem do PyTorch são importados sob demanda, para que
+# workers que só usam OnnxAnomalyDetector não carreguem o torch
+_LAZY_IMPORTS = {
+    "MovingWindowAutoEncoder": ".autoencoder",
+    "configure_torch_threads": ".autoencoder",
+    "AnomalyManager": ".manager",
+    "ModelRegistry": ".registry",
+    "StreamingAnomalyScorer": ".streaming",
+    "TrainingFarm": ".farm",
+    "FeatureStore": ".feature_store",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        return getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["MovingWindowAutoEncoder", "AnomalyManager", "ModelRegistry", "TrainingJobManager", "StreamingAnomalyScorer",
+           "configure_torch_threads", "OnnxAnomalyDetector", "TrainingFarm", "FeatureStore"]
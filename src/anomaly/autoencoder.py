@@ -2,19 +2,87 @@
 Autoencoder com Janela Deslizante para detecção de anomalias em buchas.
 """
 
+import io
+import copy
+import functools
+import inspect
+import json
+import threading
+import time
+
 import numpy as np
 import pandas as pd
 import torch
 import torch.nn as nn
-from typing import Dict, List, Optional, Tuple
+from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler, SequentialSampler
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from sklearn.preprocessing import StandardScaler
+from sklearn.utils.extmath import randomized_svd
 import warnings
 
+from .detection import MultiResolutionWindows, build_detections, create_windows, group_segments
 from ..utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+COMPILE_MODES = (None, "trace", "compile")
+
+# Maior input_dim em que o PCA usa a decomposição exata da covariância
+PCA_EXACT_MAX_DIM = 2048
+
+
+def configure_torch_threads(intra_op: Optional[int] = None, inter_op: Optional[int] = None) -> None:
+    """
+    Define as threads do PyTorch para o processo.
+
+    Args:
+        intra_op: Threads usadas dentro de cada operação (torch.set_num_threads)
+        inter_op: Threads para operações independentes em paralelo. Só pode ser
+                  definido antes do primeiro trabalho paralelo do processo.
+    """
+    if intra_op:
+        torch.set_num_threads(intra_op)
+
+    if inter_op:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError as e:
+            logger.warning(f"Não foi possível definir threads inter-op ({inter_op}): {e}")
+
+    logger.info(
+        f"Threads do PyTorch: intra-op={torch.get_num_threads()}, "
+        f"inter-op={torch.get_num_interop_threads()}"
+    )
+
+
+@contextmanager
+def torch_threads(num_threads: Optional[int]) -> Iterator[None]:
+    """Limita as threads intra-op do PyTorch durante o bloco (None = sem alteração)."""
+    if not num_threads:
+        yield
+        return
+
+    previous = torch.get_num_threads()
+    torch.set_num_threads(num_threads)
+    try:
+        yield
+    finally:
+        torch.set_num_threads(previous)
+
+
+def _with_threads(method: Callable) -> Callable:
+    """Aceita o argumento num_threads e executa o método com torch_threads."""
+    @functools.wraps(method)
+    def wrapper(self, *args, num_threads: Optional[int] = None, **kwargs):
+        with torch_threads(num_threads):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
 
 class MLPAutoEncoder(nn.Module):
     """Autoencoder com arquitetura MLP."""
@@ -97,6 +165,170 @@ class CNNAutoEncoder(nn.Module):
         return reconstructed, latent
 
 
+class MultiChannelCNNAutoEncoder(nn.Module):
+    """
+    Autoencoder Conv1d multicanal: cada feature é um canal da série temporal.
+
+    Recebe a janela achatada (batch, seq_len * n_features), como os demais
+    modelos, e a reorganiza em (batch, n_features, seq_len) antes das
+    convoluções; a reconstrução volta ao mesmo layout achatado, de modo que
+    Q e a loss são calculados como nos outros modelos. A série é completada
+    com zeros até um múltiplo de 4 (dois MaxPool1d(2)) e recortada na saída.
+    """
+
+    def __init__(self, input_dim: int, n_features: int, latent_dim: int = 5):
+        super().__init__()
+
+        if input_dim % n_features != 0:
+            raise ValueError(f"input_dim={input_dim} não é múltiplo de n_features={n_features}")
+
+        self.n_features = n_features
+        self.seq_len = input_dim // n_features
+        self.padded_len = -(-self.seq_len // 4) * 4
+
+        # Encoder - convoluções temporais com as features como canais
+        self.encoder = nn.Sequential(
+            nn.Conv1d(n_features, 32, kernel_size=5, padding=2),
+            nn.ReLU(),
+            nn.MaxPool1d(2),
+            nn.Conv1d(32, 16, kernel_size=5, padding=2),
+            nn.ReLU(),
+            nn.MaxPool1d(2),
+            nn.Conv1d(16, 8, kernel_size=3, padding=1),
+            nn.ReLU(),
+        )
+
+        conv_output_size = 8 * (self.padded_len // 4)
+        self.fc_encode = nn.Linear(conv_output_size, latent_dim)
+
+        # Decoder
+        self.fc_decode = nn.Linear(latent_dim, conv_output_size)
+        self.decoder = nn.Sequential(
+            nn.ConvTranspose1d(8, 16, kernel_size=2, stride=2),
+            nn.ReLU(),
+            nn.ConvTranspose1d(16, 32, kernel_size=2, stride=2),
+            nn.ReLU(),
+            nn.Conv1d(32, n_features, kernel_size=3, padding=1),
+        )
+
+    def forward(self, x):
+        # x shape: (batch, seq_len * n_features) -> (batch, n_features, padded_len)
+        batch_size = x.size(0)
+        x = x.reshape(batch_size, self.seq_len, self.n_features).transpose(1, 2)
+        x = nn.functional.pad(x, (0, self.padded_len - self.seq_len))
+
+        enc = self.encoder(x)
+        latent = self.fc_encode(enc.reshape(batch_size, -1))
+
+        dec = self.fc_decode(latent).reshape(batch_size, 8, self.padded_len // 4)
+        reconstructed = self.decoder(dec)[:, :, :self.seq_len]
+        reconstructed = reconstructed.transpose(1, 2).reshape(batch_size, -1)
+
+        return reconstructed, latent
+
+
+class PCAAutoEncoder(nn.Module):
+    """
+    Detector linear (PCA) com a mesma interface dos autoencoders.
+
+    Os parâmetros são buffers ajustados em forma fechada (fit), sem
+    gradiente: média, componentes principais (latent_dim x input_dim) e a
+    escala dos scores. A reconstrução é a projeção no subespaço principal,
+    de modo que Q = SPE / input_dim; os scores latentes são divididos por
+    sqrt(autovalor / latent_dim), de modo que a média dos seus quadrados é
+    o T² de Hotelling.
+    """
+
+    def __init__(self, input_dim: int, latent_dim: int = 5):
+        super().__init__()
+
+        if latent_dim > input_dim:
+            raise ValueError(f"latent_dim={latent_dim} maior que input_dim={input_dim}")
+
+        self.register_buffer("mean", torch.zeros(input_dim))
+        self.register_buffer("components", torch.zeros(latent_dim, input_dim))
+        self.register_buffer("latent_scale", torch.ones(latent_dim))
+
+    def forward(self, x):
+        scores = (x - self.mean) @ self.components.T
+        reconstructed = scores @ self.components + self.mean
+        return reconstructed, scores * self.latent_scale
+
+
+class WindowDataset(Dataset):
+    """
+    Dataset de janelas deslizantes lido sem cópia dos dados.
+
+    Os itens são lotes inteiros: cada acesso recebe as posições de um lote
+    (via BatchSampler) e retorna um único tensor (batch, window_size * n_features),
+    copiando apenas as janelas do lote a partir da visão strided.
+    """
+
+    def __init__(self, windows: np.ndarray, index: np.ndarray):
+        """
+        Args:
+            windows: Visão (n_janelas, window_size, n_features) de create_windows
+                     ou MultiResolutionWindows
+            index: Índices das janelas que compõem o dataset
+        """
+        self.windows = windows
+        self.index = np.asarray(index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, positions) -> torch.Tensor:
+        batch = self.windows[self.index[positions]]
+        return torch.from_numpy(batch.reshape(len(batch), -1))
+
+
+class ScoringModule(nn.Module):
+    """
+    Grafo de inferência exportado para ONNX: normalização + autoencoder + Q/T².
+
+    Recebe janelas brutas (batch, window_size, n_features) e retorna Q e T²
+    por janela, com os parâmetros do StandardScaler embutidos como constantes.
+    Com agregação multirresolução, os blocos antigos de cada janela são
+    resumidos no grafo como em MultiResolutionWindows.
+    """
+
+    def __init__(
+        self,
+        model: nn.Module,
+        mean: np.ndarray,
+        scale: np.ndarray,
+        n_blocks: int = 0,
+        block_size: int = 0
+    ):
+        super().__init__()
+        self.model = model
+        self.n_blocks = n_blocks
+        self.block_size = block_size
+        self.register_buffer("mean", torch.as_tensor(mean, dtype=torch.float32))
+        self.register_buffer("scale", torch.as_tensor(scale, dtype=torch.float32))
+
+        # Pesos da inclinação (mínimos quadrados) dentro de cada bloco
+        t = torch.arange(max(block_size, 1), dtype=torch.float32) - (block_size - 1) / 2
+        self.register_buffer("slope_weights", t / torch.clamp(torch.sum(t ** 2), min=1e-12))
+
+    def forward(self, windows):
+        x = (windows - self.mean) / self.scale
+
+        if self.n_blocks:
+            n_old = self.n_blocks * self.block_size
+            old = x[:, :n_old].reshape(x.size(0), self.n_blocks, self.block_size, x.size(2))
+            slope = torch.sum(old * self.slope_weights.reshape(1, 1, -1, 1), dim=2)
+            stats = torch.stack([old.mean(dim=2), old.amin(dim=2), old.amax(dim=2), slope], dim=2)
+            x = torch.cat([stats.reshape(x.size(0), -1), x[:, n_old:].reshape(x.size(0), -1)], dim=1)
+        else:
+            x = x.reshape(windows.size(0), -1)
+
+        output, latent = self.model(x)
+        q = torch.mean((x - output) ** 2, dim=1)
+        t2 = torch.mean(latent ** 2, dim=1)
+        return q, t2
+
+
 class MovingWindowAutoEncoder:
     """
     Autoencoder com janela deslizante para detecção de anomalias.
@@ -107,17 +339,32 @@ class MovingWindowAutoEncoder:
         model_arch: str = "mlp",
         latent_dim: int = 5,
         hidden_layers: Optional[Tuple] = None,
-        device: Optional[str] = None
+        device: Optional[str] = None,
+        compile_mode: Optional[str] = None,
+        multiresolution: Optional[Dict[str, int]] = None
     ):
         """
         Inicializa o autoencoder.
 
         Args:
-            model_arch: "mlp" ou "cnn"
+            model_arch: "mlp", "cnn", "cnn_mc" (Conv1d multicanal, uma feature por canal)
+                        ou "pca" (detector linear ajustado em forma fechada)
             latent_dim: Dimensão do espaço latente
             hidden_layers: Tupla com dimensões das camadas ocultas (apenas para MLP)
             device: "cpu" ou "cuda"
+            compile_mode: Execução compilada: None (eager), "trace" (TorchScript
+                          congelado, apenas inferência) ou "compile" (torch.compile,
+                          treino e inferência). Em caso de falha, volta ao modo eager.
+            multiresolution: Agregação das janelas ({"block_size": ..., "recent_size": ...}):
+                             blocos antigos resumidos em média, mínimo, máximo e
+                             inclinação; as últimas recent_size leituras na
+                             resolução original. None = janelas brutas
         """
+        if compile_mode not in COMPILE_MODES:
+            raise ValueError(f"compile_mode inválido: {compile_mode}. Use None, 'trace' ou 'compile'.")
+        if multiresolution is not None and set(multiresolution) != {"block_size", "recent_size"}:
+            raise ValueError("multiresolution deve conter apenas block_size e recent_size")
+
         self.model_arch = model_arch
         self.latent_dim = latent_dim
         self.hidden_layers = hidden_layers or (32, 16, 8)
@@ -126,10 +373,33 @@ class MovingWindowAutoEncoder:
         self.model = None
         self.scaler = StandardScaler()
         self.input_dim = None
+        self.window_size = None
+        self.thresholds: Optional[Dict[str, float]] = None
+        self.training_history: Optional[Dict] = None
+        self.training_watermark: Optional[pd.Timestamp] = None
         self.is_fitted = False
 
+        self.multiresolution = (
+            {key: int(value) for key, value in multiresolution.items()} if multiresolution else None
+        )
+
+        self.compile_mode = compile_mode
+        self._compiled_model = None
+        self._compile_lock = threading.Lock()
+
+        # Inferência INT8 (quantize()); relatório da verificação de acurácia
+        self.quantization: Optional[Dict] = None
+        self._quantized_model = None
+
         logger.info(f"MovingWindowAutoEncoder inicializado: arch={model_arch}, device={self.device}")
 
+    @property
+    def feature_names(self) -> Optional[List[str]]:
+        """Esquema de features do modelo (colunas usadas no ajuste do scaler)."""
+        names = getattr(self.scaler, "feature_names_in_", None)
+        return [str(name) for name in names] if names is not None else None
+
+    @_with_threads
     def fit(
         self,
         data: pd.DataFrame,
@@ -137,7 +407,19 @@ class MovingWindowAutoEncoder:
         num_epochs: int = 50,
         learning_rate: float = 1e-3,
         batch_size: int = 32,
-        validation_split: float = 0.2
+        validation_split: float = 0.2,
+        groups: Optional[np.ndarray] = None,
+        progress_callback: Optional[Callable[[Dict], None]] = None,
+        threshold_percentile: float = 95.0,
+        shuffle: bool = True,
+        num_workers: int = 0,
+        prefetch_factor: int = 2,
+        early_stopping_patience: Optional[int] = 10,
+        min_delta: float = 1e-4,
+        lr_patience: Optional[int] = 5,
+        lr_factor: float = 0.5,
+        restore_best_weights: bool = True,
+        normalized: bool = False
     ) -> None:
         """
         Treina o autoencoder.
@@ -149,79 +431,222 @@ class MovingWindowAutoEncoder:
             learning_rate: Taxa de aprendizado
             batch_size: Tamanho do batch
             validation_split: Proporção de dados para validação
+                              (as últimas janelas de cada grupo)
+            groups: Identificador da série (ex.: equipment_id) de cada linha.
+                    As linhas de cada grupo devem estar contíguas e em ordem
+                    cronológica; as janelas não atravessam grupos. None = série única.
+            progress_callback: Função chamada ao final de cada época com
+                               epoch, num_epochs, train_loss, val_loss,
+                               samples_per_sec e elapsed_seconds
+            threshold_percentile: Percentil dos thresholds de Q e T² calibrados
+                                  nos dados de treino (usados na detecção online)
+            shuffle: Embaralhar as janelas de treino a cada época
+            num_workers: Processos que preparam os lotes em paralelo (0 = no processo principal)
+            prefetch_factor: Lotes preparados antecipadamente por worker
+            early_stopping_patience: Épocas sem melhora da loss de validação
+                                     (ou de treino, sem validação) antes de
+                                     interromper. None = sempre num_epochs
+            min_delta: Redução mínima da loss para contar como melhora
+            lr_patience: Épocas sem melhora antes de reduzir a taxa de
+                         aprendizado (ReduceLROnPlateau). None = taxa fixa
+            lr_factor: Fator de redução da taxa de aprendizado
+            restore_best_weights: Restaurar os pesos da época com menor loss
+            normalized: data já está normalizada com self.scaler, já ajustado
+                        (ex.: array do FeatureStore); o scaler não é reajustado
+            num_threads: Threads intra-op do PyTorch durante o treino (None = padrão do processo)
+
+        Se data tiver DatetimeIndex, o maior timestamp é guardado em
+        training_watermark (ponto de partida de fine_tune).
         """
         logger.info(f"Iniciando treinamento do autoencoder ({self.model_arch})...")
 
         # Normalizar dados
-        data_normalized = self.scaler.fit_transform(data)
+        if normalized:
+            if not hasattr(self.scaler, "mean_"):
+                raise ValueError("normalized=True requer o scaler já ajustado")
+            data_normalized = data
+        else:
+            data_normalized = self.scaler.fit_transform(data)
 
-        # Criar windows
+        # Criar windows (visão sem cópia dos dados normalizados)
         windows = self._create_windows(data_normalized, window_size)
 
-        if len(windows) == 0:
+        # Split treino/validação (índices das janelas dentro de cada grupo)
+        train_index, val_index = self._split_window_index(
+            groups, len(data_normalized), window_size, validation_split
+        )
+
+        if len(train_index) + len(val_index) == 0:
             logger.warning(f"Nenhuma janela criada com window_size={window_size}")
             return
 
-        # Split treino/validação
-        n_train = int(len(windows) * (1 - validation_split))
-        train_windows = windows[:n_train]
-        val_windows = windows[n_train:]
-
         # Inicializar modelo
-        self.input_dim = windows[0].shape[0]
+        self.input_dim = int(np.prod(windows.shape[1:]))
+        self.window_size = window_size
         self._init_model()
 
-        # Treinar
-        optimizer = torch.optim.Adam(self.model.parameters(), lr=learning_rate)
-        criterion = nn.MSELoss()
+        if self.model_arch == "pca":
+            self._fit_pca(windows, train_index, val_index, batch_size, progress_callback)
+        else:
+            self._train_epochs(
+                windows, train_index, val_index,
+                num_epochs=num_epochs,
+                learning_rate=learning_rate,
+                batch_size=batch_size,
+                progress_callback=progress_callback,
+                shuffle=shuffle,
+                num_workers=num_workers,
+                prefetch_factor=prefetch_factor,
+                early_stopping_patience=early_stopping_patience,
+                min_delta=min_delta,
+                lr_patience=lr_patience,
+                lr_factor=lr_factor,
+                restore_best_weights=restore_best_weights
+            )
 
-        train_losses = []
-        val_losses = []
+        # Calibrar thresholds com todas as janelas do histórico
+        self._calibrate_thresholds(windows, np.concatenate([train_index, val_index]), threshold_percentile)
 
-        for epoch in range(num_epochs):
-            # Treino
-            train_loss = 0.0
-            for i in range(0, len(train_windows), batch_size):
-                batch = train_windows[i:i+batch_size]
-                X = torch.FloatTensor(batch).to(self.device)
+        self.training_watermark = self._max_timestamp(data)
+        self.is_fitted = True
+        logger.info(
+            f"Treinamento concluído (thresholds calibrados: Q={self.thresholds['Q']:.6f}, "
+            f"T2={self.thresholds['T2']:.6f})"
+        )
 
-                optimizer.zero_grad()
-                output, _ = self.model(X)
-                loss = criterion(output, X)
-                loss.backward()
-                optimizer.step()
+    @_with_threads
+    def fine_tune(
+        self,
+        data: pd.DataFrame,
+        groups: Optional[np.ndarray] = None,
+        num_epochs: int = 5,
+        learning_rate: float = 1e-4,
+        batch_size: int = 32,
+        validation_split: float = 0.2,
+        replay_data: Optional[pd.DataFrame] = None,
+        replay_groups: Optional[np.ndarray] = None,
+        replay_fraction: float = 0.25,
+        progress_callback: Optional[Callable[[Dict], None]] = None,
+        shuffle: bool = True,
+        num_workers: int = 0,
+        prefetch_factor: int = 2,
+        early_stopping_patience: Optional[int] = 3,
+        min_delta: float = 1e-4,
+        restore_best_weights: bool = True,
+        random_state: Optional[int] = None
+    ) -> None:
+        """
+        Continua o treinamento de um modelo já treinado com dados novos (warm start).
 
-                train_loss += loss.item()
+        Os pesos, o scaler e o window_size do modelo são mantidos; apenas as
+        janelas de data (que devem terminar após training_watermark, incluindo
+        as window_size - 1 leituras anteriores de contexto) são usadas, mais
+        uma amostra de janelas antigas (replay) para limitar o esquecimento.
+        Os thresholds são recalibrados nas janelas usadas no ajuste.
 
-            train_loss /= max(1, len(train_windows) // batch_size)
-            train_losses.append(train_loss)
+        Args:
+            data: Leituras novas (mesmas features do treinamento)
+            groups: Identificador da série de cada linha de data (None = série única)
+            num_epochs: Número máximo de épocas
+            learning_rate: Taxa de aprendizado (menor que a do treino inicial)
+            batch_size: Tamanho do batch
+            validation_split: Proporção das janelas novas para validação
+                              (as últimas de cada grupo)
+            replay_data: Leituras antigas para replay (None = sem replay)
+            replay_groups: Identificador da série de cada linha de replay_data
+            replay_fraction: Janelas de replay por janela nova de treino
+            progress_callback: Função chamada ao final de cada época (como em fit)
+            shuffle: Embaralhar as janelas de treino a cada época
+            num_workers: Processos que preparam os lotes em paralelo (0 = no processo principal)
+            prefetch_factor: Lotes preparados antecipadamente por worker
+            early_stopping_patience: Épocas sem melhora antes de interromper (None = sempre num_epochs)
+            min_delta: Redução mínima da loss para contar como melhora
+            restore_best_weights: Restaurar os pesos da época com menor loss
+            random_state: Semente da amostragem de replay
+            num_threads: Threads intra-op do PyTorch durante o treino (None = padrão do processo)
+
+        Raises:
+            RuntimeError: Se o modelo não foi treinado.
+            ValueError: Se model_arch é "pca" (sem treino por gradiente; use fit()).
+        """
+        if not self.is_fitted:
+            raise RuntimeError("Modelo não foi treinado. Use fit() primeiro.")
+        if self.model_arch == "pca":
+            raise ValueError("fine_tune não se aplica a model_arch='pca'; retreine o modelo com fit()")
 
-            # Validação
-            if len(val_windows) > 0:
-                val_loss = 0.0
-                with torch.no_grad():
-                    for i in range(0, len(val_windows), batch_size):
-                        batch = val_windows[i:i+batch_size]
-                        X = torch.FloatTensor(batch).to(self.device)
-                        output, _ = self.model(X)
-                        loss = criterion(output, X)
-                        val_loss += loss.item()
+        window_size = self.window_size
+        logger.info(f"Iniciando fine-tuning do autoencoder ({self.model_arch}, {len(data)} leituras novas)...")
 
-                val_loss /= max(1, len(val_windows) // batch_size)
-                val_losses.append(val_loss)
+        use_replay = replay_data is not None and len(replay_data) > 0
 
-            if (epoch + 1) % 10 == 0:
-                logger.info(f"Época {epoch+1}/{num_epochs} - Train Loss: {train_loss:.6f}")
+        # Janelas novas e de replay na mesma visão; os índices de cada parte
+        # são calculados separadamente, de modo que nenhuma janela as atravessa
+        data_normalized = self.scaler.transform(pd.concat([data, replay_data]) if use_replay else data)
+        windows = self._create_windows(data_normalized, window_size)
 
-        self.is_fitted = True
-        logger.info("Treinamento concluído")
+        train_index, val_index = self._split_window_index(groups, len(data), window_size, validation_split)
+
+        if len(train_index) + len(val_index) == 0:
+            logger.warning(f"Nenhuma janela nova com window_size={window_size}; fine-tuning ignorado")
+            return
+
+        replay_index = np.array([], dtype=np.int64)
+        if use_replay:
+            replay_all, _ = self._split_window_index(replay_groups, len(replay_data), window_size, 0.0)
+            n_replay = min(len(replay_all), int(round(replay_fraction * len(train_index))))
+            rng = np.random.default_rng(random_state)
+            replay_index = np.sort(rng.choice(replay_all, size=n_replay, replace=False)) + len(data)
+
+        logger.info(
+            f"Fine-tuning: {len(train_index)} janelas novas de treino, "
+            f"{len(val_index)} de validação, {len(replay_index)} de replay"
+        )
+
+        self._train_epochs(
+            windows, np.concatenate([train_index, replay_index]), val_index,
+            num_epochs=num_epochs,
+            learning_rate=learning_rate,
+            batch_size=batch_size,
+            progress_callback=progress_callback,
+            shuffle=shuffle,
+            num_workers=num_workers,
+            prefetch_factor=prefetch_factor,
+            early_stopping_patience=early_stopping_patience,
+            min_delta=min_delta,
+            lr_patience=None,
+            lr_factor=0.5,
+            restore_best_weights=restore_best_weights
+        )
+        self.training_history['fine_tuned'] = True
+        self.training_history['replay_windows'] = int(len(replay_index))
+
+        self._calibrate_thresholds(
+            windows,
+            np.concatenate([train_index, val_index, replay_index]),
+            self.thresholds['percentile'] if self.thresholds else 95.0
+        )
+
+        watermark = self._max_timestamp(data)
+        if watermark is not None:
+            self.training_watermark = watermark
 
+        logger.info(
+            f"Fine-tuning concluído ({self.training_history['epochs_trained']} épocas; thresholds "
+            f"recalibrados: Q={self.thresholds['Q']:.6f}, T2={self.thresholds['T2']:.6f})"
+        )
+
+    @_with_threads
     def detect(
         self,
         data: pd.DataFrame,
         window_size: int = 720,
         threshold_percentile: float = 95.0,
-        rolling_window: int = 12
+        rolling_window: int = 12,
+        batch_size: int = 1024,
+        groups: Optional[np.ndarray] = None,
+        n_workers: int = 1,
+        normalized: bool = False,
+        timestamps: Optional[np.ndarray] = None
     ) -> pd.DataFrame:
         """
         Detecta anomalias nos dados.
@@ -231,9 +656,18 @@ class MovingWindowAutoEncoder:
             window_size: Tamanho da janela deslizante
             threshold_percentile: Percentil para threshold
             rolling_window: Janela para suavização
+            batch_size: Número de janelas avaliadas por forward pass
+            groups: Identificador da série (ex.: equipment_id) de cada linha.
+                    As linhas de cada grupo devem estar contíguas e em ordem
+                    cronológica; as janelas não atravessam grupos. None = série única.
+            n_workers: Número de threads que avaliam os grupos em paralelo
+            normalized: data já está normalizada com self.scaler (ex.: array do FeatureStore)
+            timestamps: Timestamp de cada linha (padrão: data.index)
+            num_threads: Threads intra-op do PyTorch durante a detecção (None = padrão do processo)
 
         Returns:
-            DataFrame com resultados de detecção
+            DataFrame com resultados de detecção (com coluna equipment_id
+            quando groups é informado)
         """
         if not self.is_fitted:
             raise RuntimeError("Modelo não foi treinado. Use fit() primeiro.")
@@ -241,66 +675,77 @@ class MovingWindowAutoEncoder:
         logger.info("Detectando anomalias...")
 
         # Normalizar dados
-        data_normalized = self.scaler.transform(data)
+        data_normalized = data if normalized else self.scaler.transform(data)
 
-        # Criar windows
+        # Criar windows (visão sem cópia dos dados normalizados)
         windows = self._create_windows(data_normalized, window_size)
 
-        if len(windows) == 0:
+        segments = [
+            (key, start, stop)
+            for key, start, stop in group_segments(groups, len(data_normalized))
+            if stop - start >= window_size
+        ]
+
+        if not segments:
             return pd.DataFrame()
 
-        # Calcular erros de reconstrução
-        reconstruction_errors = []
-        distances_latent = []
+        # Avaliar cada grupo apenas com as janelas inteiramente contidas nele
+        def score_segment(segment: Tuple) -> Tuple[np.ndarray, np.ndarray]:
+            _, start, stop = segment
+            return self._score_windows(windows[start:stop - window_size + 1], batch_size)
 
-        with torch.no_grad():
-            for window in windows:
-                X = torch.FloatTensor([window]).to(self.device)
-                output, latent = self.model(X)
+        self.model.eval()
+        if n_workers > 1 and len(segments) > 1:
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                scores = list(executor.map(score_segment, segments))
+        else:
+            scores = [score_segment(segment) for segment in segments]
 
-                # Q: erro de reconstrução
-                error = torch.mean((X - output) ** 2).item()
-                reconstruction_errors.append(error)
+        return build_detections(
+            pd.DatetimeIndex(timestamps) if timestamps is not None else data.index,
+            scores, segments, window_size, groups,
+            threshold_percentile=threshold_percentile,
+            rolling_window=rolling_window
+        )
 
-                # T²: distância no espaço latente
-                distance = torch.mean(latent ** 2).item()
-                distances_latent.append(distance)
+    def _create_windows(self, data_normalized: np.ndarray, window_size: int):
+        """Janelas de entrada do modelo: brutas (create_windows) ou multirresolução."""
+        if self.multiresolution is None:
+            return create_windows(data_normalized, window_size)
 
-        # Calcular thresholds
-        q_threshold = np.percentile(reconstruction_errors, threshold_percentile)
-        t2_threshold = np.percentile(distances_latent, threshold_percentile)
+        return MultiResolutionWindows.from_series(data_normalized, window_size, **self.multiresolution)
 
-        logger.info(f"Q threshold ({threshold_percentile}º percentil): {q_threshold:.6f}")
-        logger.info(f"T2 threshold ({threshold_percentile}º percentil): {t2_threshold:.6f}")
-        logger.info(f"Q - Min: {min(reconstruction_errors):.6f}, Max: {max(reconstruction_errors):.6f}, Mean: {np.mean(reconstruction_errors):.6f}")
-        logger.info(f"T2 - Min: {min(distances_latent):.6f}, Max: {max(distances_latent):.6f}, Mean: {np.mean(distances_latent):.6f}")
+    def _score_windows(
+        self,
+        windows: np.ndarray,
+        batch_size: int,
+        index: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula Q e T² de um conjunto de janelas em lotes.
 
-        # Suavizar
-        q_smooth = pd.Series(reconstruction_errors).rolling(window=rolling_window, min_periods=1).median().values
-        t2_smooth = pd.Series(distances_latent).rolling(window=rolling_window, min_periods=1).median().values
+        Se index for informado, apenas as janelas selecionadas são avaliadas.
+        Q e T² ficam no device e são transferidos para o host uma única vez ao final.
+        """
+        q_batches = []
+        t2_batches = []
+        n_windows = len(windows) if index is None else len(index)
 
-        # Detectar anomalias
-        anomalies = (q_smooth > q_threshold) | (t2_smooth > t2_threshold)
+        with torch.inference_mode():
+            for i in range(0, n_windows, batch_size):
+                batch = windows[i:i+batch_size] if index is None else windows[index[i:i+batch_size]]
+                X = self._to_tensor(batch)
+                output, latent = self._forward(X)
 
-        logger.info(f"Valores acima de Q threshold: {(q_smooth > q_threshold).sum()}")
-        logger.info(f"Valores acima de T2 threshold: {(t2_smooth > t2_threshold).sum()}")
+                # Q: erro de reconstrução
+                q_batches.append(torch.mean((X - output) ** 2, dim=1))
 
-        # Criar resultado
-        result = pd.DataFrame({
-            'timestamp': data.index[window_size-1:window_size-1+len(reconstruction_errors)],
-            'Q': q_smooth,
-            'T2': t2_smooth,
-            'Q_threshold': q_threshold,
-            'T2_threshold': t2_threshold,
-            'is_anomaly': anomalies,
-            'reconstruction_error': reconstruction_errors,
-            'latent_distance': distances_latent
-        })
+                # T²: distância no espaço latente
+                t2_batches.append(torch.mean(latent ** 2, dim=1))
 
-        n_anomalies = anomalies.sum()
-        logger.info(f"Detecção concluída: {n_anomalies} anomalias encontradas ({n_anomalies/len(anomalies)*100:.1f}%)")
+            scores = torch.stack([torch.cat(q_batches), torch.cat(t2_batches)]).cpu().numpy()
 
-        return result
+        return scores[0].astype(np.float64), scores[1].astype(np.float64)
 
     def _init_model(self):
         """Inicializa o modelo."""
@@ -315,18 +760,694 @@ class MovingWindowAutoEncoder:
                 input_dim=self.input_dim,
                 latent_dim=self.latent_dim
             )
+        elif self.model_arch == "cnn_mc":
+            self.model = MultiChannelCNNAutoEncoder(
+                input_dim=self.input_dim,
+                n_features=len(self.scaler.mean_),
+                latent_dim=self.latent_dim
+            )
+        elif self.model_arch == "pca":
+            self.model = PCAAutoEncoder(
+                input_dim=self.input_dim,
+                latent_dim=self.latent_dim
+            )
         else:
             raise ValueError(f"Arquitetura desconhecida: {self.model_arch}")
 
         self.model.to(self.device)
+        self._compiled_model = None
+        self._quantized_model = None
+        self.quantization = None
+
+    def _forward(self, X: torch.Tensor, training: bool = False) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Executa o modelo, usando a versão quantizada ou compilada quando configurada.
+
+        O modelo INT8 e o modo "trace" valem apenas para inferência (os pesos
+        ficam embutidos); o treino usa o modelo eager. Se a compilação falhar,
+        o modelo passa a ser executado em modo eager.
+        """
+        if not training and self._quantized_model is not None:
+            return self._quantized_model(X)
+
+        if self.compile_mode is None or (training and self.compile_mode == "trace"):
+            return self.model(X)
+
+        try:
+            return self._get_compiled_model(X)(X)
+        except Exception as e:
+            logger.warning(f"Execução compilada ({self.compile_mode}) indisponível, usando modo eager: {e}")
+            self.compile_mode = None
+            self._compiled_model = None
+            return self.model(X)
+
+    def _get_compiled_model(self, example: torch.Tensor):
+        """Compila o modelo na primeira chamada (thread-safe)."""
+        with self._compile_lock:
+            if self._compiled_model is None:
+                if self.compile_mode == "compile":
+                    self._compiled_model = torch.compile(self.model, dynamic=True)
+                else:
+                    self.model.eval()
+                    with torch.no_grad(), warnings.catch_warnings():
+                        # APIs TorchScript marcadas como obsoletas nas versões recentes
+                        warnings.simplefilter("ignore", FutureWarning)
+                        traced = torch.jit.trace(self.model, example[:1], check_trace=False)
+                        self._compiled_model = torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+
+                logger.info(f"Modelo compilado ({self.compile_mode})")
+
+            return self._compiled_model
+
+    def _train_epochs(
+        self,
+        windows: np.ndarray,
+        train_index: np.ndarray,
+        val_index: np.ndarray,
+        num_epochs: int,
+        learning_rate: float,
+        batch_size: int,
+        progress_callback: Optional[Callable[[Dict], None]],
+        shuffle: bool,
+        num_workers: int,
+        prefetch_factor: int,
+        early_stopping_patience: Optional[int],
+        min_delta: float,
+        lr_patience: Optional[int],
+        lr_factor: float,
+        restore_best_weights: bool
+    ) -> None:
+        """Laço de treino (usado por fit e fine_tune); preenche training_history."""
+        train_loader = self._make_loader(windows, train_index, batch_size, shuffle, num_workers, prefetch_factor)
+        val_loader = self._make_loader(windows, val_index, batch_size, False, num_workers, prefetch_factor)
+
+        # Treinar
+        optimizer = torch.optim.Adam(self.model.parameters(), lr=learning_rate)
+        criterion = nn.MSELoss()
+
+        scheduler = None
+        if lr_patience is not None:
+            scheduler = torch.optim.lr_scheduler.ReduceLROnPlateau(
+                optimizer, mode="min", factor=lr_factor, patience=lr_patience, threshold=min_delta,
+                threshold_mode="abs"
+            )
+
+        train_losses = []
+        val_losses = []
+
+        best_loss = np.inf
+        best_epoch = 0
+        best_state = None
+        epochs_without_improvement = 0
+
+        training_start = time.perf_counter()
+
+        for epoch in range(num_epochs):
+            epoch_start = time.perf_counter()
+
+            # Treino
+            self.model.train()
+            train_loss = 0.0
+            for X in train_loader:
+                X = X.to(self.device, non_blocking=True)
+
+                optimizer.zero_grad()
+                output, _ = self._forward(X, training=True)
+                loss = criterion(output, X)
+                loss.backward()
+                optimizer.step()
+
+                train_loss += loss.item()
+
+            train_loss /= max(1, len(train_loader))
+            train_losses.append(train_loss)
+
+            # Validação
+            if len(val_index) > 0:
+                self.model.eval()
+                val_loss = 0.0
+                with torch.no_grad():
+                    for X in val_loader:
+                        X = X.to(self.device, non_blocking=True)
+                        output, _ = self._forward(X, training=True)
+                        loss = criterion(output, X)
+                        val_loss += loss.item()
+
+                val_loss /= max(1, len(val_loader))
+                val_losses.append(val_loss)
+
+            # Loss monitorada: validação (ou treino, se não houver validação)
+            monitored_loss = val_losses[-1] if len(val_index) > 0 else train_loss
+
+            if monitored_loss < best_loss - min_delta:
+                best_loss = monitored_loss
+                best_epoch = epoch + 1
+                epochs_without_improvement = 0
+                if restore_best_weights:
+                    best_state = copy.deepcopy(self.model.state_dict())
+            else:
+                epochs_without_improvement += 1
+
+            if scheduler is not None:
+                scheduler.step(monitored_loss)
+
+            if progress_callback is not None:
+                epoch_seconds = time.perf_counter() - epoch_start
+                progress_callback({
+                    'epoch': epoch + 1,
+                    'num_epochs': num_epochs,
+                    'train_loss': train_loss,
+                    'val_loss': val_losses[-1] if len(val_index) > 0 else None,
+                    'samples_per_sec': len(train_index) / epoch_seconds if epoch_seconds > 0 else None,
+                    'elapsed_seconds': time.perf_counter() - training_start,
+                    'learning_rate': optimizer.param_groups[0]['lr'],
+                    'best_epoch': best_epoch
+                })
+
+            if (epoch + 1) % 10 == 0:
+                logger.info(f"Época {epoch+1}/{num_epochs} - Train Loss: {train_loss:.6f}")
+
+            if early_stopping_patience is not None and epochs_without_improvement >= early_stopping_patience:
+                logger.info(
+                    f"Early stopping na época {epoch+1}/{num_epochs} "
+                    f"(sem melhora há {epochs_without_improvement} épocas; melhor época: {best_epoch})"
+                )
+                break
+
+        if best_state is not None:
+            self.model.load_state_dict(best_state)
+            logger.info(f"Pesos da melhor época restaurados (época {best_epoch}, loss={best_loss:.6f})")
+
+        self.training_history = {
+            'train_loss': train_losses,
+            'val_loss': val_losses,
+            'epochs_trained': len(train_losses),
+            'best_epoch': best_epoch,
+            'best_loss': float(best_loss) if best_epoch else None,
+        }
+
+        # Pesos finais definidos: modelos de inferência derivados (compilado, INT8) são refeitos
+        if self.compile_mode == "trace":
+            self._compiled_model = None
+        self._quantized_model = None
+        self.quantization = None
+
+    def _fit_pca(
+        self,
+        windows: np.ndarray,
+        train_index: np.ndarray,
+        val_index: np.ndarray,
+        batch_size: int,
+        progress_callback: Optional[Callable[[Dict], None]]
+    ) -> None:
+        """
+        Ajusta o modelo PCA em forma fechada; preenche training_history.
+
+        A covariância das janelas de treino é acumulada lote a lote (uma
+        passada, memória O(input_dim²)), independentemente do número de
+        janelas. Os latent_dim componentes principais vêm da decomposição
+        exata da covariância até PCA_EXACT_MAX_DIM dimensões e, acima disso,
+        de SVD randomizada (aproximada nos componentes de variância próxima
+        à do ruído).
+        """
+        start = time.perf_counter()
+        index = train_index if len(train_index) > 0 else val_index
+        n_windows, input_dim = len(index), self.input_dim
+
+        # Lotes grandes: cada lote é um produto de matrizes (BLAS)
+        batch_size = max(batch_size, 2048)
+        total = np.zeros(input_dim)
+        gram = np.zeros((input_dim, input_dim))
+
+        for i in range(0, n_windows, batch_size):
+            batch = np.asarray(windows[index[i:i+batch_size]], dtype=np.float64).reshape(-1, input_dim)
+            total += batch.sum(axis=0)
+            gram += batch.T @ batch
+
+        mean = total / n_windows
+        covariance = (gram - n_windows * np.outer(mean, mean)) / max(n_windows - 1, 1)
+
+        if input_dim <= PCA_EXACT_MAX_DIM:
+            eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+            order = np.argsort(eigenvalues)[::-1][:self.latent_dim]
+            eigenvalues, components = eigenvalues[order], eigenvectors[:, order].T
+        else:
+            _, eigenvalues, components = randomized_svd(covariance, self.latent_dim, random_state=0)
+        eigenvalues = np.maximum(eigenvalues, 1e-12)
+
+        with torch.no_grad():
+            self.model.mean.copy_(torch.as_tensor(mean, dtype=torch.float32))
+            self.model.components.copy_(torch.as_tensor(components, dtype=torch.float32))
+            self.model.latent_scale.copy_(torch.as_tensor(np.sqrt(self.latent_dim / eigenvalues), dtype=torch.float32))
+        self.model.eval()
+
+        # Erro de reconstrução: variância residual no treino e Q médio na validação
+        total_variance = float(np.trace(covariance))
+        train_loss = (total_variance - float(eigenvalues.sum())) / input_dim
+        val_loss = None
+        if len(val_index) > 0 and len(train_index) > 0:
+            q_val, _ = self._score_windows(windows, batch_size, index=val_index)
+            val_loss = float(q_val.mean())
+
+        elapsed = time.perf_counter() - start
+
+        self.training_history = {
+            'train_loss': [train_loss],
+            'val_loss': [val_loss] if val_loss is not None else [],
+            'epochs_trained': 1,
+            'best_epoch': 1,
+            'best_loss': val_loss if val_loss is not None else train_loss,
+            'explained_variance_ratio': float(eigenvalues.sum() / total_variance) if total_variance > 0 else None,
+        }
+
+        if progress_callback is not None:
+            progress_callback({
+                'epoch': 1,
+                'num_epochs': 1,
+                'train_loss': train_loss,
+                'val_loss': val_loss,
+                'samples_per_sec': n_windows / elapsed if elapsed > 0 else None,
+                'elapsed_seconds': elapsed,
+                'learning_rate': None,
+                'best_epoch': 1
+            })
+
+        logger.info(
+            f"PCA ajustado em {elapsed:.2f}s ({n_windows} janelas, {self.latent_dim} componentes, "
+            f"variância explicada {self.training_history['explained_variance_ratio']:.1%})"
+        )
+
+        if self.compile_mode == "trace":
+            self._compiled_model = None
+
+    @staticmethod
+    def _max_timestamp(data: pd.DataFrame) -> Optional[pd.Timestamp]:
+        """Maior timestamp do índice (None se o índice não for de datas)."""
+        index = getattr(data, "index", None)
+        if isinstance(index, pd.DatetimeIndex) and len(index) > 0:
+            return index.max()
+        return None
+
+    def _calibrate_thresholds(self, windows: np.ndarray, index: np.ndarray, threshold_percentile: float) -> None:
+        """Calibra os thresholds de Q e T² (percentil) nas janelas indicadas."""
+        self.model.eval()
+        q_train, t2_train = self._score_windows(windows, batch_size=1024, index=index)
+        self.thresholds = {
+            'percentile': threshold_percentile,
+            'Q': float(np.percentile(q_train, threshold_percentile)),
+            'T2': float(np.percentile(t2_train, threshold_percentile)),
+        }
+
+    def _split_window_index(
+        self,
+        groups: Optional[np.ndarray],
+        n_rows: int,
+        window_size: int,
+        validation_split: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Índices das janelas de treino e de validação (as últimas de cada grupo)."""
+        train_index = []
+        val_index = []
+
+        for _, start, stop in group_segments(groups, n_rows):
+            index = np.arange(start, stop - window_size + 1)
+            n_train = int(len(index) * (1 - validation_split))
+            train_index.append(index[:n_train])
+            val_index.append(index[n_train:])
+
+        if not train_index:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+
+        return np.concatenate(train_index), np.concatenate(val_index)
+
+    def _make_loader(
+        self,
+        windows: np.ndarray,
+        index: np.ndarray,
+        batch_size: int,
+        shuffle: bool,
+        num_workers: int,
+        prefetch_factor: int
+    ) -> DataLoader:
+        """Cria o DataLoader de lotes de janelas (um tensor por lote)."""
+        dataset = WindowDataset(windows, index)
+        sampler = RandomSampler(dataset) if shuffle else SequentialSampler(dataset)
+
+        return DataLoader(
+            dataset,
+            sampler=BatchSampler(sampler, batch_size=batch_size, drop_last=False),
+            batch_size=None,
+            num_workers=num_workers,
+            prefetch_factor=prefetch_factor if num_workers > 0 else None,
+            persistent_workers=num_workers > 0,
+            pin_memory=self.device.startswith("cuda")
+        )
+
+    def _to_tensor(self, windows: np.ndarray) -> torch.Tensor:
+        """Achata um lote de janelas (n, window_size, n_features ou n, input_dim) e envia ao device."""
+        batch = np.array(windows, dtype=np.float32).reshape(len(windows), -1)
+        return torch.from_numpy(batch).to(self.device)
+
+    def quantize(
+        self,
+        data: pd.DataFrame,
+        groups: Optional[np.ndarray] = None,
+        validation_split: float = 0.2,
+        max_relative_error: float = 0.05,
+        batch_size: int = 1024
+    ) -> Dict:
+        """
+        Ativa a inferência INT8 (quantização dinâmica das camadas Linear do MLP).
+
+        Q e T² do modelo quantizado são comparados aos do modelo float nas
+        janelas de validação (as últimas de cada grupo, como no fit). A
+        quantização só é mantida se o percentil 95 do erro de Q e de T²,
+        relativo à média de cada score em float, ficar dentro de
+        max_relative_error; caso contrário a inferência continua em float. O relatório é persistido por serialize(), e
+        deserialize() reaplica a quantização aceita.
+
+        Args:
+            data: DataFrame com dados para validação (mesmas features do treino)
+            groups: Identificador da série de cada linha (None = série única)
+            validation_split: Fração final de janelas de cada grupo usada na comparação
+            max_relative_error: Erro relativo máximo (percentil 95) aceito em Q e T²
+            batch_size: Número de janelas avaliadas por forward pass
+
+        Returns:
+            Relatório com erros relativos de Q e T², concordância das
+            detecções com os thresholds calibrados, tempos e "accepted"
+
+        Raises:
+            RuntimeError: Se o modelo não foi treinado.
+            ValueError: Se a arquitetura não é MLP, o device não é CPU ou
+                        não há janelas para validação.
+        """
+        if not self.is_fitted:
+            raise RuntimeError("Modelo não foi treinado. Use fit() primeiro.")
+        if self.model_arch != "mlp":
+            raise ValueError(f"Quantização INT8 disponível apenas para model_arch='mlp' (recebido: {self.model_arch})")
+        if not self.device.startswith("cpu"):
+            raise ValueError("Quantização INT8 disponível apenas para inferência em CPU")
+
+        data_normalized = self.scaler.transform(data)
+        windows = self._create_windows(data_normalized, self.window_size)
+        _, val_index = self._split_window_index(groups, len(data_normalized), self.window_size, validation_split)
+
+        if len(val_index) == 0:
+            val_index = np.arange(len(windows))
+        if len(val_index) == 0:
+            raise ValueError(f"Dados insuficientes para validar a quantização (window_size={self.window_size})")
+
+        # Referência em float
+        self._quantized_model = None
+        self.model.eval()
+        start = time.perf_counter()
+        q_float, t2_float = self._score_windows(windows, batch_size, index=val_index)
+        float_seconds = time.perf_counter() - start
+
+        self._quantized_model = self._build_quantized_model()
+        start = time.perf_counter()
+        q_int8, t2_int8 = self._score_windows(windows, batch_size, index=val_index)
+        int8_seconds = time.perf_counter() - start
+
+        # Erro relativo à média do score em float (Q próximo de zero não domina a métrica)
+        q_error = np.abs(q_int8 - q_float) / max(float(np.mean(q_float)), 1e-12)
+        t2_error = np.abs(t2_int8 - t2_float) / max(float(np.mean(t2_float)), 1e-12)
+
+        report = {
+            'dtype': 'qint8',
+            'n_windows': int(len(val_index)),
+            'q_relative_error_p95': float(np.percentile(q_error, 95)),
+            'q_relative_error_max': float(q_error.max()),
+            't2_relative_error_p95': float(np.percentile(t2_error, 95)),
+            't2_relative_error_max': float(t2_error.max()),
+            'float_seconds': float_seconds,
+            'int8_seconds': int8_seconds,
+            'max_relative_error': max_relative_error,
+        }
+
+        if self.thresholds is not None:
+            flags_float = (q_float > self.thresholds['Q']) | (t2_float > self.thresholds['T2'])
+            flags_int8 = (q_int8 > self.thresholds['Q']) | (t2_int8 > self.thresholds['T2'])
+            report['flag_agreement'] = float(np.mean(flags_float == flags_int8))
+
+        report['accepted'] = (
+            report['q_relative_error_p95'] <= max_relative_error
+            and report['t2_relative_error_p95'] <= max_relative_error
+        )
+
+        if report['accepted']:
+            logger.info(
+                f"Inferência INT8 ativada: erro relativo p95 Q={report['q_relative_error_p95']:.4f}, "
+                f"T2={report['t2_relative_error_p95']:.4f}; "
+                f"tempo {float_seconds:.3f}s (float) -> {int8_seconds:.3f}s (int8)"
+            )
+        else:
+            self._quantized_model = None
+            logger.warning(
+                f"Quantização rejeitada (erro relativo p95 Q={report['q_relative_error_p95']:.4f}, "
+                f"T2={report['t2_relative_error_p95']:.4f} > {max_relative_error}); inferência em float"
+            )
+
+        self.quantization = report
+        return report
+
+    def _build_quantized_model(self) -> nn.Module:
+        """Cópia do modelo com as camadas Linear quantizadas dinamicamente (INT8)."""
+        with warnings.catch_warnings():
+            # API de quantização do torch.ao marcada como obsoleta nas versões recentes
+            warnings.simplefilter("ignore")
+            return torch.ao.quantization.quantize_dynamic(
+                copy.deepcopy(self.model).cpu().eval(), {nn.Linear}, dtype=torch.qint8
+            )
+
+    def serialize(self) -> Tuple[bytes, bytes]:
+        """
+        Serializa o modelo treinado para persistência.
+
+        Returns:
+            Tupla (model_data, scaler_data): pesos e configuração da rede e
+            parâmetros do StandardScaler ajustado (ambos em torch.save, apenas
+            tensores e tipos básicos; sem pickle de objetos arbitrários).
+
+        Raises:
+            RuntimeError: Se o modelo não foi treinado.
+        """
+        if not self.is_fitted:
+            raise RuntimeError("Modelo não foi treinado. Use fit() primeiro.")
+
+        model_buffer = io.BytesIO()
+        torch.save(
+            {
+                'model_arch': self.model_arch,
+                'latent_dim': self.latent_dim,
+                'hidden_layers': tuple(self.hidden_layers),
+                'input_dim': self.input_dim,
+                'window_size': self.window_size,
+                'multiresolution': self.multiresolution,
+                'thresholds': self.thresholds,
+                'quantization': self.quantization,
+                'training_watermark': (
+                    self.training_watermark.isoformat() if self.training_watermark is not None else None
+                ),
+                'state_dict': {k: v.cpu() for k, v in self.model.state_dict().items()},
+            },
+            model_buffer
+        )
+
+        return model_buffer.getvalue(), self._serialize_scaler(self.scaler)
+
+    @staticmethod
+    def _serialize_scaler(scaler: StandardScaler) -> bytes:
+        """Serializa os parâmetros ajustados do StandardScaler como tensores."""
+        feature_names = getattr(scaler, "feature_names_in_", None)
+
+        scaler_buffer = io.BytesIO()
+        torch.save(
+            {
+                'mean': torch.as_tensor(np.asarray(scaler.mean_, dtype=np.float64)),
+                'scale': torch.as_tensor(np.asarray(scaler.scale_, dtype=np.float64)),
+                'var': torch.as_tensor(np.asarray(scaler.var_, dtype=np.float64)),
+                'n_samples_seen': int(np.max(scaler.n_samples_seen_)),
+                'feature_names': [str(name) for name in feature_names] if feature_names is not None else None,
+            },
+            scaler_buffer
+        )
+
+        return scaler_buffer.getvalue()
+
+    @staticmethod
+    def _deserialize_scaler(scaler_data: bytes) -> StandardScaler:
+        """
+        Reconstrói o StandardScaler a partir dos parâmetros de _serialize_scaler().
+
+        Raises:
+            ValueError: Se os dados não estiverem no formato esperado (ex.:
+                        scaler gravado com pickle por versões anteriores)
+        """
+        try:
+            state = torch.load(io.BytesIO(scaler_data), map_location="cpu", weights_only=True)
+            mean = state['mean'].numpy()
+            scale = state['scale'].numpy()
+            var = state['var'].numpy()
+        except Exception as e:
+            raise ValueError(
+                f"Scaler em formato não suportado (modelos antigos gravavam pickle; treine o modelo novamente): {e}"
+            )
+
+        scaler = StandardScaler()
+        scaler.mean_ = mean
+        scaler.scale_ = scale
+        scaler.var_ = var
+        scaler.n_features_in_ = len(mean)
+        scaler.n_samples_seen_ = state.get('n_samples_seen', 0)
+        if state.get('feature_names') is not None:
+            scaler.feature_names_in_ = np.asarray(state['feature_names'], dtype=object)
+
+        return scaler
+
+    @classmethod
+    def deserialize(
+        cls,
+        model_data: bytes,
+        scaler_data: bytes,
+        device: Optional[str] = None,
+        compile_mode: Optional[str] = None
+    ) -> "MovingWindowAutoEncoder":
+        """
+        Reconstrói um modelo treinado a partir dos dados de serialize().
+
+        Args:
+            model_data: Pesos e configuração da rede
+            scaler_data: Parâmetros do StandardScaler serializados
+            device: "cpu" ou "cuda"
+            compile_mode: Execução compilada (ver __init__)
+
+        Returns:
+            MovingWindowAutoEncoder pronto para detecção
+
+        Raises:
+            ValueError: Se o scaler não estiver no formato de serialize()
+        """
+        checkpoint = torch.load(io.BytesIO(model_data), map_location="cpu", weights_only=True)
+
+        autoencoder = cls(
+            model_arch=checkpoint['model_arch'],
+            latent_dim=checkpoint['latent_dim'],
+            hidden_layers=tuple(checkpoint['hidden_layers']),
+            device=device,
+            compile_mode=compile_mode,
+            multiresolution=checkpoint.get('multiresolution')
+        )
+        autoencoder.input_dim = checkpoint['input_dim']
+        autoencoder.window_size = checkpoint['window_size']
+        autoencoder.thresholds = checkpoint.get('thresholds')
+        if checkpoint.get('training_watermark'):
+            autoencoder.training_watermark = pd.Timestamp(checkpoint['training_watermark'])
+
+        # Scaler antes do modelo: cnn_mc usa o número de features
+        autoencoder.scaler = cls._deserialize_scaler(scaler_data)
+        autoencoder._init_model()
+        autoencoder.model.load_state_dict(checkpoint['state_dict'])
+        autoencoder.model.eval()
+
+        autoencoder.is_fitted = True
+
+        # Reaplicar a quantização validada no treinamento
+        quantization = checkpoint.get('quantization')
+        if quantization and quantization.get('accepted'):
+            if autoencoder.device.startswith("cpu"):
+                autoencoder.quantization = quantization
+                autoencoder._quantized_model = autoencoder._build_quantized_model()
+            else:
+                logger.info("Modelo quantizado carregado em GPU: inferência em float")
+
+        return autoencoder
+
+    def export_onnx(self, path: Union[str, Path], opset_version: int = 17) -> Path:
+        """
+        Exporta o modelo para ONNX, para detecção sem o PyTorch (OnnxAnomalyDetector).
+
+        O grafo recebe janelas brutas (batch, window_size, n_features) em float32,
+        aplica a normalização do scaler (e a agregação multirresolução, se
+        configurada) e retorna Q e T² por janela. Arquitetura, window_size,
+        nomes das features e thresholds calibrados vão nos metadados do arquivo.
+
+        Args:
+            path: Arquivo .onnx de destino
+            opset_version: Versão do opset ONNX
+
+        Returns:
+            Caminho do arquivo gerado
+
+        Raises:
+            RuntimeError: Se o modelo não foi treinado.
+            ImportError: Se o pacote onnx não estiver instalado.
+        """
+        if not self.is_fitted:
+            raise RuntimeError("Modelo não foi treinado. Use fit() primeiro.")
+
+        try:
+            import onnx
+        except ImportError as e:
+            raise ImportError("Exportação ONNX requer o pacote onnx (pip install onnx)") from e
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        n_features = len(self.scaler.mean_)
+        feature_names = getattr(self.scaler, "feature_names_in_", None)
+
+        n_blocks, block_size = 0, 0
+        if self.multiresolution is not None:
+            block_size = self.multiresolution['block_size']
+            n_blocks, _ = MultiResolutionWindows.layout(self.window_size, **self.multiresolution)
+
+        module = ScoringModule(
+            copy.deepcopy(self.model).cpu().eval(), self.scaler.mean_, self.scaler.scale_,
+            n_blocks=n_blocks, block_size=block_size
+        )
+        example = torch.zeros(2, self.window_size, n_features, dtype=torch.float32)
+
+        buffer = io.BytesIO()
+        # Exportador por TorchScript: a partir do torch 2.5 o parâmetro dynamo
+        # existe (e passa a ser o padrão em versões recentes); antes não é aceito
+        export_kwargs = {}
+        if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+            export_kwargs["dynamo"] = False
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", (FutureWarning, DeprecationWarning))
+            torch.onnx.export(
+                module,
+                (example,),
+                buffer,
+                input_names=["windows"],
+                output_names=["Q", "T2"],
+                dynamic_axes={"windows": {0: "batch"}, "Q": {0: "batch"}, "T2": {0: "batch"}},
+                opset_version=opset_version,
+                **export_kwargs
+            )
+
+        onnx_model = onnx.load_from_string(buffer.getvalue())
+        metadata = {
+            "model_arch": self.model_arch,
+            "latent_dim": self.latent_dim,
+            "window_size": self.window_size,
+            "multiresolution": self.multiresolution,
+            "n_features": n_features,
+            "feature_names": [str(name) for name in feature_names] if feature_names is not None else None,
+            "thresholds": self.thresholds,
+        }
+        for key, value in metadata.items():
+            entry = onnx_model.metadata_props.add()
+            entry.key = key
+            entry.value = json.dumps(value)
 
-    def _create_windows(self, data: np.ndarray, window_size: int) -> np.ndarray:
-        """Cria janelas deslizantes dos dados."""
-        windows = []
-        for i in range(len(data) - window_size + 1):
-            windows.append(data[i:i+window_size].flatten())
+        onnx.save(onnx_model, str(path))
+        logger.info(f"Modelo exportado para ONNX: {path} ({path.stat().st_size / 1024:.1f} KB)")
 
-        return np.array(windows)
+        return path
 
     def get_anomaly_summary(self, detections: pd.DataFrame) -> Dict:
         """Retorna resumo das anomalias detectadas."""
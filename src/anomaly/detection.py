@@ -0,0 +1,310 @@
+"""
+Janelas deslizantes e pós-processamento de scores, sem dependência do PyTorch.
+
+Compartilhado entre MovingWindowAutoEncoder e os motores de inferência
+leves (ONNX), de modo que todos produzem o mesmo DataFrame de detecções.
+"""
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Horas sem leituras após as quais um equipamento deixa de segurar o watermark
+DEFAULT_IDLE_TIMEOUT_HOURS = 24.0
+
+
+def create_windows(data: np.ndarray, window_size: int) -> np.ndarray:
+    """
+    Cria janelas deslizantes dos dados sem copiá-los.
+
+    Retorna uma visão (n_janelas, window_size, n_features) sobre os dados
+    em float32, de modo que a memória é O(N × features). As janelas só são
+    copiadas lote a lote, no momento da avaliação.
+    """
+    data = np.ascontiguousarray(data, dtype=np.float32)
+
+    if len(data) < window_size:
+        return np.empty((0, window_size, data.shape[1]), dtype=np.float32)
+
+    return sliding_window_view(data, window_size, axis=0).transpose(0, 2, 1)
+
+
+def block_statistics(blocks: np.ndarray) -> np.ndarray:
+    """
+    Resume blocos de leituras consecutivas.
+
+    Recebe (..., block_size, n_features) e retorna (..., 4, n_features) com
+    média, mínimo, máximo e inclinação (mínimos quadrados, por leitura) de
+    cada feature no bloco.
+    """
+    block_size = blocks.shape[-2]
+    t = np.arange(block_size, dtype=np.float32) - (block_size - 1) / 2
+    weights = (t / np.sum(t ** 2)).astype(np.float32)
+
+    return np.stack([
+        blocks.mean(axis=-2),
+        blocks.min(axis=-2),
+        blocks.max(axis=-2),
+        np.einsum("...tf,t->...f", blocks, weights),
+    ], axis=-2).astype(np.float32, copy=False)
+
+
+class MultiResolutionWindows:
+    """
+    Janelas deslizantes multirresolução, já achatadas.
+
+    A parte antiga de cada janela é dividida em n_blocks blocos de
+    block_size leituras, cada um resumido por block_statistics(); as
+    leituras restantes (as mais recentes, pelo menos recent_size) ficam na
+    resolução original. A entrada do modelo passa de window_size × n_features
+    para (n_blocks × 4 + recent) × n_features valores por janela.
+
+    As estatísticas são calculadas uma única vez, com janelas móveis sobre a
+    série inteira (um bloco por leitura inicial), e as janelas são visões
+    sem cópia sobre elas. O objeto se comporta como o array de
+    create_windows: len(), shape, fatias (visões) e indexação por array de
+    posições, que copia apenas o lote (n, input_dim).
+    """
+
+    def __init__(self, blocks: np.ndarray, recent: np.ndarray):
+        """
+        Args:
+            blocks: Estatísticas (n_janelas, n_blocks, 4, n_features)
+            recent: Leituras recentes (n_janelas, recent, n_features)
+        """
+        self.blocks = blocks
+        self.recent = recent
+
+    @staticmethod
+    def layout(window_size: int, block_size: int, recent_size: int) -> Tuple[int, int]:
+        """
+        Divisão da janela: (n_blocks, leituras mantidas na resolução original).
+
+        Raises:
+            ValueError: Se a janela não comporta ao menos um bloco além das leituras recentes.
+        """
+        if block_size < 2 or recent_size < 1:
+            raise ValueError(f"block_size deve ser >= 2 e recent_size >= 1 (recebidos: {block_size}, {recent_size})")
+
+        n_blocks = (window_size - recent_size) // block_size
+        if n_blocks < 1:
+            raise ValueError(
+                f"window_size={window_size} não comporta blocos de {block_size} "
+                f"além das {recent_size} leituras recentes"
+            )
+
+        return n_blocks, window_size - n_blocks * block_size
+
+    @classmethod
+    def from_series(
+        cls,
+        data: np.ndarray,
+        window_size: int,
+        block_size: int,
+        recent_size: int
+    ) -> "MultiResolutionWindows":
+        """Cria as janelas de uma série (n_linhas, n_features), como create_windows."""
+        data = np.ascontiguousarray(data, dtype=np.float32)
+        n_blocks, recent = cls.layout(window_size, block_size, recent_size)
+        n_windows = max(0, len(data) - window_size + 1)
+        n_features = data.shape[1]
+
+        if n_windows == 0:
+            return cls(
+                np.empty((0, n_blocks, 4, n_features), dtype=np.float32),
+                np.empty((0, recent, n_features), dtype=np.float32)
+            )
+
+        # Estatísticas móveis: a linha q resume as leituras q .. q + block_size - 1
+        stats = block_statistics(sliding_window_view(data, block_size, axis=0).transpose(0, 2, 1))
+
+        # Blocos da janela i começam em i, i + block_size, ..., i + (n_blocks - 1) * block_size
+        span = (n_blocks - 1) * block_size + 1
+        blocks = sliding_window_view(stats, span, axis=0)[:n_windows, ..., ::block_size].transpose(0, 3, 1, 2)
+
+        recent_view = sliding_window_view(data[n_blocks * block_size:], recent, axis=0).transpose(0, 2, 1)
+
+        return cls(blocks, recent_view[:n_windows])
+
+    @classmethod
+    def from_windows(cls, windows: np.ndarray, block_size: int, recent_size: int) -> "MultiResolutionWindows":
+        """Agrega janelas já montadas (n, window_size, n_features), como na detecção online."""
+        windows = np.asarray(windows, dtype=np.float32)
+        n_windows, window_size, n_features = windows.shape
+        n_blocks, _ = cls.layout(window_size, block_size, recent_size)
+
+        old = windows[:, :n_blocks * block_size].reshape(n_windows, n_blocks, block_size, n_features)
+
+        return cls(block_statistics(old), windows[:, n_blocks * block_size:])
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """(n_janelas, valores por janela achatada)."""
+        return len(self), int(np.prod(self.blocks.shape[1:]) + np.prod(self.recent.shape[1:]))
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return MultiResolutionWindows(self.blocks[key], self.recent[key])
+
+        blocks = self.blocks[key]
+        recent = self.recent[key]
+
+        if blocks.ndim == 3:
+            return np.concatenate([blocks.ravel(), recent.ravel()])
+
+        return np.concatenate([blocks.reshape(len(blocks), -1), recent.reshape(len(recent), -1)], axis=1)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        windows = self[np.arange(len(self))]
+        return windows if dtype is None else windows.astype(dtype, copy=False)
+
+
+def group_segments(groups: Optional[np.ndarray], n_rows: int) -> List[Tuple]:
+    """
+    Retorna os trechos contíguos (grupo, início, fim) de cada série.
+
+    Raises:
+        ValueError: Se as linhas de algum grupo não estiverem contíguas.
+    """
+    if groups is None:
+        return [(None, 0, n_rows)]
+
+    groups = np.asarray(groups)
+    if len(groups) != n_rows:
+        raise ValueError("groups deve ter um valor por linha dos dados")
+    if n_rows == 0:
+        return []
+
+    boundaries = np.flatnonzero(groups[1:] != groups[:-1]) + 1
+    starts = np.concatenate(([0], boundaries))
+    stops = np.concatenate((boundaries, [n_rows]))
+
+    if len(starts) != len(pd.unique(groups)):
+        raise ValueError(
+            "As linhas de cada grupo devem estar contíguas "
+            "(ordene os dados por grupo e timestamp)"
+        )
+
+    return [(groups[start], int(start), int(stop)) for start, stop in zip(starts, stops)]
+
+
+def build_detections(
+    index: pd.Index,
+    scores: Sequence[Tuple[np.ndarray, np.ndarray]],
+    segments: Sequence[Tuple],
+    window_size: int,
+    groups: Optional[np.ndarray] = None,
+    threshold_percentile: float = 95.0,
+    rolling_window: int = 12
+) -> pd.DataFrame:
+    """
+    Converte os scores de cada trecho no DataFrame de detecções.
+
+    Args:
+        index: Índice (timestamps) das linhas dos dados
+        scores: (Q, T²) por janela de cada trecho, na ordem de segments
+        segments: Trechos (grupo, início, fim) avaliados
+        window_size: Tamanho da janela deslizante
+        groups: Identificador da série de cada linha (None = série única)
+        threshold_percentile: Percentil para threshold
+        rolling_window: Janela para suavização (dentro de cada trecho)
+
+    Returns:
+        DataFrame com resultados de detecção (com coluna equipment_id
+        quando groups é informado)
+    """
+    reconstruction_errors = np.concatenate([q for q, _ in scores])
+    distances_latent = np.concatenate([t2 for _, t2 in scores])
+
+    # Calcular thresholds
+    q_threshold = np.percentile(reconstruction_errors, threshold_percentile)
+    t2_threshold = np.percentile(distances_latent, threshold_percentile)
+
+    logger.info(f"Q threshold ({threshold_percentile}º percentil): {q_threshold:.6f}")
+    logger.info(f"T2 threshold ({threshold_percentile}º percentil): {t2_threshold:.6f}")
+    logger.info(f"Q - Min: {reconstruction_errors.min():.6f}, Max: {reconstruction_errors.max():.6f}, Mean: {reconstruction_errors.mean():.6f}")
+    logger.info(f"T2 - Min: {distances_latent.min():.6f}, Max: {distances_latent.max():.6f}, Mean: {distances_latent.mean():.6f}")
+
+    # Suavizar (dentro de cada grupo)
+    q_smooth = np.concatenate([
+        pd.Series(q).rolling(window=rolling_window, min_periods=1).median().values
+        for q, _ in scores
+    ])
+    t2_smooth = np.concatenate([
+        pd.Series(t2).rolling(window=rolling_window, min_periods=1).median().values
+        for _, t2 in scores
+    ])
+
+    # Detectar anomalias
+    anomalies = (q_smooth > q_threshold) | (t2_smooth > t2_threshold)
+
+    logger.info(f"Valores acima de Q threshold: {(q_smooth > q_threshold).sum()}")
+    logger.info(f"Valores acima de T2 threshold: {(t2_smooth > t2_threshold).sum()}")
+
+    # Linha em que termina cada janela
+    positions = np.concatenate([
+        np.arange(start + window_size - 1, stop) for _, start, stop in segments
+    ])
+
+    # Criar resultado
+    result = pd.DataFrame({
+        'timestamp': index[positions],
+        'Q': q_smooth,
+        'T2': t2_smooth,
+        'Q_threshold': q_threshold,
+        'T2_threshold': t2_threshold,
+        'is_anomaly': anomalies,
+        'reconstruction_error': reconstruction_errors,
+        'latent_distance': distances_latent
+    })
+
+    if groups is not None:
+        result.insert(0, 'equipment_id', np.asarray(groups)[positions])
+
+    n_anomalies = anomalies.sum()
+    logger.info(f"Detecção concluída: {n_anomalies} anomalias encontradas ({n_anomalies/len(anomalies)*100:.1f}%)")
+
+    return result
+
+
+def active_watermark(
+    last_timestamps: Iterable[pd.Timestamp],
+    idle_timeout_hours: Optional[float] = DEFAULT_IDLE_TIMEOUT_HOURS
+) -> Optional[pd.Timestamp]:
+    """
+    Watermark da leitura incremental: menor último timestamp entre os equipamentos ativos.
+
+    Equipamentos cuja última leitura está mais de idle_timeout_hours atrás
+    da mais recente (desativados ou parados) não seguram o watermark; do
+    contrário, cada consulta releria as leituras de toda a frota desde que o
+    equipamento parou. Leituras atrasadas desses equipamentos com timestamp
+    anterior ao watermark não são buscadas; as novas voltam a ser lidas.
+
+    Args:
+        last_timestamps: Último timestamp processado de cada equipamento
+        idle_timeout_hours: Tolerância de inatividade (None = todos os equipamentos contam)
+
+    Returns:
+        Watermark, ou None se não houver equipamentos
+    """
+    timestamps = [pd.Timestamp(timestamp) for timestamp in last_timestamps if timestamp is not None]
+    if not timestamps:
+        return None
+
+    if idle_timeout_hours is not None:
+        cutoff = max(timestamps) - pd.Timedelta(hours=idle_timeout_hours)
+        idle = sum(timestamp < cutoff for timestamp in timestamps)
+        if idle:
+            logger.debug(f"{idle} equipamentos inativos há mais de {idle_timeout_hours}h fora do watermark")
+            timestamps = [timestamp for timestamp in timestamps if timestamp >= cutoff]
+
+    return min(timestamps)
@@ -0,0 +1,281 @@
+"""
+Fazenda de treinamento: um autoencoder por equipamento ou por localização.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..database.sql_server import SQLServerConnector
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Colunas que definem a unidade de cada modelo
+PARTITIONS = ("equipment_id", "localizacao")
+
+
+def _init_farm_worker(threads_per_worker: int) -> None:
+    """
+    Limita as threads de um processo do pool antes de carregar o PyTorch.
+
+    Com N workers e T threads cada, a fazenda usa no máximo N × T núcleos,
+    sem a sobreinscrição de cada processo abrir um thread por núcleo.
+    """
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variable] = str(threads_per_worker)
+
+    from .autoencoder import configure_torch_threads
+
+    configure_torch_threads(intra_op=threads_per_worker, inter_op=1)
+
+
+def _train_unit(unit: str, data: pd.DataFrame, groups: np.ndarray, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Treina o modelo de uma unidade dentro de um processo do pool.
+
+    Returns:
+        Dicionário com status, pesos e scaler serializados e histórico. Em caso
+        de falha, status "error" e a mensagem.
+    """
+    from .autoencoder import MovingWindowAutoEncoder
+
+    start = time.perf_counter()
+
+    try:
+        autoencoder = MovingWindowAutoEncoder(
+            model_arch=params['model_arch'],
+            latent_dim=params['latent_dim'],
+            device="cpu",
+            multiresolution=params['multiresolution']
+        )
+        autoencoder.fit(
+            data,
+            window_size=params['window_size'],
+            num_epochs=params['num_epochs'],
+            learning_rate=params['learning_rate'],
+            batch_size=params['batch_size'],
+            groups=groups,
+            early_stopping_patience=params['early_stopping_patience'],
+            lr_patience=params['lr_patience']
+        )
+
+        if not autoencoder.is_fitted:
+            return {
+                'unit': unit,
+                'status': 'error',
+                'message': f"Dados insuficientes para window_size={params['window_size']} ({len(data)} leituras)"
+            }
+
+        model_data, scaler_data = autoencoder.serialize()
+        history = autoencoder.training_history or {}
+
+        return {
+            'unit': unit,
+            'status': 'success',
+            'model_data': model_data,
+            'scaler_data': scaler_data,
+            'data_points': len(data),
+            'equipments': int(len(pd.unique(groups))),
+            'epochs_trained': history.get('epochs_trained'),
+            'best_epoch': history.get('best_epoch'),
+            'best_loss': history.get('best_loss'),
+            'seconds': time.perf_counter() - start,
+        }
+
+    except Exception as e:
+        return {'unit': unit, 'status': 'error', 'message': str(e)}
+
+
+class TrainingFarm:
+    """
+    Treina muitos autoencoders pequenos (um por equipamento ou localização)
+    em um pool de processos.
+
+    Os dados são lidos do banco uma única vez e divididos por unidade; cada
+    processo do pool treina uma unidade por vez com um número limitado de
+    threads, e o processo principal grava cada modelo em anomaly_models
+    assim que ele termina, com o nome "<model_name>:<unidade>".
+    """
+
+    def __init__(
+        self,
+        db_connector: SQLServerConnector,
+        max_workers: Optional[int] = None,
+        threads_per_worker: int = 1
+    ):
+        """
+        Inicializa a fazenda.
+
+        Args:
+            db_connector: Conector com banco de dados
+            max_workers: Número de processos (None = núcleos / threads_per_worker)
+            threads_per_worker: Threads do PyTorch (e OpenMP/MKL) por processo
+        """
+        self.db_connector = db_connector
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 1) // self.threads_per_worker)
+
+    @staticmethod
+    def unit_model_name(model_name: str, unit: str) -> str:
+        """Nome do modelo de uma unidade no armazenamento."""
+        return f"{model_name}:{unit}"
+
+    def train(
+        self,
+        model_name: str = "default_model",
+        partition_by: str = "equipment_id",
+        units: Optional[List[str]] = None,
+        model_arch: str = "mlp",
+        latent_dim: int = 5,
+        window_size: int = 168,
+        num_epochs: int = 50,
+        learning_rate: float = 1e-3,
+        batch_size: int = 32,
+        early_stopping_patience: Optional[int] = 10,
+        lr_patience: Optional[int] = 5,
+        features: Optional[List[str]] = None,
+        progress_callback: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
+        """
+        Treina um modelo por unidade e grava cada um no armazenamento de modelos.
+
+        Args:
+            model_name: Prefixo dos nomes dos modelos
+            partition_by: "equipment_id" (um modelo por bucha) ou "localizacao" (por subestação)
+            units: Unidades a treinar (None = todas)
+            model_arch: Arquitetura ("mlp", "cnn", "cnn_mc" ou "pca")
+            latent_dim: Dimensão do espaço latente
+            window_size: Tamanho da janela
+            num_epochs: Número de épocas
+            learning_rate: Taxa de aprendizado
+            batch_size: Tamanho do lote de treino
+            early_stopping_patience: Épocas sem melhora antes de parar (None = desativado)
+            lr_patience: Épocas sem melhora antes de reduzir a taxa (None = desativado)
+            features: Esquema de features dos modelos (None = anomaly.features da configuração)
+            progress_callback: Função chamada a cada unidade concluída (evento "unit")
+
+        Returns:
+            Dicionário com o resultado de cada unidade
+        """
+        # Importado aqui para que os processos do pool não carreguem o PyTorch
+        # antes de _init_farm_worker limitar as threads
+        from .manager import AnomalyManager
+
+        if partition_by not in PARTITIONS:
+            raise ValueError(f"partition_by inválido: {partition_by}. Use 'equipment_id' ou 'localizacao'.")
+
+        start = time.perf_counter()
+        manager = AnomalyManager(self.db_connector)
+
+        sensor_data = self.db_connector.fetch_data(
+            "SELECT * FROM sensor_data ORDER BY equipment_id, timestamp ASC"
+        )
+
+        if units:
+            sensor_data = sensor_data[sensor_data[partition_by].isin(units)]
+
+        if sensor_data.empty:
+            return {
+                "status": "error",
+                "message": "Nenhum dado de sensor encontrado para as unidades informadas"
+            }
+
+        numeric_cols = manager._select_features(sensor_data, features)
+
+        data = manager._fill_missing(sensor_data, numeric_cols)
+        data.index = pd.DatetimeIndex(pd.to_datetime(sensor_data['timestamp']))
+
+        params = {
+            'model_arch': model_arch,
+            'latent_dim': latent_dim,
+            'window_size': window_size,
+            'num_epochs': num_epochs,
+            'learning_rate': learning_rate,
+            'batch_size': batch_size,
+            'early_stopping_patience': early_stopping_patience,
+            'lr_patience': lr_patience,
+            'multiresolution': manager.multiresolution,
+        }
+
+        # Unidades maiores primeiro, para equilibrar a carga entre os processos
+        unit_positions = sensor_data.reset_index(drop=True).groupby(partition_by, sort=False).indices
+        ordered_units = sorted(unit_positions, key=lambda unit: len(unit_positions[unit]), reverse=True)
+        equipment_ids = sensor_data['equipment_id'].to_numpy()
+
+        n_workers = min(self.max_workers, len(ordered_units))
+        logger.info(
+            f"Fazenda de treinamento: {len(ordered_units)} modelos por {partition_by}, "
+            f"{n_workers} processos x {self.threads_per_worker} threads"
+        )
+
+        results = []
+
+        # spawn: processos novos, sem herdar o estado de threads do PyTorch do processo principal
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_farm_worker,
+            initargs=(self.threads_per_worker,)
+        ) as executor:
+            futures = []
+            for unit in ordered_units:
+                positions = unit_positions[unit]
+                futures.append(executor.submit(
+                    _train_unit, str(unit), data.iloc[positions], equipment_ids[positions], params
+                ))
+
+            for future in as_completed(futures):
+                result = future.result()
+                unit_name = self.unit_model_name(model_name, result['unit'])
+
+                if result['status'] == 'success':
+                    result['model_saved'] = manager._save_model(
+                        model_name=unit_name,
+                        model_arch=model_arch,
+                        latent_dim=latent_dim,
+                        window_size=window_size,
+                        num_epochs=result['epochs_trained'] or num_epochs,
+                        model_data=result.pop('model_data'),
+                        scaler_data=result.pop('scaler_data')
+                    )
+                    logger.info(
+                        f"Modelo '{unit_name}' treinado em {result['seconds']:.1f}s "
+                        f"({result['data_points']} leituras)"
+                    )
+                else:
+                    logger.warning(f"Falha no treinamento de '{unit_name}': {result['message']}")
+
+                result['model_name'] = unit_name
+                results.append(result)
+
+                if progress_callback is not None:
+                    progress_callback({
+                        'type': 'unit',
+                        'unit': result['unit'],
+                        'model_name': unit_name,
+                        'unit_status': result['status'],
+                        'completed': len(results),
+                        'total': len(ordered_units),
+                        'elapsed_seconds': time.perf_counter() - start,
+                    })
+
+        n_success = sum(1 for result in results if result['status'] == 'success')
+
+        return {
+            "status": "success" if n_success > 0 else "error",
+            "message": f"{n_success}/{len(results)} modelos treinados por {partition_by}",
+            "model_name": model_name,
+            "partition_by": partition_by,
+            "models_trained": n_success,
+            "models_failed": len(results) - n_success,
+            "workers": n_workers,
+            "threads_per_worker": self.threads_per_worker,
+            "elapsed_seconds": time.perf_counter() - start,
+            "units": results
+        }
@@ -0,0 +1,259 @@
+"""
+Armazenamento de features normalizadas (float32) por equipamento.
+"""
+
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .detection import DEFAULT_IDLE_TIMEOUT_HOURS, active_watermark
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class FeatureStore:
+    """
+    Features já preenchidas e normalizadas de um modelo, prontas para o autoencoder.
+
+    Cada equipamento tem dois arquivos binários: valores (n_linhas x
+    n_features, float32) e timestamps (int64, ns), lidos por memmap. O
+    manifest.json guarda o esquema de features, os parâmetros do scaler
+    usados na normalização e, por equipamento, o número de linhas, o último
+    timestamp e a última leitura bruta (base do preenchimento de faltantes
+    nas leituras acrescentadas depois). Assim, treino e detecção leem arrays
+    prontos em vez de repetir fillna e StandardScaler.transform sobre todo o
+    histórico; apenas as leituras novas são processadas em append().
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(
+        self,
+        root_dir: Union[str, Path],
+        name: str,
+        idle_timeout_hours: Optional[float] = DEFAULT_IDLE_TIMEOUT_HOURS
+    ):
+        """
+        Args:
+            root_dir: Diretório base dos armazenamentos
+            name: Nome do armazenamento (normalmente o nome do modelo)
+            idle_timeout_hours: Horas sem leituras após as quais um equipamento
+                                deixa de segurar o watermark (None = nunca)
+        """
+        self.name = name
+        self.idle_timeout_hours = idle_timeout_hours
+        self.path = Path(root_dir) / "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+        self._manifest: Optional[Dict[str, Any]] = None
+
+    @property
+    def exists(self) -> bool:
+        """Indica se o armazenamento já foi construído."""
+        return (self.path / self.MANIFEST).exists()
+
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        """Manifesto do armazenamento (esquema, scaler e equipamentos)."""
+        if self._manifest is None:
+            with open(self.path / self.MANIFEST, encoding="utf-8") as f:
+                self._manifest = json.load(f)
+        return self._manifest
+
+    @property
+    def features(self) -> List[str]:
+        """Esquema de features, na ordem das colunas dos arrays."""
+        return self.manifest["features"]
+
+    @property
+    def equipment_ids(self) -> List[str]:
+        """Equipamentos armazenados."""
+        return list(self.manifest["equipment"])
+
+    @property
+    def watermark(self) -> Optional[pd.Timestamp]:
+        """Menor último timestamp entre os equipamentos ativos (leituras posteriores ainda não armazenadas)."""
+        return active_watermark(
+            (entry["last_timestamp"] for entry in self.manifest["equipment"].values()),
+            self.idle_timeout_hours
+        )
+
+    def is_compatible(self, features: List[str], scaler: Any) -> bool:
+        """Verifica se o armazenamento foi normalizado com o mesmo esquema e scaler."""
+        if not self.exists:
+            return False
+
+        manifest = self.manifest
+        return (
+            manifest["features"] == list(features)
+            and np.allclose(manifest["mean"], scaler.mean_)
+            and np.allclose(manifest["scale"], scaler.scale_)
+        )
+
+    def build(self, sensor_data: pd.DataFrame, values: pd.DataFrame, scaler: Any) -> None:
+        """
+        (Re)constrói o armazenamento a partir do histórico completo.
+
+        Args:
+            sensor_data: Leituras com equipment_id e timestamp, ordenadas por
+                         equipamento e timestamp
+            values: Features já preenchidas (mesmas linhas de sensor_data)
+            scaler: StandardScaler ajustado nas features
+        """
+        if self.path.exists():
+            shutil.rmtree(self.path)
+        self.path.mkdir(parents=True)
+
+        features = [str(col) for col in values.columns]
+        self._manifest = {
+            "name": self.name,
+            "features": features,
+            "mean": np.asarray(scaler.mean_, dtype=float).tolist(),
+            "scale": np.asarray(scaler.scale_, dtype=float).tolist(),
+            "equipment": {},
+        }
+
+        self._write(sensor_data, values.to_numpy(dtype=np.float64))
+        logger.info(
+            f"Feature store '{self.name}' construído: {len(self.equipment_ids)} equipamentos, "
+            f"{len(sensor_data)} linhas x {len(features)} features"
+        )
+
+    def append(self, sensor_data: pd.DataFrame) -> int:
+        """
+        Acrescenta leituras novas (timestamp posterior ao último de cada equipamento).
+
+        Valores faltantes são preenchidos com a última leitura do equipamento
+        (ou a média do scaler, para equipamentos novos), como no treinamento.
+
+        Args:
+            sensor_data: Leituras com equipment_id, timestamp e as features
+
+        Returns:
+            Número de linhas acrescentadas
+        """
+        if sensor_data.empty:
+            return 0
+
+        missing = [col for col in self.features if col not in sensor_data.columns]
+        if missing:
+            raise ValueError(f"Colunas ausentes nas leituras: {missing}")
+
+        sensor_data = sensor_data.assign(timestamp=pd.to_datetime(sensor_data["timestamp"]))
+        sensor_data = sensor_data.sort_values(["equipment_id", "timestamp"], kind="mergesort")
+
+        # Apenas leituras posteriores às já armazenadas de cada equipamento
+        last = {key: pd.Timestamp(entry["last_timestamp"]) for key, entry in self.manifest["equipment"].items()}
+        last_timestamp = sensor_data["equipment_id"].astype(str).map(last)
+        sensor_data = sensor_data[last_timestamp.isna() | (sensor_data["timestamp"] > last_timestamp)]
+
+        if sensor_data.empty:
+            return 0
+
+        # Preencher faltantes a partir da última leitura bruta de cada equipamento
+        values = sensor_data[self.features].to_numpy(dtype=np.float64)
+        equipment_ids = sensor_data["equipment_id"].astype(str).to_numpy()
+        for equipment_id in pd.unique(equipment_ids):
+            rows = np.flatnonzero(equipment_ids == equipment_id)
+            entry = self.manifest["equipment"].get(equipment_id)
+            previous = np.asarray(entry["last_raw"] if entry else self.manifest["mean"], dtype=np.float64)
+            block = pd.DataFrame(np.vstack([previous, values[rows]])).ffill().to_numpy()
+            values[rows] = block[1:]
+
+        self._write(sensor_data, values)
+        logger.info(f"Feature store '{self.name}': {len(sensor_data)} linhas acrescentadas")
+
+        return len(sensor_data)
+
+    def read(
+        self,
+        equipment_ids: Optional[List[str]] = None,
+        mmap: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Lê as features normalizadas.
+
+        Args:
+            equipment_ids: Equipamentos (None = todos)
+            mmap: Mapear os arquivos em memória em vez de carregá-los
+
+        Returns:
+            Tupla (valores float32 (n, n_features), timestamps datetime64[ns],
+            equipment_id por linha), com as linhas de cada equipamento
+            contíguas e em ordem cronológica
+        """
+        selected = [
+            key for key in self.manifest["equipment"]
+            if equipment_ids is None or key in set(map(str, equipment_ids))
+        ]
+
+        blocks, timestamps, groups = [], [], []
+        for key in selected:
+            block, block_timestamps = self._open(key, mmap=mmap)
+            blocks.append(block)
+            timestamps.append(block_timestamps)
+            groups.append(np.full(len(block), key, dtype=object))
+
+        if not blocks:
+            n_features = len(self.features)
+            return np.empty((0, n_features), dtype=np.float32), np.empty(0, dtype="datetime64[ns]"), np.empty(0, dtype=object)
+
+        if len(blocks) == 1:
+            return blocks[0], timestamps[0].view("datetime64[ns]"), groups[0]
+
+        return (
+            np.concatenate(blocks),
+            np.concatenate(timestamps).view("datetime64[ns]"),
+            np.concatenate(groups)
+        )
+
+    def _open(self, key: str, mmap: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """Abre os arquivos de um equipamento."""
+        entry = self.manifest["equipment"][key]
+        n_rows, n_features = entry["rows"], len(self.features)
+
+        if n_rows == 0:
+            return np.empty((0, n_features), dtype=np.float32), np.empty(0, dtype=np.int64)
+
+        if mmap:
+            values = np.memmap(self.path / entry["values"], dtype=np.float32, mode="r", shape=(n_rows, n_features))
+            timestamps = np.memmap(self.path / entry["timestamps"], dtype=np.int64, mode="r", shape=(n_rows,))
+        else:
+            values = np.fromfile(self.path / entry["values"], dtype=np.float32).reshape(n_rows, n_features)
+            timestamps = np.fromfile(self.path / entry["timestamps"], dtype=np.int64)
+
+        return values, timestamps
+
+    def _write(self, sensor_data: pd.DataFrame, values: np.ndarray) -> None:
+        """Normaliza e acrescenta as linhas de cada equipamento aos seus arquivos."""
+        manifest = self.manifest
+        mean = np.asarray(manifest["mean"], dtype=np.float64)
+        scale = np.asarray(manifest["scale"], dtype=np.float64)
+
+        normalized = ((values - mean) / scale).astype(np.float32)
+        timestamps = pd.to_datetime(sensor_data["timestamp"]).to_numpy().astype("datetime64[ns]").view(np.int64)
+        equipment_ids = sensor_data["equipment_id"].astype(str).to_numpy()
+
+        boundaries = np.flatnonzero(equipment_ids[1:] != equipment_ids[:-1]) + 1
+        for start, stop in zip(np.concatenate(([0], boundaries)), np.concatenate((boundaries, [len(equipment_ids)]))):
+            key = equipment_ids[start]
+            entry = manifest["equipment"].get(key)
+            if entry is None:
+                file_id = f"eq_{len(manifest['equipment']):05d}"
+                entry = {"values": f"{file_id}.f32", "timestamps": f"{file_id}.ts", "rows": 0}
+                manifest["equipment"][key] = entry
+
+            with open(self.path / entry["values"], "ab") as f:
+                f.write(np.ascontiguousarray(normalized[start:stop]).tobytes())
+            with open(self.path / entry["timestamps"], "ab") as f:
+                f.write(np.ascontiguousarray(timestamps[start:stop]).tobytes())
+
+            entry["rows"] += int(stop - start)
+            entry["last_timestamp"] = pd.Timestamp(timestamps[stop - 1]).isoformat()
+            entry["last_raw"] = values[stop - 1].tolist()
+
+        with open(self.path / self.MANIFEST, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
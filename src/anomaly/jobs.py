@@ -0,0 +1,224 @@
+"""
+Execução de treinamentos do autoencoder em segundo plano com eventos de progresso.
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Tipos de evento que encerram um job
+TERMINAL_EVENTS = ("completed", "failed")
+
+
+class TrainingJob:
+    """Estado e histórico de eventos de um treinamento."""
+
+    def __init__(self, job_id: str, model_name: str, params: Dict[str, Any]):
+        """
+        Inicializa o job.
+
+        Args:
+            job_id: Identificador do job
+            model_name: Nome do modelo treinado
+            params: Parâmetros do treinamento
+        """
+        self.job_id = job_id
+        self.model_name = model_name
+        self.params = params
+
+        self.status = "pending"  # pending, running, completed, failed
+        self.events: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+
+    @property
+    def is_finished(self) -> bool:
+        """Indica se o job terminou (com sucesso ou erro)."""
+        return self.status in TERMINAL_EVENTS
+
+    @property
+    def last_epoch(self) -> Optional[Dict[str, Any]]:
+        """Último evento de época publicado."""
+        for event in reversed(self.events):
+            if event["type"] == "epoch":
+                return event
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Resumo serializável do job."""
+        return {
+            "job_id": self.job_id,
+            "model_name": self.model_name,
+            "status": self.status,
+            "params": self.params,
+            "progress": self.last_epoch,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class TrainingJobManager:
+    """
+    Gerenciador de treinamentos em segundo plano.
+
+    Cada job executa a função de treinamento em um worker e publica eventos
+    estruturados (início, progresso por época, conclusão ou erro). Os eventos
+    ficam no histórico do job e são entregues a assinantes assíncronos
+    (ex.: endpoint SSE) por filas em memória, sem leitura de arquivos de log.
+    """
+
+    def __init__(self, max_workers: int = 1, max_jobs: int = 100):
+        """
+        Inicializa o gerenciador.
+
+        Args:
+            max_workers: Número de treinamentos simultâneos
+            max_jobs: Número de jobs mantidos no histórico (os mais antigos
+                      já finalizados são descartados)
+        """
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="training")
+        self._jobs: "OrderedDict[str, TrainingJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        train_fn: Callable[[Callable[[Dict[str, Any]], None]], Dict[str, Any]],
+        model_name: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> TrainingJob:
+        """
+        Agenda um treinamento.
+
+        Args:
+            train_fn: Função de treinamento; recebe o callback de progresso e
+                      retorna o resultado ({"status": "success" | "error", ...})
+            model_name: Nome do modelo
+            params: Parâmetros do treinamento (informativos)
+
+        Returns:
+            Job criado
+        """
+        job = TrainingJob(uuid.uuid4().hex[:12], model_name, params or {})
+
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._prune()
+
+        self._publish(job, {"type": "queued"})
+        self._executor.submit(self._run, job, train_fn)
+
+        logger.info(f"Treinamento '{model_name}' agendado (job {job.job_id})")
+
+        return job
+
+    def get(self, job_id: str) -> Optional[TrainingJob]:
+        """Retorna um job pelo identificador."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def latest(self) -> Optional[TrainingJob]:
+        """Retorna o job mais recente."""
+        with self._lock:
+            return next(reversed(self._jobs.values()), None)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Lista os jobs, do mais recente para o mais antigo."""
+        with self._lock:
+            return [job.to_dict() for job in reversed(self._jobs.values())]
+
+    def subscribe(self, job_id: str) -> Optional[asyncio.Queue]:
+        """
+        Assina os eventos de um job (deve ser chamado no event loop).
+
+        Os eventos já publicados são reenviados primeiro, de modo que um
+        assinante tardio recebe o histórico completo.
+
+        Returns:
+            Fila de eventos, ou None se o job não existir
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+
+            for event in job.events:
+                queue.put_nowait(event)
+
+            if not job.is_finished:
+                job._subscribers.append((loop, queue))
+
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        """Cancela a assinatura de eventos de um job."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job._subscribers = [(l, q) for l, q in job._subscribers if q is not queue]
+
+    def _run(self, job: TrainingJob, train_fn: Callable) -> None:
+        """Executa o treinamento no worker."""
+        job.started_at = datetime.now()
+        self._publish(job, {"type": "started"}, status="running")
+
+        try:
+            result = train_fn(lambda progress: self._publish(job, {"type": "epoch", **progress}))
+        except Exception as e:
+            logger.error(f"Erro no treinamento (job {job.job_id}): {e}", exc_info=True)
+            result = {"status": "error", "message": str(e)}
+
+        job.finished_at = datetime.now()
+
+        if result.get("status") == "success":
+            job.result = result
+            self._publish(job, {"type": "completed", "result": result}, status="completed")
+        else:
+            job.error = result.get("message", "Erro desconhecido")
+            self._publish(job, {"type": "failed", "message": job.error}, status="failed")
+
+    def _publish(self, job: TrainingJob, event: Dict[str, Any], status: Optional[str] = None) -> None:
+        """Registra um evento (e a mudança de status) e o entrega aos assinantes."""
+        event = {"job_id": job.job_id, "timestamp": time.time(), **event}
+
+        with self._lock:
+            if status is not None:
+                job.status = status
+            job.events.append(event)
+            subscribers = list(job._subscribers)
+            if event["type"] in TERMINAL_EVENTS:
+                job._subscribers = []
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # Event loop do assinante já foi encerrado
+                pass
+
+    def _prune(self) -> None:
+        """Descarta os jobs finalizados mais antigos além de max_jobs."""
+        excess = len(self._jobs) - self.max_jobs
+        for job_id in [j for j, job in self._jobs.items() if job.is_finished][:max(0, excess)]:
+            del self._jobs[job_id]
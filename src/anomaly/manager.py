@@ -2,17 +2,28 @@
 Gerenciador de anomalias com persistência em banco de dados.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from datetime import datetime, timedelta
 import json
 
-from .autoencoder import MovingWindowAutoEncoder
+from .autoencoder import MovingWindowAutoEncoder, torch_threads
+from .detection import DEFAULT_IDLE_TIMEOUT_HOURS
+from .feature_store import FeatureStore
+from .streaming import StreamingAnomalyScorer
 from ..database.sql_server import SQLServerConnector, DatabaseManager
+from ..utils.config_loader import get_config_loader
 from ..utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Linhas por executemany ao gravar detecções
+INSERT_BATCH_SIZE = 10000
+
+# Parâmetros por consulta IN (o SQL Server aceita até 2100 por comando)
+QUERY_PARAMETER_CHUNK = 2000
+
 
 class AnomalyManager:
     """Gerencia detecção e armazenamento de anomalias."""
@@ -26,6 +37,26 @@ class AnomalyManager:
         """
         self.db_connector = db_connector
         self.autoencoder = None
+
+        # Execução do PyTorch (modo compilado e threads por tipo de carga)
+        anomaly_config = get_config_loader().get("default", "anomaly", {}) or {}
+        self.compile_mode = anomaly_config.get("compile_mode")
+        self.training_threads = anomaly_config.get("training_threads")
+        self.inference_threads = anomaly_config.get("inference_threads")
+        self.quantize_inference = anomaly_config.get("quantize_inference", False)
+        self.quantization_max_error = anomaly_config.get("quantization_max_error", 0.05)
+
+        # Esquema de features padrão e diretório do feature store (None = desativado)
+        self.features = anomaly_config.get("features")
+        self.feature_store_dir = anomaly_config.get("feature_store_dir")
+
+        # Agregação multirresolução das janelas (None = janelas brutas)
+        self.multiresolution = anomaly_config.get("multiresolution")
+
+        # Inatividade (horas) após a qual um equipamento deixa de segurar o
+        # watermark da leitura incremental (None = nunca)
+        self.idle_timeout_hours = anomaly_config.get("idle_timeout_hours", DEFAULT_IDLE_TIMEOUT_HOURS)
+
         self._ensure_tables_exist()
 
     def _ensure_tables_exist(self):
@@ -85,7 +116,15 @@ class AnomalyManager:
         window_size: int = 168,  # 1 semana de dados horários
         num_epochs: int = 50,
         learning_rate: float = 1e-3,
-        clear_sensor_data: bool = False
+        clear_sensor_data: bool = False,
+        progress_callback: Optional[Callable[[Dict], None]] = None,
+        batch_size: int = 32,
+        num_workers: int = 0,
+        early_stopping_patience: Optional[int] = 10,
+        lr_patience: Optional[int] = 5,
+        restore_best_weights: bool = True,
+        features: Optional[List[str]] = None,
+        multiresolution: Optional[Dict[str, int]] = None
     ) -> Dict:
         """
         Treina o autoencoder com dados do banco.
@@ -93,12 +132,21 @@ class AnomalyManager:
         Args:
             equipment_ids: Lista de equipamentos para treinar (None = todos)
             model_name: Nome do modelo
-            model_arch: Arquitetura ("mlp" ou "cnn")
+            model_arch: Arquitetura ("mlp", "cnn", "cnn_mc" ou "pca")
             latent_dim: Dimensão do espaço latente
             window_size: Tamanho da janela
             num_epochs: Número de épocas
             learning_rate: Taxa de aprendizado
             clear_sensor_data: Se True, limpa sensor_data ANTES de treinar (útil para separar treino de teste)
+            progress_callback: Função chamada a cada época com o progresso do treinamento
+            batch_size: Tamanho do lote de treino
+            num_workers: Processos de preparação de lotes (0 = no processo principal)
+            early_stopping_patience: Épocas sem melhora na validação antes de parar (None = desativado)
+            lr_patience: Épocas sem melhora antes de reduzir a taxa de aprendizado (None = desativado)
+            restore_best_weights: Restaurar os pesos da melhor época
+            features: Esquema de features do modelo (None = anomaly.features da configuração)
+            multiresolution: Agregação das janelas, {"block_size", "recent_size"}
+                             (None = anomaly.multiresolution da configuração)
 
         Returns:
             Dicionário com resultado do treinamento
@@ -112,7 +160,9 @@ class AnomalyManager:
             # IMPORTANTE: Se clear_sensor_data=True, limpa DEPOIS de treinar
             # Isso permite que você tenha dados de treino, treine, e depois adicione dados de teste
 
-            sensor_data = manager.connector.fetch_data("SELECT * FROM sensor_data ORDER BY timestamp ASC")
+            sensor_data = manager.connector.fetch_data(
+                "SELECT * FROM sensor_data ORDER BY equipment_id, timestamp ASC"
+            )
 
             if sensor_data.empty:
                 return {
@@ -130,32 +180,69 @@ class AnomalyManager:
                     "message": f"Nenhum dado encontrado para os equipamentos: {equipment_ids}"
                 }
 
-            # Selecionar colunas numéricas
-            numeric_cols = sensor_data.select_dtypes(include=['float64', 'int64']).columns
-            numeric_cols = [col for col in numeric_cols if col not in ['id']]
+            # Esquema de features do modelo
+            numeric_cols = self._select_features(sensor_data, features)
+
+            data = self._fill_missing(sensor_data, numeric_cols)
 
-            data = sensor_data[numeric_cols].fillna(method='ffill').fillna(method='bfill')
+            # Timestamps no índice: o maior vira o watermark do treinamento (fine_tune)
+            data.index = pd.DatetimeIndex(pd.to_datetime(sensor_data['timestamp']))
 
             # Criar e treinar autoencoder
             self.autoencoder = MovingWindowAutoEncoder(
                 model_arch=model_arch,
-                latent_dim=latent_dim
+                latent_dim=latent_dim,
+                compile_mode=self.compile_mode,
+                multiresolution=multiresolution or self.multiresolution
             )
 
+            fit_data, groups, normalized = pd.DataFrame(data), sensor_data['equipment_id'].to_numpy(), False
+
+            # Feature store: features normalizadas materializadas uma vez por equipamento
+            store = self._feature_store(model_name)
+            if store is not None:
+                self.autoencoder.scaler.fit(data)
+                store.build(sensor_data, data, self.autoencoder.scaler)
+                fit_data, timestamps, groups = store.read()
+                normalized = True
+
             self.autoencoder.fit(
-                data=pd.DataFrame(data),
+                data=fit_data,
                 window_size=window_size,
                 num_epochs=num_epochs,
-                learning_rate=learning_rate
+                learning_rate=learning_rate,
+                groups=groups,
+                normalized=normalized,
+                progress_callback=progress_callback,
+                batch_size=batch_size,
+                num_workers=num_workers,
+                early_stopping_patience=early_stopping_patience,
+                lr_patience=lr_patience,
+                restore_best_weights=restore_best_weights,
+                num_threads=self.training_threads
             )
 
-            # Salvar modelo no banco (simplificado - sem serialização de pesos)
-            self._save_model_metadata(
+            if normalized:
+                self.autoencoder.training_watermark = pd.Timestamp(timestamps.max())
+
+            history = self.autoencoder.training_history or {}
+
+            # Inferência INT8 (MLP em CPU), mantida apenas se Q e T² se preservam
+            quantization = None
+            if self.quantize_inference and model_arch == "mlp" and self.autoencoder.device.startswith("cpu"):
+                quantization = self.autoencoder.quantize(
+                    pd.DataFrame(data),
+                    groups=sensor_data['equipment_id'].to_numpy(),
+                    max_relative_error=self.quantization_max_error
+                )
+
+            # Salvar modelo no banco (metadados, pesos e scaler)
+            model_saved = self._save_model(
                 model_name=model_name,
                 model_arch=model_arch,
                 latent_dim=latent_dim,
                 window_size=window_size,
-                num_epochs=num_epochs
+                num_epochs=history.get('epochs_trained', num_epochs)
             )
 
             return {
@@ -164,7 +251,15 @@ class AnomalyManager:
                 "model_name": model_name,
                 "model_arch": model_arch,
                 "data_points": len(data),
-                "features": len(numeric_cols)
+                "features": len(numeric_cols),
+                "feature_names": list(numeric_cols),
+                "input_dim": self.autoencoder.input_dim,
+                "multiresolution": self.autoencoder.multiresolution,
+                "epochs_trained": history.get('epochs_trained'),
+                "best_epoch": history.get('best_epoch'),
+                "best_loss": history.get('best_loss'),
+                "quantization": quantization,
+                "model_saved": model_saved
             }
 
         except Exception as e:
@@ -174,6 +269,167 @@ class AnomalyManager:
                 "message": str(e)
             }
 
+    def fine_tune_autoencoder(
+        self,
+        model_name: str = "default_model",
+        num_epochs: int = 5,
+        learning_rate: float = 1e-4,
+        replay_days: Optional[int] = 30,
+        replay_fraction: float = 0.25,
+        batch_size: int = 32,
+        progress_callback: Optional[Callable[[Dict], None]] = None,
+        early_stopping_patience: Optional[int] = 3
+    ) -> Dict:
+        """
+        Ajusta um modelo existente apenas com as leituras posteriores ao seu treinamento.
+
+        Carrega o modelo persistido, busca as leituras com timestamp maior que
+        o watermark do modelo (com as window_size - 1 leituras anteriores de
+        cada equipamento como contexto) e, para replay, as leituras dos
+        replay_days dias anteriores ao watermark. O modelo ajustado substitui
+        o persistido.
+
+        Args:
+            model_name: Nome do modelo persistido
+            num_epochs: Número máximo de épocas
+            learning_rate: Taxa de aprendizado
+            replay_days: Dias de histórico antes do watermark usados no replay (None/0 = sem replay)
+            replay_fraction: Janelas de replay por janela nova de treino
+            batch_size: Tamanho do lote de treino
+            progress_callback: Função chamada a cada época com o progresso do treinamento
+            early_stopping_patience: Épocas sem melhora antes de parar (None = desativado)
+
+        Returns:
+            Dicionário com resultado do ajuste
+        """
+        logger.info(f"Iniciando fine-tuning do modelo '{model_name}'...")
+
+        try:
+            if not self.load_model(model_name):
+                return {
+                    "status": "error",
+                    "message": f"Modelo '{model_name}' não encontrado (treine-o primeiro)"
+                }
+
+            if self.autoencoder.model_arch == "pca":
+                return {
+                    "status": "error",
+                    "message": f"Modelo '{model_name}' é PCA (forma fechada); retreine-o em vez de ajustá-lo"
+                }
+
+            watermark = self.autoencoder.training_watermark
+            if watermark is None:
+                return {
+                    "status": "error",
+                    "message": f"Modelo '{model_name}' sem watermark de treinamento; retreine-o"
+                }
+
+            feature_names = self.autoencoder.feature_names
+            window_size = self.autoencoder.window_size
+
+            new_readings = self.db_connector.fetch_data(
+                "SELECT * FROM sensor_data WHERE timestamp > ? ORDER BY equipment_id, timestamp ASC",
+                (watermark.to_pydatetime(),)
+            )
+
+            if new_readings.empty:
+                return {
+                    "status": "error",
+                    "message": f"Nenhuma leitura posterior a {watermark} para o fine-tuning"
+                }
+
+            # Contexto: últimas window_size - 1 leituras até o watermark
+            context = self.db_connector.fetch_data(
+                """
+                SELECT * FROM (
+                    SELECT *, ROW_NUMBER() OVER (PARTITION BY equipment_id ORDER BY timestamp DESC) AS rn
+                    FROM sensor_data
+                    WHERE timestamp <= ?
+                ) recent
+                WHERE rn <= ?
+                """,
+                (watermark.to_pydatetime(), window_size - 1)
+            )
+            context = context[context['equipment_id'].isin(new_readings['equipment_id'].unique())]
+
+            sensor_data = (
+                pd.concat([context.drop(columns=['rn'], errors='ignore'), new_readings], ignore_index=True)
+                .assign(timestamp=lambda frame: pd.to_datetime(frame['timestamp']))
+                .sort_values(['equipment_id', 'timestamp'], kind='mergesort')
+                .reset_index(drop=True)
+            )
+            data = self._fill_missing(sensor_data, feature_names)
+            data.index = pd.DatetimeIndex(sensor_data['timestamp'])
+
+            replay_data, replay_groups = None, None
+            if replay_days:
+                replay_readings = self.db_connector.fetch_data(
+                    """
+                    SELECT * FROM sensor_data
+                    WHERE timestamp > ? AND timestamp <= ?
+                    ORDER BY equipment_id, timestamp ASC
+                    """,
+                    ((watermark - timedelta(days=replay_days)).to_pydatetime(), watermark.to_pydatetime())
+                )
+                if not replay_readings.empty:
+                    replay_data = self._fill_missing(replay_readings, feature_names)
+                    replay_groups = replay_readings['equipment_id'].to_numpy()
+
+            self.autoencoder.fine_tune(
+                data,
+                groups=sensor_data['equipment_id'].to_numpy(),
+                num_epochs=num_epochs,
+                learning_rate=learning_rate,
+                batch_size=batch_size,
+                replay_data=replay_data,
+                replay_groups=replay_groups,
+                replay_fraction=replay_fraction,
+                progress_callback=progress_callback,
+                early_stopping_patience=early_stopping_patience,
+                num_threads=self.training_threads
+            )
+
+            history = self.autoencoder.training_history or {}
+
+            quantization = None
+            if self.quantize_inference and self.autoencoder.model_arch == "mlp" and self.autoencoder.device.startswith("cpu"):
+                quantization = self.autoencoder.quantize(
+                    data,
+                    groups=sensor_data['equipment_id'].to_numpy(),
+                    max_relative_error=self.quantization_max_error
+                )
+
+            model_saved = self._save_model(
+                model_name=model_name,
+                model_arch=self.autoencoder.model_arch,
+                latent_dim=self.autoencoder.latent_dim,
+                window_size=window_size,
+                num_epochs=history.get('epochs_trained', num_epochs)
+            )
+
+            return {
+                "status": "success",
+                "message": f"Modelo '{model_name}' ajustado com {len(new_readings)} leituras novas",
+                "model_name": model_name,
+                "model_arch": self.autoencoder.model_arch,
+                "new_data_points": len(new_readings),
+                "replay_windows": history.get('replay_windows', 0),
+                "previous_watermark": watermark.isoformat(),
+                "training_watermark": self.autoencoder.training_watermark.isoformat(),
+                "epochs_trained": history.get('epochs_trained'),
+                "best_epoch": history.get('best_epoch'),
+                "best_loss": history.get('best_loss'),
+                "quantization": quantization,
+                "model_saved": model_saved
+            }
+
+        except Exception as e:
+            logger.error(f"Erro no fine-tuning do modelo '{model_name}': {e}", exc_info=True)
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+
     def detect_anomalies(
         self,
         equipment_ids: Optional[List[str]] = None,
@@ -181,7 +437,10 @@ class AnomalyManager:
         save_to_database: bool = True,
         randomize_anomalies: bool = False,
         anomaly_type: str = "auto",
-        window_size: Optional[int] = None
+        window_size: Optional[int] = None,
+        batch_size: int = 1024,
+        n_workers: int = 4,
+        model_name: Optional[str] = None
     ) -> Dict:
         """
         Detecta anomalias nos dados atuais.
@@ -193,6 +452,9 @@ class AnomalyManager:
             randomize_anomalies: Ativar aleatorização de tipos de anomalias
             anomaly_type: Tipo de anomalia (auto, temperature, humidity, vibration, pressure, mixed)
             window_size: Tamanho da janela (deve ser igual ao treinamento)
+            batch_size: Número de janelas por forward pass na detecção
+            n_workers: Número de equipamentos avaliados em paralelo
+            model_name: Nome do modelo, para usar o seu feature store (None = sem feature store)
 
         Returns:
             Dicionário com resultados
@@ -206,38 +468,64 @@ class AnomalyManager:
         logger.info(f"Detectando anomalias... (randomize={randomize_anomalies}, type={anomaly_type})")
 
         try:
-            manager = DatabaseManager(self.db_connector)
-            sensor_data = manager.connector.fetch_data("SELECT * FROM sensor_data ORDER BY timestamp ASC")
-
-            if sensor_data.empty:
+            # Esquema de features do modelo (o do treinamento)
+            numeric_cols = self.autoencoder.feature_names
+            detect_kwargs = {}
+
+            store = self._feature_store(model_name) if model_name else None
+            if store is not None and not (
+                numeric_cols is not None
+                and store.is_compatible(numeric_cols, self.autoencoder.scaler)
+                and (not equipment_ids or set(map(str, equipment_ids)) <= set(store.equipment_ids))
+            ):
+                store = None
+
+            if store is not None:
+                # Feature store: só as leituras novas são preenchidas e normalizadas
+                self._sync_feature_store(store)
+                values, timestamps, groups = store.read(equipment_ids)
+                data = pd.DataFrame(values, columns=numeric_cols)
+                detect_kwargs = {'normalized': True, 'timestamps': timestamps}
+            else:
+                manager = DatabaseManager(self.db_connector)
+                sensor_data = manager.connector.fetch_data(
+                    "SELECT * FROM sensor_data ORDER BY equipment_id, timestamp ASC"
+                )
+
+                # Filtrar por equipamento
+                if equipment_ids and not sensor_data.empty:
+                    sensor_data = sensor_data[sensor_data['equipment_id'].isin(equipment_ids)]
+
+                data = pd.DataFrame()
+                if not sensor_data.empty:
+                    numeric_cols = self._select_features(sensor_data, numeric_cols)
+                    data = self._fill_missing(sensor_data, numeric_cols)
+                    data.index = sensor_data['timestamp']
+                    groups = sensor_data['equipment_id'].to_numpy()
+
+            if data.empty:
                 return {
                     "status": "error",
                     "message": "Nenhum dado de sensor encontrado"
                 }
 
-            # Filtrar por equipamento
-            if equipment_ids:
-                sensor_data = sensor_data[sensor_data['equipment_id'].isin(equipment_ids)]
-
-            # Selecionar colunas numéricas
-            numeric_cols = sensor_data.select_dtypes(include=['float64', 'int64']).columns
-            numeric_cols = [col for col in numeric_cols if col not in ['id']]
-
-            data = sensor_data[numeric_cols].fillna(method='ffill').fillna(method='bfill')
-            data.index = sensor_data['timestamp']
-
             logger.info(f"Dados carregados: {len(data)} registros, {len(numeric_cols)} features")
             logger.info(f"Features: {list(numeric_cols)}")
 
-            # Usar window_size padrão (168h) se não fornecido
-            detect_window_size = window_size if window_size is not None else 168
+            # Usar window_size do treinamento (ou 168h) se não fornecido
+            detect_window_size = window_size if window_size is not None else (self.autoencoder.window_size or 168)
             logger.info(f"Detectando com window_size={detect_window_size}h, threshold_percentile={threshold_percentile}")
 
-            # Detectar
+            # Detectar (janelas dentro de cada equipamento, avaliados em paralelo)
             detections = self.autoencoder.detect(
                 data=pd.DataFrame(data),
                 window_size=detect_window_size,
-                threshold_percentile=threshold_percentile
+                threshold_percentile=threshold_percentile,
+                batch_size=batch_size,
+                groups=groups,
+                n_workers=n_workers,
+                num_threads=self.inference_threads,
+                **detect_kwargs
             )
 
             logger.info(f"Detecção retornou {len(detections)} linhas")
@@ -248,7 +536,7 @@ class AnomalyManager:
 
             # Salvar no banco
             if save_to_database and not detections.empty:
-                self._save_detections(detections, sensor_data)
+                self._save_detections(detections)
 
             # Retornar resultado
             summary = self.autoencoder.get_anomaly_summary(detections)
@@ -267,6 +555,149 @@ class AnomalyManager:
                 "message": str(e)
             }
 
+    def create_streaming_scorer(self, rolling_window: int = 12) -> StreamingAnomalyScorer:
+        """
+        Cria um avaliador online para o modelo atual.
+
+        Os buffers são inicializados com as últimas window_size - 1 leituras de
+        cada equipamento, de modo que a próxima leitura já completa uma janela.
+
+        Args:
+            rolling_window: Janela da mediana móvel de Q e T²
+
+        Returns:
+            StreamingAnomalyScorer pronto para score_new_readings()
+        """
+        if self.autoencoder is None or not self.autoencoder.is_fitted:
+            raise RuntimeError("Autoencoder não foi treinado. Use train_autoencoder() primeiro.")
+
+        scorer = StreamingAnomalyScorer(
+            self.autoencoder,
+            rolling_window=rolling_window,
+            idle_timeout_hours=self.idle_timeout_hours
+        )
+
+        query = """
+        SELECT * FROM (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY equipment_id ORDER BY timestamp DESC) AS rn
+            FROM sensor_data
+        ) recent
+        WHERE rn <= ?
+        ORDER BY equipment_id, timestamp
+        """
+        history = self.db_connector.fetch_data(query, (scorer.window_size - 1,))
+        scorer.prime(history)
+
+        return scorer
+
+    def score_new_readings(
+        self,
+        scorer: StreamingAnomalyScorer,
+        save_to_database: bool = True,
+        batch_size: int = 1024
+    ) -> Dict:
+        """
+        Avalia apenas as leituras que chegaram desde a última chamada.
+
+        Args:
+            scorer: Avaliador online (create_streaming_scorer)
+            save_to_database: Acrescentar as detecções em anomaly_detections
+            batch_size: Número de janelas por forward pass
+
+        Returns:
+            Dicionário com resultados
+        """
+        try:
+            watermark = scorer.watermark
+
+            if watermark is None:
+                readings = self.db_connector.fetch_data(
+                    "SELECT * FROM sensor_data ORDER BY equipment_id, timestamp ASC"
+                )
+            else:
+                readings = self.db_connector.fetch_data(
+                    "SELECT * FROM sensor_data WHERE timestamp > ? ORDER BY equipment_id, timestamp ASC",
+                    (watermark.to_pydatetime(),)
+                )
+
+            with torch_threads(self.inference_threads):
+                detections = scorer.update(readings, batch_size=batch_size)
+
+            if save_to_database and not detections.empty:
+                self._save_detections(detections)
+
+            n_anomalies = int(detections['is_anomaly'].sum()) if not detections.empty else 0
+
+            return {
+                "status": "success",
+                "message": "Detecção online concluída",
+                "new_readings": len(readings),
+                "windows_scored": len(detections),
+                "anomalies_detected": n_anomalies,
+                "detections": detections.to_dict(orient='records')[:100]
+            }
+
+        except Exception as e:
+            logger.error(f"Erro na detecção online: {e}", exc_info=True)
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+
+    def _select_features(self, sensor_data: pd.DataFrame, features: Optional[List[str]] = None) -> List[str]:
+        """
+        Define o esquema de features: a lista informada, a da configuração
+        (anomaly.features) ou, na falta de ambas, as colunas numéricas.
+
+        Raises:
+            ValueError: Se alguma feature do esquema não existe em sensor_data.
+        """
+        features = features or self.features
+
+        if features:
+            missing = [col for col in features if col not in sensor_data.columns]
+            if missing:
+                raise ValueError(f"Features ausentes em sensor_data: {missing}")
+            return list(features)
+
+        numeric_cols = sensor_data.select_dtypes(include=['float64', 'int64']).columns
+        numeric_cols = [col for col in numeric_cols if col not in ['id']]
+        logger.warning(f"Esquema de features não configurado (anomaly.features); usando colunas numéricas: {numeric_cols}")
+
+        return numeric_cols
+
+    def _feature_store(self, model_name: str) -> Optional[FeatureStore]:
+        """Feature store do modelo (None se anomaly.feature_store_dir não está configurado)."""
+        if not self.feature_store_dir:
+            return None
+        return FeatureStore(self.feature_store_dir, model_name, idle_timeout_hours=self.idle_timeout_hours)
+
+    def _sync_feature_store(self, store: FeatureStore) -> int:
+        """Acrescenta ao feature store as leituras posteriores ao seu watermark."""
+        invalid = [col for col in store.features if not col.isidentifier()]
+        if invalid:
+            raise ValueError(f"Nomes de features inválidos: {invalid}")
+
+        columns = ", ".join(store.features)
+        query = f"""
+        SELECT equipment_id, timestamp, {columns} FROM sensor_data
+        WHERE timestamp > ?
+        ORDER BY equipment_id, timestamp ASC
+        """
+        readings = self.db_connector.fetch_data(query, (store.watermark.to_pydatetime(),))
+
+        return store.append(readings)
+
+    @staticmethod
+    def _fill_missing(sensor_data: pd.DataFrame, numeric_cols: List[str]) -> pd.DataFrame:
+        """Preenche valores faltantes dentro da série de cada equipamento."""
+        by_equipment = sensor_data.groupby('equipment_id', sort=False)[numeric_cols]
+        data = by_equipment.ffill()
+        data = data.groupby(sensor_data['equipment_id'], sort=False).bfill()
+
+        # Colunas sem nenhum valor em algum equipamento
+        return data.fillna(method='ffill').fillna(method='bfill')
+
     def get_anomalies(
         self,
         equipment_id: Optional[str] = None,
@@ -304,15 +735,64 @@ class AnomalyManager:
             logger.error(f"Erro ao buscar anomalias: {e}")
             return pd.DataFrame()
 
-    def _save_model_metadata(
+    def load_model(self, model_name: str) -> bool:
+        """
+        Carrega um modelo persistido em anomaly_models.
+
+        Args:
+            model_name: Nome do modelo
+
+        Returns:
+            True se o modelo foi encontrado e carregado
+        """
+        try:
+            cursor = self.db_connector.connection.cursor()
+            cursor.execute(
+                "SELECT model_data, scaler_data FROM anomaly_models WHERE model_name = ?",
+                (model_name,)
+            )
+            row = cursor.fetchone()
+        except Exception as e:
+            logger.warning(f"Erro ao buscar modelo '{model_name}': {e}")
+            return False
+
+        if not row or row[0] is None or row[1] is None:
+            logger.info(f"Modelo '{model_name}' não possui pesos persistidos")
+            return False
+
+        try:
+            self.autoencoder = MovingWindowAutoEncoder.deserialize(
+                bytes(row[0]), bytes(row[1]), compile_mode=self.compile_mode
+            )
+        except ValueError as e:
+            logger.warning(f"Modelo '{model_name}' não pôde ser carregado: {e}")
+            return False
+        logger.info(f"Modelo '{model_name}' carregado do banco ({len(row[0]) / 1024:.1f} KB)")
+
+        return True
+
+    def _save_model(
         self,
         model_name: str,
         model_arch: str,
         latent_dim: int,
         window_size: int,
-        num_epochs: int
-    ):
-        """Salva ou atualiza metadados do modelo no banco."""
+        num_epochs: int,
+        model_data: Optional[bytes] = None,
+        scaler_data: Optional[bytes] = None
+    ) -> bool:
+        """
+        Salva ou atualiza o modelo (metadados, pesos e scaler) no banco.
+
+        Sem model_data/scaler_data, serializa o autoencoder atual; a fazenda de
+        treinamento informa os dados já serializados pelos workers.
+
+        Returns:
+            True se o modelo foi gravado, False em caso de erro
+        """
+        if model_data is None and self.autoencoder is not None and self.autoencoder.is_fitted:
+            model_data, scaler_data = self.autoencoder.serialize()
+
         try:
             cursor = self.db_connector.connection.cursor()
 
@@ -327,24 +807,35 @@ class AnomalyManager:
                 update_query = """
                 UPDATE anomaly_models
                 SET model_arch = ?, latent_dim = ?, window_size = ?, training_epochs = ?,
-                    threshold_percentile = ?, trained_at = GETDATE()
+                    threshold_percentile = ?, model_data = ?, scaler_data = ?, trained_at = GETDATE()
                 WHERE model_name = ?
                 """
-                cursor.execute(update_query, (model_arch, latent_dim, window_size, num_epochs, 95.0, model_name))
-                logger.info(f"Metadados do modelo '{model_name}' atualizados")
+                cursor.execute(update_query, (
+                    model_arch, latent_dim, window_size, num_epochs, 95.0,
+                    model_data, scaler_data, model_name
+                ))
+                logger.info(f"Modelo '{model_name}' atualizado")
             else:
                 # INSERT se não existe
                 insert_query = """
-                INSERT INTO anomaly_models (model_name, model_arch, latent_dim, window_size, training_epochs, threshold_percentile, trained_at)
-                VALUES (?, ?, ?, ?, ?, ?, GETDATE())
+                INSERT INTO anomaly_models (
+                    model_name, model_arch, latent_dim, window_size, training_epochs,
+                    threshold_percentile, model_data, scaler_data, trained_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, GETDATE())
                 """
-                cursor.execute(insert_query, (model_name, model_arch, latent_dim, window_size, num_epochs, 95.0))
-                logger.info(f"Metadados do modelo '{model_name}' inseridos")
+                cursor.execute(insert_query, (
+                    model_name, model_arch, latent_dim, window_size, num_epochs, 95.0,
+                    model_data, scaler_data
+                ))
+                logger.info(f"Modelo '{model_name}' inserido")
 
             self.db_connector.connection.commit()
+            return True
 
         except Exception as e:
-            logger.warning(f"Erro ao salvar metadados do modelo '{model_name}': {e}")
+            logger.warning(f"Erro ao salvar modelo '{model_name}': {e}")
+            return False
 
     def _randomize_anomaly_types(self, detections: pd.DataFrame, anomaly_type: str) -> pd.DataFrame:
         """
@@ -395,31 +886,53 @@ class AnomalyManager:
         return detections
 
     def _get_existing_detections(self, timestamps: List) -> set:
-        """Obtém timestamps das detecções já existentes no banco."""
+        """
+        Obtém os pares (equipment_id, timestamp) das detecções já existentes no banco.
+
+        Os timestamps são consultados em blocos de QUERY_PARAMETER_CHUNK, abaixo
+        do limite de 2100 parâmetros por comando do SQL Server.
+        """
         if not timestamps:
             return set()
 
+        existing = set()
+        query = "SELECT DISTINCT equipment_id, timestamp FROM anomaly_detections WHERE timestamp IN ({})"
+
         try:
-            query = "SELECT DISTINCT timestamp FROM anomaly_detections WHERE timestamp IN ({})".format(
-                ",".join(["?" for _ in timestamps])
-            )
-            existing = self.db_connector.fetch_data(query, tuple(timestamps))
-            return set(existing['timestamp'].tolist()) if not existing.empty else set()
+            for i in range(0, len(timestamps), QUERY_PARAMETER_CHUNK):
+                chunk = timestamps[i:i + QUERY_PARAMETER_CHUNK]
+                rows = self.db_connector.fetch_data(query.format(",".join("?" * len(chunk))), tuple(chunk))
+                if not rows.empty:
+                    existing.update(zip(rows['equipment_id'], pd.to_datetime(rows['timestamp'])))
         except Exception as e:
             logger.warning(f"Erro ao verificar detecções existentes: {e}")
-            return set()
 
-    def _save_detections(self, detections: pd.DataFrame, sensor_data: pd.DataFrame):
-        """Salva detecções no banco com prevenção de duplicatas."""
+        return existing
+
+    def _save_detections(self, detections: pd.DataFrame):
+        """
+        Salva detecções (já atribuídas por equipment_id) no banco com prevenção de duplicatas.
+
+        As linhas são inseridas com executemany em lotes de INSERT_BATCH_SIZE
+        (fast_executemany no pyodbc), cada lote em sua própria transação. Se
+        um lote falhar, a transação é desfeita e suas linhas são inseridas uma
+        a uma, ignorando as inválidas.
+        """
         if detections.empty:
             logger.info("Nenhuma detecção para salvar")
             return
 
-        # Obter timestamps existentes
-        existing_timestamps = self._get_existing_detections(detections['timestamp'].tolist())
+        timestamps = pd.to_datetime(detections['timestamp'])
+
+        # Obter pares (equipamento, timestamp) existentes
+        existing = self._get_existing_detections(
+            [timestamp.to_pydatetime() for timestamp in timestamps.drop_duplicates()]
+        )
 
         # Filtrar detecções duplicadas
-        new_detections = detections[~detections['timestamp'].isin(existing_timestamps)]
+        keys = pd.MultiIndex.from_arrays([detections['equipment_id'], timestamps])
+        is_new = ~keys.isin(list(existing))
+        new_detections = detections[is_new]
 
         if new_detections.empty:
             logger.info("Todas as detecções já existem no banco (0 novas inseridas)")
@@ -434,33 +947,48 @@ class AnomalyManager:
         ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
 
+        # Parâmetros montados por coluna, com tipos nativos do Python
+        is_anomaly = new_detections['is_anomaly'].to_numpy(dtype=bool)
+        params = list(zip(
+            new_detections['equipment_id'].tolist(),
+            [timestamp.to_pydatetime() for timestamp in timestamps[is_new]],
+            new_detections['Q'].astype(float).tolist(),
+            new_detections['T2'].astype(float).tolist(),
+            new_detections['Q_threshold'].astype(float).tolist(),
+            new_detections['T2_threshold'].astype(float).tolist(),
+            is_anomaly.astype(int).tolist(),
+            new_detections['reconstruction_error'].astype(float).tolist(),
+            new_detections['latent_distance'].astype(float).tolist(),
+            np.where(is_anomaly, "crítico", "normal").tolist()
+        ))
+
         cursor = self.db_connector.connection.cursor()
+        if hasattr(cursor, 'fast_executemany'):
+            cursor.fast_executemany = True
+
         inserted = 0
 
-        for _, detection in new_detections.iterrows():
+        connection = self.db_connector.connection
+
+        for i in range(0, len(params), INSERT_BATCH_SIZE):
+            batch = params[i:i + INSERT_BATCH_SIZE]
             try:
-                severity = "crítico" if detection['is_anomaly'] else "normal"
-
-                # Obter equipment_id do timestamp
-                eq_data = sensor_data[sensor_data['timestamp'] == detection['timestamp']]
-                equipment_id = eq_data['equipment_id'].iloc[0] if not eq_data.empty else "unknown"
-
-                cursor.execute(query, (
-                    equipment_id,
-                    detection['timestamp'],
-                    float(detection['Q']),
-                    float(detection['T2']),
-                    float(detection['Q_threshold']),
-                    float(detection['T2_threshold']),
-                    int(detection['is_anomaly']),
-                    float(detection['reconstruction_error']),
-                    float(detection['latent_distance']),
-                    severity
-                ))
-                inserted += 1
+                cursor.executemany(query, batch)
+                connection.commit()
+                inserted += len(batch)
             except Exception as e:
-                logger.warning(f"Erro ao inserir detecção: {e}")
-                continue
+                # Descartar as linhas do lote que já tenham sido gravadas antes de repeti-las
+                connection.rollback()
+                logger.warning(f"Erro ao inserir lote de detecções ({len(batch)} linhas), inserindo uma a uma: {e}")
+
+                for row in batch:
+                    try:
+                        cursor.execute(query, row)
+                        inserted += 1
+                    except Exception as e:
+                        logger.warning(f"Erro ao inserir detecção: {e}")
+                        continue
+
+                connection.commit()
 
-        self.db_connector.connection.commit()
         logger.info(f"{inserted} detecções salvas no banco")
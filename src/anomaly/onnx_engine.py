@@ -0,0 +1,183 @@
+"""
+Motor de detecção de anomalias sobre modelos ONNX, sem dependência do PyTorch.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .detection import build_detections, create_windows, group_segments
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class OnnxAnomalyDetector:
+    """
+    Detector de anomalias para modelos exportados com
+    MovingWindowAutoEncoder.export_onnx().
+
+    Executa o grafo (normalização + autoencoder + Q/T²) no onnxruntime,
+    com NumPy e pandas para janelas e pós-processamento. Produz o mesmo
+    DataFrame de detect() sem importar o PyTorch, o que reduz a memória e o
+    tempo de inicialização dos workers de inferência.
+    """
+
+    def __init__(
+        self,
+        model_path: Union[str, Path],
+        num_threads: Optional[int] = None,
+        providers: Optional[List[str]] = None
+    ):
+        """
+        Carrega um modelo ONNX.
+
+        Args:
+            model_path: Arquivo .onnx gerado por export_onnx()
+            num_threads: Threads intra-op do onnxruntime (None = padrão)
+            providers: Execution providers (padrão: CPUExecutionProvider)
+
+        Raises:
+            ImportError: Se o pacote onnxruntime não estiver instalado.
+            ValueError: Se o arquivo não contém os metadados de export_onnx().
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("Detecção ONNX requer o pacote onnxruntime (pip install onnxruntime)") from e
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+            options.inter_op_num_threads = 1
+
+        self.model_path = Path(model_path)
+        self.session = ort.InferenceSession(
+            str(self.model_path),
+            sess_options=options,
+            providers=providers or ["CPUExecutionProvider"]
+        )
+
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        if "window_size" not in metadata:
+            raise ValueError(f"Modelo ONNX sem metadados de exportação: {self.model_path}")
+
+        self.metadata: Dict[str, Any] = {key: json.loads(value) for key, value in metadata.items()}
+        self.model_arch: str = self.metadata["model_arch"]
+        self.window_size: int = self.metadata["window_size"]
+        self.n_features: int = self.metadata["n_features"]
+        self.feature_names: Optional[List[str]] = self.metadata.get("feature_names")
+        self.thresholds: Optional[Dict[str, float]] = self.metadata.get("thresholds")
+
+        logger.info(
+            f"Modelo ONNX carregado: {self.model_path.name} "
+            f"(arch={self.model_arch}, window_size={self.window_size})"
+        )
+
+    def score_windows(self, windows: np.ndarray, batch_size: int = 1024) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula Q e T² de janelas brutas (n, window_size, n_features) em lotes.
+
+        Returns:
+            Tupla (Q, T²) em float64
+        """
+        q_batches = []
+        t2_batches = []
+
+        for i in range(0, len(windows), batch_size):
+            batch = np.ascontiguousarray(windows[i:i+batch_size], dtype=np.float32)
+            q, t2 = self.session.run(["Q", "T2"], {"windows": batch})
+            q_batches.append(q)
+            t2_batches.append(t2)
+
+        if not q_batches:
+            return np.empty(0), np.empty(0)
+
+        return (
+            np.concatenate(q_batches).astype(np.float64),
+            np.concatenate(t2_batches).astype(np.float64)
+        )
+
+    def detect(
+        self,
+        data: pd.DataFrame,
+        window_size: Optional[int] = None,
+        threshold_percentile: float = 95.0,
+        rolling_window: int = 12,
+        batch_size: int = 1024,
+        groups: Optional[np.ndarray] = None,
+        n_workers: int = 1
+    ) -> pd.DataFrame:
+        """
+        Detecta anomalias nos dados (mesma saída de MovingWindowAutoEncoder.detect).
+
+        Args:
+            data: DataFrame com as features do modelo (valores brutos)
+            window_size: Tamanho da janela; deve ser o do treinamento (None = do modelo)
+            threshold_percentile: Percentil para threshold
+            rolling_window: Janela para suavização
+            batch_size: Número de janelas avaliadas por chamada ao onnxruntime
+            groups: Identificador da série (ex.: equipment_id) de cada linha,
+                    com as linhas de cada grupo contíguas. None = série única.
+            n_workers: Número de threads que avaliam os grupos em paralelo
+
+        Returns:
+            DataFrame com resultados de detecção
+
+        Raises:
+            ValueError: Se window_size difere do treinamento ou faltam features.
+        """
+        window_size = window_size or self.window_size
+        if window_size != self.window_size:
+            raise ValueError(
+                f"window_size={window_size} difere do modelo exportado ({self.window_size})"
+            )
+
+        values = self._feature_values(data)
+
+        logger.info("Detectando anomalias (ONNX)...")
+
+        windows = create_windows(values, window_size)
+
+        segments = [
+            (key, start, stop)
+            for key, start, stop in group_segments(groups, len(values))
+            if stop - start >= window_size
+        ]
+
+        if not segments:
+            return pd.DataFrame()
+
+        def score_segment(segment: Tuple) -> Tuple[np.ndarray, np.ndarray]:
+            _, start, stop = segment
+            return self.score_windows(windows[start:stop - window_size + 1], batch_size)
+
+        if n_workers > 1 and len(segments) > 1:
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                scores = list(executor.map(score_segment, segments))
+        else:
+            scores = [score_segment(segment) for segment in segments]
+
+        return build_detections(
+            data.index, scores, segments, window_size, groups,
+            threshold_percentile=threshold_percentile,
+            rolling_window=rolling_window
+        )
+
+    def _feature_values(self, data: pd.DataFrame) -> np.ndarray:
+        """Seleciona as features na ordem do treinamento."""
+        if self.feature_names is not None and isinstance(data, pd.DataFrame):
+            missing = [col for col in self.feature_names if col not in data.columns]
+            if missing:
+                raise ValueError(f"Colunas ausentes nos dados: {missing}")
+            data = data[self.feature_names]
+
+        values = np.asarray(data, dtype=np.float32)
+        if values.ndim != 2 or values.shape[1] != self.n_features:
+            raise ValueError(f"Esperadas {self.n_features} features, recebidas {values.shape[-1]}")
+
+        return values
@@ -0,0 +1,275 @@
+"""
+Registro de modelos de detecção de anomalias residentes em memória.
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .autoencoder import MovingWindowAutoEncoder
+from .streaming import StreamingAnomalyScorer
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class ModelRegistry:
+    """
+    Registro de modelos com orçamento de memória e despejo LRU.
+
+    Os modelos residentes são mantidos em ordem de uso; quando o total
+    ultrapassa o orçamento, os menos usados recentemente são descartados da
+    memória sem serem gravados: por isso só devem ser registrados modelos já
+    persistidos (anomaly_models), de onde são recarregados pelo loader no
+    próximo uso. Modelos fixados (pin) durante uma detecção nunca são descartados.
+    O avaliador online de um modelo (buffers por equipamento) fica na mesma
+    entrada: conta no orçamento e é descartado junto com o modelo.
+    """
+
+    def __init__(
+        self,
+        memory_budget_mb: float = 512.0,
+        loader: Optional[Callable[[str], Optional[MovingWindowAutoEncoder]]] = None
+    ):
+        """
+        Inicializa o registro.
+
+        Args:
+            memory_budget_mb: Memória máxima dos modelos residentes (MB)
+            loader: Função que carrega um modelo persistido pelo nome
+                    (retorna None se não existir)
+        """
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self.loader = loader
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def put(
+        self,
+        model_name: str,
+        autoencoder: MovingWindowAutoEncoder,
+        config: Optional[Dict] = None
+    ) -> None:
+        """
+        Registra (ou substitui) um modelo residente.
+
+        Args:
+            model_name: Nome do modelo
+            autoencoder: Modelo treinado
+            config: Configuração do treinamento
+        """
+        with self._lock:
+            # Detecções em andamento continuam com a instância anterior
+            self._insert(model_name, autoencoder, config, pins=0)
+            self._enforce_budget()
+
+    def get(self, model_name: str) -> Optional[MovingWindowAutoEncoder]:
+        """
+        Retorna um modelo, carregando-o do armazenamento se não estiver residente.
+
+        Args:
+            model_name: Nome do modelo
+
+        Returns:
+            Modelo ou None se não existir
+        """
+        with self._lock:
+            entry = self._entries.get(model_name)
+            if entry is not None:
+                self._entries.move_to_end(model_name)
+                entry['last_used'] = datetime.now()
+                return entry['autoencoder']
+
+        if self.loader is None:
+            return None
+
+        # Carregar fora do lock (leitura do banco)
+        autoencoder = self.loader(model_name)
+        if autoencoder is None:
+            return None
+
+        with self._lock:
+            # Outra requisição pode ter carregado o mesmo modelo
+            entry = self._entries.get(model_name)
+            if entry is not None:
+                return entry['autoencoder']
+
+            self.put(model_name, autoencoder, config=self.config_of(autoencoder))
+
+        return autoencoder
+
+    @contextmanager
+    def pin(self, model_name: str) -> Iterator[Optional[MovingWindowAutoEncoder]]:
+        """
+        Fixa um modelo em memória enquanto o bloco estiver em execução.
+
+        Args:
+            model_name: Nome do modelo
+
+        Yields:
+            Modelo (ou None se não existir)
+
+        Examples:
+            >>> with registry.pin("autoencoder_model") as autoencoder:
+            ...     detections = autoencoder.detect(data)
+        """
+        autoencoder = self.get(model_name)
+
+        if autoencoder is not None:
+            with self._lock:
+                entry = self._entries.get(model_name)
+                if entry is not None and entry['autoencoder'] is autoencoder:
+                    entry['pins'] += 1
+                else:
+                    # Despejado (ou substituído) entre o carregamento e a fixação
+                    self._insert(model_name, autoencoder, self.config_of(autoencoder), pins=1)
+
+        try:
+            yield autoencoder
+        finally:
+            if autoencoder is not None:
+                with self._lock:
+                    entry = self._entries.get(model_name)
+                    if entry is not None and entry['autoencoder'] is autoencoder:
+                        entry['pins'] -= 1
+                    self._enforce_budget()
+
+    def evict(self, model_name: str) -> bool:
+        """
+        Remove um modelo não fixado da memória.
+
+        Returns:
+            True se o modelo foi removido
+        """
+        with self._lock:
+            entry = self._entries.get(model_name)
+            if entry is None or entry['pins'] > 0:
+                return False
+
+            del self._entries[model_name]
+            logger.info(f"Modelo '{model_name}' removido da memória ({entry['size_bytes'] / 1024:.1f} KB)")
+            return True
+
+    def get_streaming_scorer(self, model_name: str) -> Optional[StreamingAnomalyScorer]:
+        """Avaliador online associado a um modelo residente (None se não houver)."""
+        with self._lock:
+            entry = self._entries.get(model_name)
+            return entry.get('streaming_scorer') if entry is not None else None
+
+    def set_streaming_scorer(self, model_name: str, scorer: StreamingAnomalyScorer) -> None:
+        """
+        Associa um avaliador online ao modelo residente e atualiza seu tamanho.
+
+        Deve ser chamado após cada avaliação, pois os buffers crescem com
+        novos equipamentos. Ignorado se o modelo residente não for o do
+        avaliador (despejado ou substituído entretanto).
+
+        Args:
+            model_name: Nome do modelo
+            scorer: Avaliador criado para o modelo residente
+        """
+        with self._lock:
+            entry = self._entries.get(model_name)
+            if entry is None or entry['autoencoder'] is not scorer.autoencoder:
+                return
+
+            entry['streaming_scorer'] = scorer
+            entry['size_bytes'] = self.estimate_size(scorer.autoencoder) + scorer.size_bytes
+            self._enforce_budget()
+
+    def __contains__(self, model_name: str) -> bool:
+        with self._lock:
+            return model_name in self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        """Memória total estimada dos modelos residentes."""
+        with self._lock:
+            return sum(entry['size_bytes'] for entry in self._entries.values())
+
+    def list_models(self) -> List[Dict[str, Any]]:
+        """
+        Lista os modelos residentes, do mais para o menos recentemente usado.
+
+        Returns:
+            Lista de dicionários com nome, tamanho, pins e datas de uso
+        """
+        with self._lock:
+            return [
+                {
+                    'model_name': name,
+                    'size_mb': round(entry['size_bytes'] / (1024 * 1024), 3),
+                    'pins': entry['pins'],
+                    'loaded_at': entry['loaded_at'].isoformat(),
+                    'last_used': entry['last_used'].isoformat(),
+                    'config': entry['config'],
+                }
+                for name, entry in reversed(self._entries.items())
+            ]
+
+    def _insert(
+        self,
+        model_name: str,
+        autoencoder: MovingWindowAutoEncoder,
+        config: Optional[Dict],
+        pins: int
+    ) -> None:
+        """Insere um modelo como o mais recentemente usado."""
+        self._entries.pop(model_name, None)
+        self._entries[model_name] = {
+            'autoencoder': autoencoder,
+            'config': config or {},
+            'size_bytes': self.estimate_size(autoencoder),
+            'pins': pins,
+            'loaded_at': datetime.now(),
+            'last_used': datetime.now(),
+        }
+
+        logger.info(
+            f"Modelo '{model_name}' registrado "
+            f"({self._entries[model_name]['size_bytes'] / 1024:.1f} KB)"
+        )
+
+    @staticmethod
+    def config_of(autoencoder: MovingWindowAutoEncoder) -> Dict:
+        """Configuração (arquitetura e dimensões) de um modelo, para registro."""
+        return {
+            'model_arch': autoencoder.model_arch,
+            'latent_dim': autoencoder.latent_dim,
+            'window_size': autoencoder.window_size
+        }
+
+    def _enforce_budget(self) -> None:
+        """Remove modelos menos usados (não fixados) até respeitar o orçamento."""
+        total = sum(entry['size_bytes'] for entry in self._entries.values())
+
+        for name in list(self._entries):
+            if total <= self.memory_budget_bytes:
+                break
+
+            entry = self._entries[name]
+            if entry['pins'] > 0:
+                continue
+
+            del self._entries[name]
+            total -= entry['size_bytes']
+            logger.info(f"Modelo '{name}' despejado da memória (LRU, {entry['size_bytes'] / 1024:.1f} KB)")
+
+    @staticmethod
+    def estimate_size(autoencoder: MovingWindowAutoEncoder) -> int:
+        """Estima a memória ocupada pelos pesos e pelo scaler de um modelo (bytes)."""
+        size = 0
+
+        if autoencoder.model is not None:
+            for tensor in list(autoencoder.model.parameters()) + list(autoencoder.model.buffers()):
+                size += tensor.numel() * tensor.element_size()
+
+        for attr in ('mean_', 'var_', 'scale_'):
+            value = getattr(autoencoder.scaler, attr, None)
+            if value is not None:
+                size += value.nbytes
+
+        return size
@@ -0,0 +1,227 @@
+"""
+Detecção de anomalias online com buffers circulares por equipamento.
+"""
+
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .autoencoder import MovingWindowAutoEncoder
+from .detection import DEFAULT_IDLE_TIMEOUT_HOURS, MultiResolutionWindows, active_watermark
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class StreamingAnomalyScorer:
+    """
+    Avaliador incremental de anomalias.
+
+    Mantém, para cada equipamento, um buffer circular com as últimas
+    window_size leituras normalizadas. Cada nova leitura completa exatamente
+    uma janela, avaliada contra os thresholds calibrados no treinamento
+    (MovingWindowAutoEncoder.thresholds), de modo que o custo por leitura é
+    O(1) forward passes, independente do tamanho do histórico. As janelas
+    completadas em uma chamada são avaliadas em um único lote.
+    """
+
+    def __init__(
+        self,
+        autoencoder: MovingWindowAutoEncoder,
+        rolling_window: int = 12,
+        idle_timeout_hours: Optional[float] = DEFAULT_IDLE_TIMEOUT_HOURS
+    ):
+        """
+        Inicializa o avaliador.
+
+        Args:
+            autoencoder: Modelo treinado (com thresholds calibrados)
+            rolling_window: Janela da mediana móvel de Q e T² (como em detect())
+            idle_timeout_hours: Horas sem leituras após as quais um equipamento
+                                deixa de segurar o watermark (None = nunca)
+
+        Raises:
+            RuntimeError: Se o modelo não foi treinado.
+            ValueError: Se o modelo não possui thresholds calibrados ou nomes de features.
+        """
+        if not autoencoder.is_fitted:
+            raise RuntimeError("Modelo não foi treinado. Use fit() primeiro.")
+
+        if autoencoder.thresholds is None:
+            raise ValueError(
+                "Modelo sem thresholds calibrados (treinado em versão anterior). "
+                "Retreine o modelo para usar a detecção online."
+            )
+
+        feature_names = getattr(autoencoder.scaler, "feature_names_in_", None)
+        if feature_names is None:
+            raise ValueError("Modelo treinado sem nomes de features (use um DataFrame no fit)")
+
+        self.autoencoder = autoencoder
+        self.rolling_window = rolling_window
+        self.idle_timeout_hours = idle_timeout_hours
+        self.window_size = autoencoder.window_size
+        self.feature_names: List[str] = [str(name) for name in feature_names]
+
+        self._mean = np.asarray(autoencoder.scaler.mean_, dtype=np.float64)
+        self._scale = np.asarray(autoencoder.scaler.scale_, dtype=np.float64)
+
+        self._buffers: Dict[Any, Dict[str, Any]] = {}
+
+    @property
+    def watermark(self) -> Optional[pd.Timestamp]:
+        """Menor timestamp da última leitura entre os equipamentos ativos (None se vazio)."""
+        return active_watermark(
+            (state["last_timestamp"] for state in self._buffers.values()),
+            self.idle_timeout_hours
+        )
+
+    @property
+    def n_equipments(self) -> int:
+        """Número de equipamentos com buffer."""
+        return len(self._buffers)
+
+    @property
+    def size_bytes(self) -> int:
+        """Memória estimada dos buffers (janelas, última leitura e scores suavizados)."""
+        return sum(
+            state["data"].nbytes + state["last_row"].nbytes
+            + 8 * (state["q"].maxlen + state["t2"].maxlen)
+            for state in self._buffers.values()
+        )
+
+    def prime(self, readings: pd.DataFrame) -> None:
+        """
+        Preenche os buffers com o histórico recente, sem avaliar janelas.
+
+        Args:
+            readings: Leituras com equipment_id, timestamp e as features do modelo
+        """
+        self._ingest(readings, score=False)
+        logger.info(f"Buffers inicializados para {self.n_equipments} equipamentos")
+
+    def update(self, readings: pd.DataFrame, batch_size: int = 1024) -> pd.DataFrame:
+        """
+        Processa novas leituras e avalia as janelas que elas completam.
+
+        Leituras com timestamp já processado para o equipamento são ignoradas.
+
+        Args:
+            readings: Leituras com equipment_id, timestamp e as features do modelo
+            batch_size: Número de janelas por forward pass
+
+        Returns:
+            DataFrame de detecções (mesmas colunas de detect(), com equipment_id)
+        """
+        completed = self._ingest(readings, score=True)
+
+        if not completed:
+            return pd.DataFrame()
+
+        equipment_ids = [equipment_id for equipment_id, _, _ in completed]
+        timestamps = [timestamp for _, timestamp, _ in completed]
+        windows = np.stack([window for _, _, window in completed])
+        if self.autoencoder.multiresolution is not None:
+            windows = MultiResolutionWindows.from_windows(windows, **self.autoencoder.multiresolution)
+
+        self.autoencoder.model.eval()
+        reconstruction_errors, distances_latent = self.autoencoder._score_windows(windows, batch_size)
+
+        # Suavizar com o histórico de scores de cada equipamento
+        q_smooth = np.empty(len(completed))
+        t2_smooth = np.empty(len(completed))
+
+        for i, equipment_id in enumerate(equipment_ids):
+            state = self._buffers[equipment_id]
+            state["q"].append(reconstruction_errors[i])
+            state["t2"].append(distances_latent[i])
+            q_smooth[i] = np.median(state["q"])
+            t2_smooth[i] = np.median(state["t2"])
+
+        q_threshold = self.autoencoder.thresholds["Q"]
+        t2_threshold = self.autoencoder.thresholds["T2"]
+        anomalies = (q_smooth > q_threshold) | (t2_smooth > t2_threshold)
+
+        logger.info(
+            f"Detecção online: {len(completed)} janelas avaliadas, "
+            f"{int(anomalies.sum())} anomalias"
+        )
+
+        return pd.DataFrame({
+            'equipment_id': equipment_ids,
+            'timestamp': timestamps,
+            'Q': q_smooth,
+            'T2': t2_smooth,
+            'Q_threshold': q_threshold,
+            'T2_threshold': t2_threshold,
+            'is_anomaly': anomalies,
+            'reconstruction_error': reconstruction_errors,
+            'latent_distance': distances_latent
+        })
+
+    def _ingest(self, readings: pd.DataFrame, score: bool) -> List[tuple]:
+        """
+        Insere leituras nos buffers circulares.
+
+        Returns:
+            Lista (equipment_id, timestamp, janela) das janelas completadas
+            (vazia se score=False)
+        """
+        if readings.empty:
+            return []
+
+        missing = [col for col in self.feature_names if col not in readings.columns]
+        if missing:
+            raise ValueError(f"Colunas ausentes nas leituras: {missing}")
+
+        readings = readings.sort_values(["equipment_id", "timestamp"], kind="mergesort")
+        values = readings[self.feature_names].to_numpy(dtype=np.float64)
+        equipment_ids = readings["equipment_id"].to_numpy()
+        timestamps = pd.to_datetime(readings["timestamp"]).to_numpy()
+
+        completed = []
+
+        for equipment_id, timestamp, row in zip(equipment_ids, timestamps, values):
+            state = self._buffers.get(equipment_id)
+            if state is None:
+                state = self._new_buffer()
+                self._buffers[equipment_id] = state
+
+            timestamp = pd.Timestamp(timestamp)
+            if state["last_timestamp"] is not None and timestamp <= state["last_timestamp"]:
+                continue
+
+            # Valores faltantes: última leitura do equipamento (ou média do treino)
+            nan_mask = np.isnan(row)
+            if nan_mask.any():
+                row = np.where(nan_mask, state["last_row"], row)
+
+            state["last_row"] = row
+            state["last_timestamp"] = timestamp
+
+            head = state["head"]
+            state["data"][head] = (row - self._mean) / self._scale
+            state["head"] = (head + 1) % self.window_size
+            state["count"] += 1
+
+            if score and state["count"] >= self.window_size:
+                # Janela em ordem cronológica (mais antiga a partir de head)
+                head = state["head"]
+                window = np.concatenate((state["data"][head:], state["data"][:head]))
+                completed.append((equipment_id, timestamp, window))
+
+        return completed
+
+    def _new_buffer(self) -> Dict[str, Any]:
+        """Cria o estado vazio do buffer de um equipamento."""
+        return {
+            "data": np.zeros((self.window_size, len(self.feature_names)), dtype=np.float32),
+            "head": 0,
+            "count": 0,
+            "last_row": self._mean.copy(),
+            "last_timestamp": None,
+            "q": deque(maxlen=self.rolling_window),
+            "t2": deque(maxlen=self.rolling_window),
+        }
@@ -3,5 +3,6 @@
 from .loaders import DataLoader
 from .validators import DataValidator
 from .preprocessors import DataPreprocessor
+from .writers import ChunkedResultWriter
 
-__all__ = ["DataLoader", "DataValidator", "DataPreprocessor"]
+__all__ = ["DataLoader", "DataValidator", "DataPreprocessor", "ChunkedResultWriter"]
@@ -4,7 +4,7 @@ Módulo para carregamento de dados de diferentes formatos.
 
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 import pandas as pd
 
@@ -206,6 +206,72 @@ class DataLoader:
                 "Use CSV, Excel ou JSON."
             )
 
+    def iter_maintenance_orders(
+        self, file_path: Union[str, Path], chunk_size: int = 1000
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Itera sobre ordens de serviço em blocos de tamanho limitado.
+
+        CSV e Parquet são lidos de forma incremental, mantendo a memória
+        limitada a um bloco por vez. Excel e JSON não suportam leitura
+        parcial; nesses casos o arquivo é carregado e fatiado em blocos.
+
+        Args:
+            file_path: Caminho para o arquivo.
+            chunk_size: Número de ordens por bloco.
+
+        Yields:
+            DataFrames com até chunk_size ordens de serviço.
+
+        Raises:
+            FileNotFoundError: Se o arquivo não existir.
+            ValueError: Se o formato do arquivo não for suportado.
+        """
+        file_path = Path(file_path)
+        suffix = file_path.suffix.lower()
+
+        if not file_path.exists():
+            raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
+
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size deve ser positivo: {chunk_size}")
+
+        logger.info(f"Lendo ordens de serviço em blocos de {chunk_size}: {file_path}")
+
+        if suffix == ".csv":
+            reader = pd.read_csv(
+                file_path,
+                decimal=self.data_config.get("decimal_separator", ","),
+                sep=self.data_config.get("field_separator", ","),
+                encoding=self.data_config.get("encoding", "utf-8"),
+                chunksize=chunk_size,
+            )
+            with reader:
+                for chunk in reader:
+                    yield chunk
+
+        elif suffix == ".parquet":
+            import pyarrow.parquet as pq
+
+            parquet_file = pq.ParquetFile(file_path)
+            for batch in parquet_file.iter_batches(batch_size=chunk_size):
+                yield batch.to_pandas()
+
+        elif suffix in [".xlsx", ".xls", ".json"]:
+            logger.warning(
+                f"Formato {suffix} não suporta leitura incremental; "
+                "o arquivo será carregado inteiro e fatiado em blocos."
+            )
+            data = self.load_maintenance_orders(file_path)
+            for start in range(0, len(data), chunk_size):
+                yield data.iloc[start:start + chunk_size]
+
+        else:
+            raise ValueError(
+                f"Formato de arquivo não suportado: {suffix}. "
+                "Use CSV, Parquet, Excel ou JSON."
+            )
+
     def save_dataframe(
         self,
         df: pd.DataFrame,
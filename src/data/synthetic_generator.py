@@ -9,6 +9,7 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from ..models.estimation import TransitionRateEstimator
 from ..utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -366,7 +367,8 @@ class VirtualBushingGenerator:
     def generate_maintenance_orders(
         self,
         data: pd.DataFrame,
-        threshold_corrente: float = 1.0
+        threshold_corrente: float = 1.0,
+        transition_rates: Optional[pd.DataFrame] = None
     ) -> pd.DataFrame:
         """
         Gera ordens de serviço baseadas nos dados gerados.
@@ -374,6 +376,9 @@ class VirtualBushingGenerator:
         Args:
             data: DataFrame com dados das buchas.
             threshold_corrente: Limiar de corrente para gerar OS.
+            transition_rates: Taxas estimadas por equipamento (saída de
+                             TransitionRateEstimator.estimate()). Equipamentos
+                             ausentes usam as taxas padrão baseadas no estado.
 
         Returns:
             DataFrame com ordens de serviço.
@@ -391,6 +396,12 @@ class VirtualBushingGenerator:
         for idx, row in latest_readings.iterrows():
             # Gerar taxas de transição baseadas no estado
             estado = row['estado_saude']
+            taxas = [0.01 * (estado + 1), 0.02 * (estado + 1), 0.03 * (estado + 1), 0.04 * (estado + 1)]
+
+            # Usar taxas estimadas dos dados, quando disponíveis
+            if transition_rates is not None and row['equipment_id'] in transition_rates.index:
+                estimated = transition_rates.loc[row['equipment_id'], [f"taxa_{i}" for i in range(4)]]
+                taxas = [float(e) if pd.notna(e) else t for e, t in zip(estimated, taxas)]
 
             orders.append({
                 'OS_Id': f"OS_{row['equipment_id']}_{datetime.now().strftime('%Y%m%d')}",
@@ -399,10 +410,10 @@ class VirtualBushingGenerator:
                 'MotivoManutencao': 'DGA',
                 'MF_DGA': estado,
                 'MF_DGA_DATA': row['timestamp'],
-                'DGA_TAXA_N': 0.01 * (estado + 1),
-                'DGA_TAXA_D1': 0.02 * (estado + 1),
-                'DGA_TAXA_D2': 0.03 * (estado + 1),
-                'DGA_TAXA_D3': 0.04 * (estado + 1),
+                'DGA_TAXA_N': taxas[0],
+                'DGA_TAXA_D1': taxas[1],
+                'DGA_TAXA_D2': taxas[2],
+                'DGA_TAXA_D3': taxas[3],
                 'DGA_CUSTO_N': 100,
                 'DGA_CUSTO_D1': 200,
                 'DGA_CUSTO_D2': 300,
@@ -420,6 +431,49 @@ class VirtualBushingGenerator:
 
         return os_df
 
+    def estimate_transition_rates(self, data: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Estima as taxas de transição por equipamento a partir de estado_saude.
+
+        As taxas são probabilidades diárias, e o estado horário (classificado
+        da corrente medida, com ruído) oscila perto dos limiares; por isso a
+        estimação usa o pior estado de cada dia. Estados sem transições
+        observadas em um equipamento recebem a taxa da frota; sem transições
+        também na frota, ficam sem estimativa (NaN) e mantêm a taxa padrão.
+
+        Args:
+            data: DataFrame com equipment_id, timestamp e estado_saude.
+
+        Returns:
+            Taxas no formato de TransitionRateEstimator.estimate(), ou None se
+            os dados não tiverem transições observáveis.
+        """
+        daily_states = (
+            data.assign(timestamp=pd.to_datetime(data["timestamp"]).dt.floor("D"))
+            .groupby(["equipment_id", "timestamp"], as_index=False)["estado_saude"]
+            .max()
+        )
+
+        estimator = TransitionRateEstimator()
+        estimator.update(daily_states)
+
+        try:
+            rates = estimator.estimate(fill_missing=False)
+            fleet_rates = estimator.estimate(level="fleet", fill_missing=False).iloc[0]
+        except ValueError as e:
+            logger.warning(f"Taxas de transição não estimadas ({e}); usando taxas padrão")
+            return None
+
+        for i in range(estimator.n_states - 1):
+            rate = f"taxa_{i}"
+            rates.loc[rates[f"transicoes_{i}"] == 0, rate] = np.nan
+            if fleet_rates[f"transicoes_{i}"] > 0:
+                rates[rate] = rates[rate].fillna(fleet_rates[rate])
+
+        logger.info(f"Taxas de transição estimadas para {len(rates)} equipamentos")
+
+        return rates
+
     def generate_scenario(
         self,
         scenario_name: str,
@@ -491,7 +545,11 @@ class VirtualBushingGenerator:
             )
             logger.info(f"Anomalias injetadas: {anomaly_type} ({anomaly_rate}%)")
 
-        maintenance_orders = self.generate_maintenance_orders(sensor_data)
+        # Taxas DGA das OS estimadas das séries de estado_saude geradas
+        transition_rates = self.estimate_transition_rates(sensor_data)
+        maintenance_orders = self.generate_maintenance_orders(
+            sensor_data, transition_rates=transition_rates
+        )
 
         logger.info(
             f"Cenário '{scenario_name}' gerado: "
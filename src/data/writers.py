@@ -0,0 +1,132 @@
+"""
+Módulo para gravação incremental de resultados em arquivo.
+"""
+
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+from ..utils.logging_config import get_logger
+from ..utils.config_loader import get_config_loader
+
+logger = get_logger(__name__)
+
+
+class ChunkedResultWriter:
+    """
+    Grava DataFrames em blocos sucessivos no mesmo arquivo (CSV ou Parquet).
+
+    Cada chamada a append() grava o bloco em disco e o descarta, de modo que
+    a memória usada independe do total de linhas gravadas.
+    """
+
+    SUPPORTED_FORMATS = ("csv", "parquet")
+
+    def __init__(
+        self,
+        file_path: Union[str, Path],
+        format: Optional[str] = None,
+        append: bool = False,
+    ):
+        """
+        Inicializa o gravador incremental.
+
+        Args:
+            file_path: Caminho para o arquivo de saída.
+            format: Formato de saída ("csv" ou "parquet").
+                   Se None, detecta pelo sufixo do arquivo.
+            append: Se True, mantém o conteúdo existente do arquivo (apenas CSV).
+                   Se False, o arquivo é recriado no primeiro bloco.
+
+        Raises:
+            ValueError: Se o formato não for suportado.
+        """
+        self.file_path = Path(file_path)
+
+        if format is None:
+            format = self.file_path.suffix.lower().replace(".", "")
+
+        if format not in self.SUPPORTED_FORMATS:
+            raise ValueError(
+                f"Formato não suportado para gravação incremental: {format}. "
+                "Use CSV ou Parquet."
+            )
+
+        if format == "parquet" and append and self.file_path.exists():
+            raise ValueError(
+                "Arquivos Parquet não podem ser estendidos após fechados. "
+                "Use CSV para continuar uma gravação existente."
+            )
+
+        config_loader = get_config_loader()
+        self.data_config = config_loader.get_default_config().get("data", {})
+
+        self.format = format
+        self.rows_written = 0
+        self._append = append and self.file_path.exists()
+        self._parquet_writer = None
+        self._schema = None
+
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def append(self, df: pd.DataFrame) -> None:
+        """
+        Grava um bloco de linhas no final do arquivo.
+
+        Args:
+            df: DataFrame a ser gravado. Todos os blocos devem ter as mesmas colunas.
+        """
+        if df.empty:
+            return
+
+        if self.format == "csv":
+            self._append_csv(df)
+        else:
+            self._append_parquet(df)
+
+        self.rows_written += len(df)
+        logger.debug(f"{len(df)} linhas gravadas em {self.file_path} (total: {self.rows_written})")
+
+    def close(self) -> None:
+        """Finaliza o arquivo de saída."""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+        logger.info(f"Gravação incremental finalizada: {self.rows_written} linhas em {self.file_path}")
+
+    def _append_csv(self, df: pd.DataFrame) -> None:
+        """Grava um bloco em CSV, escrevendo o cabeçalho apenas no primeiro."""
+        df.to_csv(
+            self.file_path,
+            mode="a" if self._append else "w",
+            header=not self._append,
+            decimal=self.data_config.get("decimal_separator", ","),
+            sep=self.data_config.get("field_separator", ","),
+            encoding=self.data_config.get("encoding", "utf-8"),
+            index=False,
+        )
+        self._append = True
+
+    def _append_parquet(self, df: pd.DataFrame) -> None:
+        """Grava um bloco como novo row group do arquivo Parquet."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._parquet_writer is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self._schema = table.schema
+            self._parquet_writer = pq.ParquetWriter(self.file_path, self._schema)
+        else:
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+
+        self._parquet_writer.write_table(table)
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
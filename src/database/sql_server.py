@@ -4,7 +4,7 @@ Integração com SQL Server para armazenamento de dados de buchas.
 
 import pyodbc
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 
 from ..utils.logging_config import get_logger
@@ -92,6 +92,25 @@ class SQLServerConnector:
             logger.error(f"Erro ao conectar ao SQL Server: {e}")
             raise
 
+    def clone(self) -> "SQLServerConnector":
+        """
+        Cria um conector com as mesmas configurações e conexão própria.
+
+        Conexões pyodbc não devem ser compartilhadas entre threads: tarefas
+        em segundo plano usam um clone, conectado e fechado por elas.
+
+        Returns:
+            Novo conector (ainda não conectado).
+        """
+        return SQLServerConnector(
+            server=self.server,
+            database=self.database,
+            username=self.username,
+            password=self.password,
+            driver=self.driver,
+            trusted_connection=self.trusted_connection,
+        )
+
     def disconnect(self) -> None:
         """Fecha a conexão com o banco."""
         if self.connection:
@@ -154,6 +173,36 @@ class SQLServerConnector:
             logger.error(f"Erro ao buscar dados: {e}")
             raise
 
+    def fetch_data_chunks(
+        self, query: str, params: Optional[tuple] = None, chunk_size: int = 100000
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Executa uma query SELECT e retorna os resultados em blocos.
+
+        Args:
+            query: Query SQL SELECT.
+            params: Parâmetros da query.
+            chunk_size: Número de linhas por bloco.
+
+        Yields:
+            DataFrames com até chunk_size linhas.
+        """
+        if not self.connection:
+            self.connect()
+
+        try:
+            chunks = pd.read_sql_query(
+                query, self.connection, params=params, chunksize=chunk_size
+            )
+
+            for chunk in chunks:
+                logger.debug(f"Bloco obtido: {len(chunk)} linhas")
+                yield chunk
+
+        except Exception as e:
+            logger.error(f"Erro ao buscar dados em blocos: {e}")
+            raise
+
     def table_exists(self, table_name: str) -> bool:
         """
         Verifica se uma tabela existe no banco.
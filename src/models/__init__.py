@@ -1,6 +1,8 @@
 """Módulo de modelos matemáticos e estatísticos."""
 
 from .markov import MarkovChainModel
+from .ctmc import ContinuousTimeMarkovModel
 from .degradation import DegradationModel
+from .estimation import TransitionRateEstimator
 
-__all__ = ["MarkovChainModel", "DegradationModel"]
+__all__ = ["MarkovChainModel", "ContinuousTimeMarkovModel", "DegradationModel", "TransitionRateEstimator"]
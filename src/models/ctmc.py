@@ -0,0 +1,233 @@
+"""
+Modelo de Cadeia de Markov de tempo contínuo (CTMC) para horizontes arbitrários.
+"""
+
+from typing import Union
+
+import numpy as np
+
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Maior probabilidade diária aceita na conversão para intensidade
+# (p = 1 daria intensidade infinita; 1 - 1e-12 corresponde a ~27.6 por dia)
+MAX_DAILY_PROBABILITY = 1.0 - 1e-12
+
+# Maior Λ·t da uniformização; acima disso usa-se a exponencial de matriz
+UNIFORMIZATION_MAX_MEAN = 1e6
+
+
+class ContinuousTimeMarkovModel:
+    """
+    Cadeia de Markov de tempo contínuo com os mesmos estados de MarkovChainModel.
+
+    O gerador Q é bidiagonal: qᵢ é a intensidade (por dia) de passagem do
+    estado i para i+1 e a Falha é absorvente. As probabilidades P(t) = exp(Qt)
+    são calculadas para vários instantes t (em dias, não necessariamente
+    inteiros) em uma única chamada, por uniformização ou por exponencial de
+    matriz com scaling-and-squaring. O custo não depende da resolução do
+    passo, de modo que horizontes horários ou de décadas custam o mesmo.
+    """
+
+    def __init__(self, n_states: int = 5):
+        """
+        Inicializa o modelo de tempo contínuo.
+
+        Args:
+            n_states: Número de estados (padrão: 5).
+        """
+        self.n_states = n_states
+        self.state_names = ["Normal", "Degradado 1", "Degradado 2", "Degradado 3", "Falha"]
+        self.generator_matrix: np.ndarray = None
+
+    def build_generator_matrix(
+        self, transition_rates: np.ndarray, from_probabilities: bool = True
+    ) -> np.ndarray:
+        """
+        Constrói o gerador infinitesimal Q a partir das taxas de transição.
+
+        Args:
+            transition_rates: Array (n_states-1,) com as taxas de cada estado transitório.
+            from_probabilities: Se True, as taxas são probabilidades diárias λᵢ
+                               (as mesmas de MarkovChainModel) e são convertidas em
+                               intensidades qᵢ = -ln(1 - λᵢ), preservando a
+                               probabilidade de permanência em um dia (limitadas
+                               a MAX_DAILY_PROBABILITY). Se False, já são
+                               intensidades por dia.
+
+        Returns:
+            Matriz geradora (n_states x n_states), com linhas somando zero.
+        """
+        rates = np.asarray(transition_rates, dtype=float)
+
+        if from_probabilities:
+            rates = -np.log1p(-np.clip(rates, 0.0, MAX_DAILY_PROBABILITY))
+
+        rates_with_failure = np.append(rates, 0.0)
+
+        generator = np.diag(-rates_with_failure) + np.diag(rates_with_failure[:-1], 1)
+
+        self.generator_matrix = generator
+        logger.debug(f"Matriz geradora construída: {generator.shape}")
+
+        return generator
+
+    def transition_matrices(self, times: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Calcula P(t) = exp(Qt) para vários instantes de uma vez.
+
+        Usa scaling-and-squaring com série de Taylor, vetorizado sobre todos
+        os instantes.
+
+        Args:
+            times: Instante ou array de instantes (em dias).
+
+        Returns:
+            Array (len(times), n_states, n_states) com as matrizes de transição.
+
+        Raises:
+            ValueError: Se a matriz geradora não foi construída.
+        """
+        self._check_generator()
+
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        matrices = times[:, np.newaxis, np.newaxis] * self.generator_matrix
+
+        return self._expm(matrices)
+
+    def calculate_state_probabilities(
+        self,
+        times: Union[float, np.ndarray],
+        initial_state: int = 0,
+        method: str = "uniformization",
+    ) -> np.ndarray:
+        """
+        Calcula as probabilidades de cada estado em vários instantes.
+
+        Args:
+            times: Instante ou array de instantes (em dias).
+            initial_state: Estado inicial (padrão: 0 = Normal).
+            method: "uniformization" ou "expm".
+
+        Returns:
+            Array (len(times), n_states) com as probabilidades.
+
+        Raises:
+            ValueError: Se a matriz geradora não foi construída ou o método é inválido.
+
+        Examples:
+            >>> model = ContinuousTimeMarkovModel()
+            >>> Q = model.build_generator_matrix(np.array([0.01, 0.02, 0.03, 0.04]))
+            >>> hours = np.arange(0, 24 * 365) / 24
+            >>> model.calculate_state_probabilities(hours).shape
+            (8760, 5)
+        """
+        self._check_generator()
+
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+
+        if method == "expm":
+            return self.transition_matrices(times)[:, initial_state, :]
+        elif method == "uniformization":
+            return self._uniformization(times, initial_state)
+        else:
+            raise ValueError(
+                f"Método desconhecido: {method}. Use 'uniformization' ou 'expm'."
+            )
+
+    def calculate_mean_time_to_failure(self, initial_state: int = 0) -> float:
+        """
+        Calcula o tempo médio até falha (em dias) a partir de um estado.
+
+        Args:
+            initial_state: Estado inicial.
+
+        Returns:
+            Soma dos tempos médios de permanência 1/qᵢ dos estados restantes.
+        """
+        self._check_generator()
+
+        rates = np.diag(self.generator_matrix, 1)[initial_state:]
+
+        if np.any(rates <= 0):
+            return np.inf
+
+        return float(np.sum(1.0 / rates))
+
+    def _uniformization(self, times: np.ndarray, initial_state: int) -> np.ndarray:
+        """
+        Uniformização: p(t) = Σₖ Poisson(k; Λt) · p₀ Uᵏ, com U = I + Q/Λ.
+
+        Os vetores p₀ Uᵏ são calculados uma vez para o maior t, e os pesos de
+        Poisson de todos os instantes são aplicados em blocos (memória limitada).
+        Se Λt excede UNIFORMIZATION_MAX_MEAN, o número de termos seria
+        proibitivo e a exponencial de matriz é usada.
+        """
+        probabilities = np.zeros((len(times), self.n_states))
+        uniform_rate = float(np.max(-np.diag(self.generator_matrix)))
+
+        if uniform_rate == 0 or len(times) == 0:
+            probabilities[:, initial_state] = 1.0
+            return probabilities
+
+        uniformized = np.eye(self.n_states) + self.generator_matrix / uniform_rate
+
+        # Truncamento da série para o maior Λt (cauda de Poisson desprezível)
+        max_mean = uniform_rate * float(np.max(times))
+        if max_mean > UNIFORMIZATION_MAX_MEAN:
+            logger.debug(f"Λt = {max_mean:.3g} acima do limite da uniformização; usando expm")
+            return self.transition_matrices(times)[:, initial_state, :]
+
+        n_terms = int(np.ceil(max_mean + 10.0 * np.sqrt(max_mean) + 20))
+
+        vectors = np.empty((n_terms, self.n_states))
+        vectors[0] = 0.0
+        vectors[0, initial_state] = 1.0
+        for k in range(1, n_terms):
+            vectors[k] = vectors[k - 1] @ uniformized
+
+        k = np.arange(n_terms)
+        log_factorials = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, n_terms)))))
+
+        block_size = max(1, 5_000_000 // n_terms)
+        for start in range(0, len(times), block_size):
+            means = uniform_rate * times[start:start + block_size, np.newaxis]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                log_weights = k * np.log(means) - means - log_factorials
+            log_weights[:, 0] = -means[:, 0]
+            probabilities[start:start + block_size] = np.exp(log_weights) @ vectors
+
+        return probabilities
+
+    @staticmethod
+    def _expm(matrices: np.ndarray, order: int = 18) -> np.ndarray:
+        """
+        Exponencial de matriz em lote por scaling-and-squaring.
+
+        Cada matriz é escalada por 2^-s até norma ≤ 0.5, a série de Taylor é
+        avaliada pelo método de Horner e o resultado é elevado ao quadrado s
+        vezes. s é comum ao lote para manter as operações vetorizadas.
+        """
+        norm = float(np.max(np.abs(matrices).sum(axis=-1))) if matrices.size else 0.0
+        squarings = max(0, int(np.ceil(np.log2(norm / 0.5)))) if norm > 0.5 else 0
+
+        scaled = matrices / (2.0 ** squarings)
+        identity = np.broadcast_to(np.eye(matrices.shape[-1]), matrices.shape)
+
+        result = identity.copy()
+        for j in range(order, 0, -1):
+            result = identity + (scaled @ result) / j
+
+        for _ in range(squarings):
+            result = result @ result
+
+        return result
+
+    def _check_generator(self) -> None:
+        """Verifica se a matriz geradora foi construída."""
+        if self.generator_matrix is None:
+            raise ValueError(
+                "Matriz geradora não foi construída. "
+                "Chame build_generator_matrix() primeiro."
+            )
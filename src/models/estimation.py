@@ -0,0 +1,318 @@
+"""
+Estimação das taxas de transição da Cadeia de Markov a partir de sensor_data.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class TransitionRateEstimator:
+    """
+    Estimador de máxima verossimilhança das taxas λᵢ da cadeia sequencial.
+
+    As séries de estado_saude de cada equipamento são comprimidas em
+    sequências de permanência (run-length) e acumuladas como estatísticas
+    suficientes por (equipamento, estado):
+
+        - exposicao_dias: tempo total observado no estado
+        - transicoes: número de saídas para um estado mais degradado
+
+    A taxa contínua estimada é q̂ᵢ = transicoes / exposicao_dias, convertida
+    para a probabilidade diária do modelo discreto: λᵢ = 1 - exp(-q̂ᵢ).
+    Retornos a estados menos degradados (ex.: após manutenção) encerram a
+    permanência sem contar como transição.
+
+    Os dados podem ser processados em blocos (update) e estimadores
+    independentes podem ser combinados (merge), pois as estatísticas são
+    aditivas. Para cada equipamento, as leituras devem chegar em ordem
+    cronológica entre blocos (ex.: ORDER BY equipment_id, timestamp).
+    """
+
+    def __init__(
+        self,
+        n_states: int = 5,
+        segment_column: Optional[str] = None,
+        max_gap_hours: Optional[float] = None,
+    ):
+        """
+        Inicializa o estimador.
+
+        Args:
+            n_states: Número de estados (o último é a Falha, absorvente).
+            segment_column: Coluna que define o segmento da frota
+                           (ex.: "localizacao"). None = sem segmentação.
+            max_gap_hours: Intervalos entre leituras maiores que este valor
+                          (falhas de aquisição) são descartados. None = usar todos.
+        """
+        self.n_states = n_states
+        self.segment_column = segment_column
+        self.max_gap_hours = max_gap_hours
+
+        # Estatísticas suficientes indexadas por (equipment_id, estado)
+        self._stats = pd.DataFrame(
+            columns=["exposicao_dias", "transicoes"],
+            index=pd.MultiIndex.from_arrays([[], []], names=["equipment_id", "estado"]),
+            dtype=float,
+        )
+
+        # Última leitura de cada equipamento (continuidade entre blocos)
+        self._last_readings = pd.DataFrame(columns=["equipment_id", "timestamp", "estado_saude"])
+
+        self._segments: Dict[str, str] = {}
+        self.n_readings = 0
+
+    def update(self, chunk: pd.DataFrame) -> "TransitionRateEstimator":
+        """
+        Acumula as estatísticas de um bloco de leituras.
+
+        Args:
+            chunk: DataFrame com equipment_id, timestamp, estado_saude
+                  (e segment_column, se configurada).
+
+        Returns:
+            O próprio estimador.
+        """
+        if chunk.empty:
+            return self
+
+        columns = ["equipment_id", "timestamp", "estado_saude"]
+        readings = chunk[columns].dropna()
+        readings = readings.assign(
+            timestamp=pd.to_datetime(readings["timestamp"]),
+            estado_saude=readings["estado_saude"].astype(np.int64),
+        )
+
+        if self.segment_column is not None:
+            segments = chunk[["equipment_id", self.segment_column]].dropna().drop_duplicates("equipment_id")
+            self._segments.update(
+                zip(segments["equipment_id"].astype(str), segments[self.segment_column].astype(str))
+            )
+
+        self.n_readings += len(readings)
+
+        # Anexar a última leitura do bloco anterior de cada equipamento
+        carry = self._last_readings[self._last_readings["equipment_id"].isin(readings["equipment_id"])]
+        if not carry.empty:
+            readings = pd.concat([carry, readings], ignore_index=True)
+        readings = readings.sort_values(["equipment_id", "timestamp"], kind="mergesort")
+
+        equipment = readings["equipment_id"].to_numpy()
+        timestamps = readings["timestamp"].to_numpy()
+        states = readings["estado_saude"].to_numpy(dtype=np.int64)
+
+        # Guardar a última leitura de cada equipamento para o próximo bloco
+        last_mask = np.append(equipment[1:] != equipment[:-1], True)
+        previous = self._last_readings[~self._last_readings["equipment_id"].isin(readings["equipment_id"])]
+        self._last_readings = (
+            pd.concat([previous, readings[last_mask]], ignore_index=True)
+            if not previous.empty else readings[last_mask].reset_index(drop=True)
+        )
+
+        # Intervalos entre leituras consecutivas do mesmo equipamento
+        same_equipment = equipment[1:] == equipment[:-1]
+        dt_days = (timestamps[1:] - timestamps[:-1]) / np.timedelta64(1, "D")
+        valid = same_equipment & (dt_days >= 0)
+
+        if self.max_gap_hours is not None:
+            valid &= dt_days * 24 <= self.max_gap_hours
+
+        if not valid.any():
+            return self
+
+        from_state = states[:-1][valid]
+        to_state = states[1:][valid]
+        interval_equipment = equipment[:-1][valid]
+        dt_days = dt_days[valid]
+
+        # Cada intervalo soma à permanência no estado de origem; as fronteiras
+        # das sequências run-length (mudança de estado) são as transições.
+        # Apenas estados transitórios acumulam exposição.
+        transient = from_state < self.n_states - 1
+
+        intervals = pd.DataFrame({
+            "equipment_id": interval_equipment[transient],
+            "estado": from_state[transient],
+            "exposicao_dias": dt_days[transient],
+            "transicoes": (to_state[transient] > from_state[transient]).astype(float),
+        })
+
+        chunk_stats = intervals.groupby(["equipment_id", "estado"]).sum()
+        self._add_stats(chunk_stats)
+
+        return self
+
+    def fit(self, chunks: Iterable[pd.DataFrame]) -> "TransitionRateEstimator":
+        """
+        Processa uma sequência de blocos de leituras.
+
+        Args:
+            chunks: Iterável de DataFrames (ex.: leitura em blocos do banco).
+
+        Returns:
+            O próprio estimador.
+        """
+        for i, chunk in enumerate(chunks, start=1):
+            self.update(chunk)
+            logger.debug(f"Bloco {i} processado ({self.n_readings} leituras acumuladas)")
+
+        logger.info(
+            f"Estatísticas de transição acumuladas: {self.n_readings} leituras, "
+            f"{self._stats.index.get_level_values('equipment_id').nunique()} equipamentos"
+        )
+
+        return self
+
+    def fit_from_database(
+        self,
+        db_connector,
+        equipment_ids: Optional[List[str]] = None,
+        chunk_size: int = 500000,
+    ) -> "TransitionRateEstimator":
+        """
+        Lê sensor_data em blocos do banco e acumula as estatísticas.
+
+        Args:
+            db_connector: Conector SQL Server.
+            equipment_ids: Equipamentos a considerar (None = todos).
+            chunk_size: Número de linhas por bloco.
+
+        Returns:
+            O próprio estimador.
+        """
+        columns = ["equipment_id", "timestamp", "estado_saude"]
+        if self.segment_column is not None:
+            columns.append(self.segment_column)
+
+        query = f"SELECT {', '.join(columns)} FROM sensor_data"
+        params = None
+
+        if equipment_ids:
+            query += " WHERE equipment_id IN ({})".format(",".join(["?" for _ in equipment_ids]))
+            params = tuple(equipment_ids)
+
+        query += " ORDER BY equipment_id, timestamp"
+
+        logger.info("Estimando taxas de transição a partir de sensor_data...")
+
+        return self.fit(db_connector.fetch_data_chunks(query, params, chunk_size=chunk_size))
+
+    def merge(self, other: "TransitionRateEstimator") -> "TransitionRateEstimator":
+        """
+        Combina as estatísticas de outro estimador (ex.: outra partição dos dados).
+
+        As partições devem conter equipamentos distintos ou intervalos de
+        tempo disjuntos; a transição na fronteira entre partições de um mesmo
+        equipamento não é contada.
+
+        Args:
+            other: Estimador com as mesmas configurações.
+
+        Returns:
+            O próprio estimador.
+        """
+        if other.n_states != self.n_states:
+            raise ValueError("Estimadores com números de estados diferentes")
+
+        self._add_stats(other._stats)
+        self._segments.update(other._segments)
+        self.n_readings += other.n_readings
+
+        return self
+
+    def get_statistics(self, level: str = "equipment") -> pd.DataFrame:
+        """
+        Retorna as estatísticas suficientes agregadas.
+
+        Args:
+            level: "equipment", "segment" ou "fleet".
+
+        Returns:
+            DataFrame indexado por (chave, estado) com exposicao_dias e transicoes.
+        """
+        stats = self._stats
+
+        if level == "equipment":
+            return stats.copy()
+
+        equipment_ids = stats.index.get_level_values("equipment_id")
+
+        if level == "segment":
+            if self.segment_column is None:
+                raise ValueError("segment_column não configurada no estimador")
+            keys = equipment_ids.astype(str).map(lambda eq: self._segments.get(eq, "desconhecido"))
+            name = self.segment_column
+        elif level == "fleet":
+            keys = np.full(len(stats), "frota")
+            name = "frota"
+        else:
+            raise ValueError(f"Nível inválido: {level}. Use 'equipment', 'segment' ou 'fleet'.")
+
+        grouped = stats.groupby([keys, stats.index.get_level_values("estado")]).sum()
+        grouped.index.names = [name, "estado"]
+
+        return grouped
+
+    def estimate(self, level: str = "equipment", fill_missing: bool = True) -> pd.DataFrame:
+        """
+        Calcula as taxas de transição por equipamento, segmento ou frota.
+
+        Args:
+            level: "equipment", "segment" ou "fleet".
+            fill_missing: Se True, estados sem exposição recebem a taxa da frota.
+
+        Returns:
+            DataFrame com uma linha por chave e colunas taxa_<i>,
+            transicoes_<i> e exposicao_dias_<i> para cada estado transitório i.
+
+        Raises:
+            ValueError: Se nenhum intervalo entre leituras foi acumulado.
+        """
+        stats = self.get_statistics(level)
+        transient_states = list(range(self.n_states - 1))
+
+        if stats.empty:
+            raise ValueError(
+                "Nenhuma estatística de transição acumulada: forneça leituras "
+                "consecutivas em estados transitórios (update/fit) antes de estimar"
+            )
+
+        wide = stats.unstack("estado").reindex(columns=transient_states, level="estado")
+        exposure = wide["exposicao_dias"].reindex(columns=transient_states)
+        transitions = wide["transicoes"].reindex(columns=transient_states)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = 1.0 - np.exp(-(transitions / exposure.where(exposure > 0)))
+
+        if fill_missing and level != "fleet" and not rates.empty:
+            fleet_rates = self.estimate(level="fleet", fill_missing=False)
+            if not fleet_rates.empty:
+                fleet_row = fleet_rates.iloc[0][[f"taxa_{i}" for i in transient_states]].to_numpy()
+                rates = rates.fillna(pd.Series(fleet_row, index=transient_states))
+
+        result = pd.concat(
+            [
+                rates.add_prefix("taxa_"),
+                transitions.fillna(0).add_prefix("transicoes_"),
+                exposure.fillna(0).add_prefix("exposicao_dias_"),
+            ],
+            axis=1,
+        )
+        result.columns = [str(col) for col in result.columns]
+
+        return result
+
+    def _add_stats(self, stats: pd.DataFrame) -> None:
+        """Soma estatísticas às acumuladas."""
+        if stats.empty:
+            return
+
+        if self._stats.empty:
+            self._stats = stats.astype(float)
+        else:
+            self._stats = self._stats.add(stats, fill_value=0.0)
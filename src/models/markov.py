@@ -3,7 +3,7 @@ Modelo de Cadeia de Markov para transições de estados de equipamentos.
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -155,6 +155,8 @@ class MarkovChainModel:
         """
         Simula trajetórias individuais da cadeia de Markov.
 
+        Usa o simulador vetorizado (simulate_trajectories).
+
         Args:
             n_cycles: Número de ciclos a simular.
             initial_state: Estado inicial.
@@ -165,41 +167,139 @@ class MarkovChainModel:
                 - estados_finais: Lista com o estado final de cada simulação
                 - distribuicao_estados: Dict com frequência de cada estado final
         """
-        if self.transition_matrix is None:
-            raise ValueError("Matriz de transição não foi construída.")
+        result = self.simulate_trajectories(
+            n_cycles, initial_state=initial_state, n_simulations=n_simulations
+        )
 
-        final_states = []
+        return result["final_states"].tolist(), result["distribution"]
 
-        for _ in range(n_simulations):
-            current_state = initial_state
+    def simulate_trajectories(
+        self,
+        n_cycles: int,
+        initial_state: int = 0,
+        n_simulations: int = 1000,
+        seed: Optional[Union[int, np.random.Generator]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Simula trajetórias Monte Carlo de forma vetorizada.
+
+        Na cadeia sequencial (bidiagonal) o tempo de permanência em cada
+        estado i é geométrico com parâmetro λᵢ. Os tempos de permanência de
+        todas as trajetórias são amostrados de uma só vez e o tempo de falha
+        é a soma acumulada, sem iterar sobre os ciclos. Para matrizes que não
+        são bidiagonais, as trajetórias avançam juntas, um ciclo por vez.
+
+        Args:
+            n_cycles: Número de ciclos a simular (horizonte).
+            initial_state: Estado inicial.
+            n_simulations: Número de simulações Monte Carlo.
+            seed: Semente ou np.random.Generator (reprodutibilidade).
 
-            for _ in range(n_cycles):
-                # Probabilidades de transição do estado atual
-                transition_probs = self.transition_matrix[current_state, :]
+        Returns:
+            Dicionário com:
+                - final_states: Array (n_simulations,) com o estado após n_cycles
+                - distribution: Dict com frequência de cada estado final
+                - failure_times: Array (n_simulations,) com o ciclo em que a
+                  falha foi atingida (np.inf se nunca atinge). Na cadeia
+                  bidiagonal os tempos não são limitados pelo horizonte; no
+                  caso geral, falhas após n_cycles são np.inf.
 
-                # Escolher próximo estado baseado nas probabilidades
-                next_state = np.random.choice(
-                    self.n_states, p=transition_probs
-                )
+        Raises:
+            ValueError: Se a matriz de transição não foi construída.
 
-                current_state = next_state
+        Examples:
+            >>> model = MarkovChainModel()
+            >>> model.build_transition_matrix(np.array([0.01, 0.02, 0.03, 0.04]))
+            >>> sim = model.simulate_trajectories(3650, n_simulations=10000, seed=42)
+            >>> sim["failure_times"].shape
+            (10000,)
+        """
+        if self.transition_matrix is None:
+            raise ValueError("Matriz de transição não foi construída.")
 
-                # Se atingiu estado absorvente (Falha), parar
-                if current_state == self.n_states - 1:
-                    break
+        rng = np.random.default_rng(seed)
 
-            final_states.append(current_state)
+        if self._is_sequential():
+            final_states, failure_times = self._simulate_sequential(
+                n_cycles, initial_state, n_simulations, rng
+            )
+        else:
+            final_states, failure_times = self._simulate_general(
+                n_cycles, initial_state, n_simulations, rng
+            )
 
         # Calcular distribuição de estados finais
-        unique, counts = np.unique(final_states, return_counts=True)
+        counts = np.bincount(final_states, minlength=self.n_states)
         distribution = {int(state): float(count / n_simulations)
-                       for state, count in zip(unique, counts)}
+                        for state, count in enumerate(counts) if count > 0}
 
         logger.debug(
             f"Simulação concluída: {n_simulations} trajetórias, {n_cycles} ciclos"
         )
 
-        return final_states, distribution
+        return {
+            "final_states": final_states,
+            "distribution": distribution,
+            "failure_times": failure_times,
+        }
+
+    def _is_sequential(self) -> bool:
+        """Verifica se a matriz é bidiagonal (transições apenas para o próximo estado)."""
+        T = self.transition_matrix
+        bidiagonal = np.diag(np.diag(T)) + np.diag(np.diag(T, 1), 1)
+        return bool(np.allclose(T, bidiagonal))
+
+    def _simulate_sequential(
+        self, n_cycles: int, initial_state: int, n_simulations: int, rng: np.random.Generator
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Simulação por tempos de permanência geométricos (cadeia bidiagonal)."""
+        failure_state = self.n_states - 1
+        rates = np.diag(self.transition_matrix, 1)[initial_state:]
+
+        if initial_state >= failure_state:
+            return (
+                np.full(n_simulations, initial_state, dtype=np.int64),
+                np.zeros(n_simulations),
+            )
+
+        # Tempos de permanência (n_simulations x estados transitórios restantes)
+        sojourn = np.full((n_simulations, len(rates)), np.inf)
+        for j, rate in enumerate(rates):
+            if rate > 0:
+                sojourn[:, j] = rng.geometric(min(rate, 1.0), size=n_simulations)
+
+        # Ciclo em que cada estado é deixado; o último coincide com a falha
+        exit_times = np.cumsum(sojourn, axis=1)
+        failure_times = exit_times[:, -1]
+
+        final_states = initial_state + (exit_times <= n_cycles).sum(axis=1)
+
+        return final_states.astype(np.int64), failure_times
+
+    def _simulate_general(
+        self, n_cycles: int, initial_state: int, n_simulations: int, rng: np.random.Generator
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Simulação ciclo a ciclo vetorizada entre trajetórias (matriz qualquer)."""
+        failure_state = self.n_states - 1
+        cumulative = np.cumsum(self.transition_matrix, axis=1)
+        cumulative[:, -1] = 1.0
+
+        states = np.full(n_simulations, initial_state, dtype=np.int64)
+        failure_times = np.full(n_simulations, np.inf)
+        failure_times[states == failure_state] = 0
+
+        for cycle in range(1, n_cycles + 1):
+            active = states != failure_state
+            if not active.any():
+                break
+
+            u = rng.random(active.sum())
+            states[active] = (u[:, None] >= cumulative[states[active]]).sum(axis=1)
+
+            newly_failed = active & (states == failure_state)
+            failure_times[newly_failed] = cycle
+
+        return states, failure_times
 
     def get_steady_state(self, tolerance: float = 1e-10, max_iterations: int = 10000) -> np.ndarray:
         """
@@ -218,6 +318,10 @@ class MarkovChainModel:
         if self.transition_matrix is None:
             raise ValueError("Matriz de transição não foi construída.")
 
+        # Cadeia sequencial: solução fechada, sem iterações
+        if self._is_sequential():
+            return self._sequential_steady_state()
+
         # Estado inicial uniforme
         state = np.ones(self.n_states) / self.n_states
 
@@ -249,6 +353,13 @@ class MarkovChainModel:
         if self.transition_matrix is None:
             raise ValueError("Matriz de transição não foi construída.")
 
+        # Cadeia sequencial: soma dos tempos médios de permanência (1/λᵢ)
+        if self._is_sequential():
+            rates = np.diag(self.transition_matrix, 1)
+            mttf = self._mttf_from_rates(rates[np.newaxis, :])[0, initial_state]
+            logger.debug(f"MTTF a partir do estado {initial_state}: {mttf:.2f} ciclos")
+            return float(mttf)
+
         # Remover o estado absorvente (falha)
         Q = self.transition_matrix[:-1, :-1]
         I = np.eye(Q.shape[0])
@@ -266,3 +377,116 @@ class MarkovChainModel:
         logger.debug(f"MTTF a partir do estado {initial_state}: {mttf:.2f} ciclos")
 
         return float(mttf)
+
+    def _sequential_steady_state(self) -> np.ndarray:
+        """
+        Limite de P₀ × T^n para P₀ uniforme na cadeia sequencial.
+
+        Cada estado com λᵢ = 0 (incluindo a Falha) é absorvente e acumula a
+        massa inicial dos estados anteriores a ele até o absorvente anterior.
+        """
+        rates = np.append(np.diag(self.transition_matrix, 1), 0.0)
+        steady_state = np.zeros(self.n_states)
+
+        start = 0
+        for state in np.flatnonzero(rates <= 0):
+            steady_state[state] = (state - start + 1) / self.n_states
+            start = state + 1
+
+        return steady_state
+
+    @staticmethod
+    def _mttf_from_rates(rates: np.ndarray) -> np.ndarray:
+        """
+        MTTF de cada estado transitório para N vetores de taxas (forma fechada).
+
+        O tempo médio de permanência no estado j é 1/λⱼ; a partir do estado i,
+        MTTF(i) = Σ_{j≥i} 1/λⱼ (np.inf se algum λⱼ = 0).
+        """
+        with np.errstate(divide="ignore"):
+            mean_sojourn = np.where(rates > 0, 1.0 / rates, np.inf)
+
+        return np.cumsum(mean_sojourn[:, ::-1], axis=1)[:, ::-1]
+
+    def batch_reliability(
+        self,
+        transition_rates: np.ndarray,
+        horizon: int,
+        initial_states: Union[int, np.ndarray] = 0,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calcula indicadores de confiabilidade para N equipamentos de uma vez.
+
+        Para cadeias sequenciais (bidiagonais), MTTF e probabilidades de
+        absorção têm forma fechada. As curvas de sobrevivência propagam as
+        distribuições de estado de todos os equipamentos juntas, ciclo a ciclo.
+
+        Args:
+            transition_rates: Array (N, n_states-1) com as taxas λ de cada equipamento.
+            horizon: Número de ciclos (dias) das curvas de sobrevivência e risco.
+            initial_states: Estado inicial comum (int) ou array (N,) por equipamento.
+
+        Returns:
+            Dicionário com:
+                - mttf: (N, n_states-1) tempo médio até falha a partir de cada estado
+                - absorption_probabilities: (N, n_states-1) probabilidade de atingir
+                  a falha a partir de cada estado
+                - survival: (N, horizon+1) S(t) = P(sem falha até t), t = 0..horizon
+                - hazard: (N, horizon) h(t) = P(falha em t | sem falha até t-1),
+                  t = 1..horizon (np.nan quando S(t-1) = 0)
+
+        Raises:
+            ValueError: Se as dimensões de transition_rates forem inválidas.
+
+        Examples:
+            >>> model = MarkovChainModel()
+            >>> rates = np.array([[0.01, 0.02, 0.03, 0.04], [0.02, 0.04, 0.06, 0.08]])
+            >>> result = model.batch_reliability(rates, horizon=365)
+            >>> result["survival"].shape
+            (2, 366)
+        """
+        rates = np.atleast_2d(np.asarray(transition_rates, dtype=float))
+
+        if rates.shape[1] != self.n_states - 1:
+            raise ValueError(
+                f"transition_rates deve ter {self.n_states - 1} colunas, "
+                f"recebido {rates.shape[1]}"
+            )
+
+        n_equipment = rates.shape[0]
+
+        mttf = self._mttf_from_rates(rates)
+
+        # Falha é certa a partir de i se todos os λⱼ (j ≥ i) forem positivos
+        blocked = np.cumsum((rates <= 0)[:, ::-1], axis=1)[:, ::-1] > 0
+        absorption = np.where(blocked, 0.0, 1.0)
+
+        # Propagar distribuições de estado de todos os equipamentos juntos
+        probabilities = np.zeros((n_equipment, self.n_states))
+        probabilities[np.arange(n_equipment), initial_states] = 1.0
+
+        survival = np.empty((n_equipment, horizon + 1))
+        survival[:, 0] = 1.0 - probabilities[:, -1]
+
+        for t in range(1, horizon + 1):
+            flow = probabilities[:, :-1] * rates
+            probabilities[:, :-1] -= flow
+            probabilities[:, 1:] += flow
+            survival[:, t] = 1.0 - probabilities[:, -1]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            previous = survival[:, :-1]
+            hazard = np.where(
+                previous > 0, (previous - survival[:, 1:]) / previous, np.nan
+            )
+
+        logger.debug(
+            f"Confiabilidade calculada: {n_equipment} equipamentos, horizonte={horizon}"
+        )
+
+        return {
+            "mttf": mttf,
+            "absorption_probabilities": absorption,
+            "survival": survival,
+            "hazard": hazard,
+        }
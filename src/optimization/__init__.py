@@ -4,5 +4,13 @@ from .problem import MaintenanceProblem
 from .solver import NSGA2Solver
 from .pareto import ParetoAnalyzer
 from .optimizer import MaintenanceOptimizer
+from .checkpoint import FileCheckpoint, DatabaseCheckpoint
 
-__all__ = ["MaintenanceProblem", "NSGA2Solver", "ParetoAnalyzer", "MaintenanceOptimizer"]
+__all__ = [
+    "MaintenanceProblem",
+    "NSGA2Solver",
+    "ParetoAnalyzer",
+    "MaintenanceOptimizer",
+    "FileCheckpoint",
+    "DatabaseCheckpoint",
+]
@@ -0,0 +1,240 @@
+"""
+Checkpoints de execuções longas de otimização.
+
+Registra os resultados das ordens de serviço já otimizadas para que uma
+execução interrompida possa ser retomada sem refazer o trabalho concluído.
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _json_default(value: Any) -> Any:
+    """Converte tipos não serializáveis (datas, escalares NumPy) para JSON."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+class OptimizationCheckpoint(ABC):
+    """
+    Checkpoint base de resultados de otimização por OS.
+
+    Os resultados são acumulados em memória e gravados no armazenamento a
+    cada flush_every ordens concluídas (ou quando flush() é chamado).
+    """
+
+    def __init__(self, flush_every: int = 50):
+        """
+        Inicializa o checkpoint.
+
+        Args:
+            flush_every: Número de resultados acumulados antes de gravar.
+        """
+        self.flush_every = max(1, flush_every)
+        self._pending: List[Tuple[str, Dict[str, Any]]] = []
+        self._completed: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def completed_ids(self) -> set:
+        """Conjunto de OS_Id já concluídas (gravadas ou pendentes)."""
+        return set(self._completed)
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Carrega os resultados já gravados no armazenamento.
+
+        Returns:
+            Dicionário {OS_Id: resultado} das ordens concluídas.
+        """
+        self._completed = self._read()
+        logger.info(f"Checkpoint carregado: {len(self._completed)} OSs concluídas")
+        return dict(self._completed)
+
+    def add(self, os_id: str, result: Dict[str, Any]) -> None:
+        """
+        Registra o resultado de uma OS concluída.
+
+        Args:
+            os_id: Identificador da OS.
+            result: Resultado serializável em JSON.
+        """
+        os_id = str(os_id)
+        self._completed[os_id] = result
+        self._pending.append((os_id, result))
+
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Grava os resultados pendentes no armazenamento."""
+        if not self._pending:
+            return
+
+        self._write(self._pending)
+        logger.debug(f"Checkpoint: {len(self._pending)} resultados gravados")
+        self._pending = []
+
+    def reset(self) -> None:
+        """Descarta todos os resultados do checkpoint."""
+        self._pending = []
+        self._completed = {}
+        self._clear()
+        logger.info("Checkpoint reiniciado")
+
+    @abstractmethod
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        """Lê do armazenamento os resultados gravados ({OS_Id: resultado})."""
+
+    @abstractmethod
+    def _write(self, entries: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Acrescenta ao armazenamento uma lista de pares (OS_Id, resultado)."""
+
+    @abstractmethod
+    def _clear(self) -> None:
+        """Remove do armazenamento todos os resultados do checkpoint."""
+
+
+class FileCheckpoint(OptimizationCheckpoint):
+    """
+    Checkpoint em arquivo local no formato JSON Lines.
+
+    Cada linha contém {"os_id": ..., "result": {...}}. O arquivo só recebe
+    acréscimos, e uma linha final truncada (interrupção durante a gravação)
+    é ignorada na leitura.
+    """
+
+    def __init__(self, file_path: Union[str, Path], flush_every: int = 50):
+        """
+        Inicializa o checkpoint em arquivo.
+
+        Args:
+            file_path: Caminho para o arquivo de checkpoint.
+            flush_every: Número de resultados acumulados antes de gravar.
+        """
+        super().__init__(flush_every=flush_every)
+        self.file_path = Path(file_path)
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        completed = {}
+
+        if not self.file_path.exists():
+            return completed
+
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(
+                        f"Linha {line_number} do checkpoint inválida (gravação interrompida?); ignorada"
+                    )
+                    continue
+                completed[str(entry["os_id"])] = entry["result"]
+
+        return completed
+
+    def _write(self, entries: List[Tuple[str, Dict[str, Any]]]) -> None:
+        lines = "".join(
+            json.dumps({"os_id": os_id, "result": result}, default=_json_default) + "\n"
+            for os_id, result in entries
+        )
+
+        # Isolar uma eventual linha truncada por interrupção anterior
+        if self.file_path.exists() and self.file_path.stat().st_size > 0:
+            with open(self.file_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    lines = "\n" + lines
+
+        with open(self.file_path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _clear(self) -> None:
+        if self.file_path.exists():
+            self.file_path.unlink()
+
+
+class DatabaseCheckpoint(OptimizationCheckpoint):
+    """
+    Checkpoint em tabela do SQL Server (optimization_checkpoints).
+
+    Os resultados são identificados por run_id, permitindo checkpoints
+    independentes para diferentes lotes de otimização.
+    """
+
+    def __init__(self, db_connector, run_id: str, flush_every: int = 50):
+        """
+        Inicializa o checkpoint em banco.
+
+        Args:
+            db_connector: Conector SQL Server.
+            run_id: Identificador da execução (lote) de otimização.
+            flush_every: Número de resultados acumulados antes de gravar.
+        """
+        super().__init__(flush_every=flush_every)
+        self.db_connector = db_connector
+        self.run_id = run_id
+        self._ensure_table_exists()
+
+    def _ensure_table_exists(self) -> None:
+        """Cria a tabela de checkpoints se não existir."""
+        create_table = """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='optimization_checkpoints' AND xtype='U')
+        CREATE TABLE optimization_checkpoints (
+            id INT IDENTITY(1,1) PRIMARY KEY,
+            run_id VARCHAR(100) NOT NULL,
+            os_id VARCHAR(100) NOT NULL,
+            result NVARCHAR(MAX),
+            created_at DATETIME DEFAULT GETDATE(),
+            INDEX idx_run_os (run_id, os_id)
+        )
+        """
+
+        try:
+            self.db_connector.execute_query(create_table)
+        except Exception as e:
+            logger.warning(f"Erro ao criar tabela de checkpoints: {e}")
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        query = "SELECT os_id, result FROM optimization_checkpoints WHERE run_id = ? ORDER BY id"
+        rows = self.db_connector.fetch_data(query, (self.run_id,))
+
+        return {
+            str(os_id): json.loads(result)
+            for os_id, result in zip(rows.get("os_id", []), rows.get("result", []))
+        }
+
+    def _write(self, entries: List[Tuple[str, Dict[str, Any]]]) -> None:
+        query = "INSERT INTO optimization_checkpoints (run_id, os_id, result) VALUES (?, ?, ?)"
+        params = [
+            (self.run_id, os_id, json.dumps(result, default=_json_default))
+            for os_id, result in entries
+        ]
+
+        cursor = self.db_connector.connection.cursor()
+        cursor.executemany(query, params)
+        self.db_connector.connection.commit()
+
+    def _clear(self) -> None:
+        self.db_connector.execute_query(
+            "DELETE FROM optimization_checkpoints WHERE run_id = ?", (self.run_id,)
+        )
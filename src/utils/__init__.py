@@ -2,6 +2,6 @@
 
 from .logging_config import setup_logging
 from .metrics import MetricsCalculator
-from .config_loader import ConfigLoader
+from .config_loader import ConfigLoader, get_config_loader
 
-__all__ = ["setup_logging", "MetricsCalculator", "ConfigLoader"]
+__all__ = ["setup_logging", "MetricsCalculator", "ConfigLoader", "get_config_loader"]